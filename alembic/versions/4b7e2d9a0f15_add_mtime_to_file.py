@@ -0,0 +1,24 @@
+"""Add the modification time of files, to tell changed files without reading them
+
+Revision ID: 4b7e2d9a0f15
+Revises: d8f3b5a61c27
+Create Date: 2026-10-18 15:21:08.904713
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "4b7e2d9a0f15"
+down_revision = "d8f3b5a61c27"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.add_column("file", sa.Column("mtime", sa.BigInteger(), nullable=True))
+
+
+def downgrade():
+    op.drop_column("file", "mtime")
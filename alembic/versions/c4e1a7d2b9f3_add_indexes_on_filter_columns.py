@@ -0,0 +1,46 @@
+"""Add indexes on columns used when filtering files, versions and archives
+
+Revision ID: c4e1a7d2b9f3
+Revises: f1669dd42064
+Create Date: 2026-10-18 09:12:41.318205
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "c4e1a7d2b9f3"
+down_revision = "f1669dd42064"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+INDEXES: list[tuple[str, str, list[str]]] = [
+    ("ix_file_version_id", "file", ["version_id"]),
+    ("ix_version_bundle_id_created_at", "version", ["bundle_id", "created_at"]),
+    ("ix_version_created_at", "version", ["created_at"]),
+    ("ix_archive_archiving_task_id", "archive", ["archiving_task_id"]),
+    ("ix_archive_retrieval_task_id", "archive", ["retrieval_task_id"]),
+    ("ix_archive_retrieved_at", "archive", ["retrieved_at"]),
+    ("ix_file_tag_link_tag_id_file_id", "file_tag_link", ["tag_id", "file_id"]),
+]
+
+# Foreign key columns which InnoDB indexes implicitly until an explicit index replaces it
+FOREIGN_KEY_COLUMNS: list[tuple[str, str]] = [
+    ("file", "version_id"),
+    ("version", "bundle_id"),
+    ("file_tag_link", "tag_id"),
+]
+
+
+def upgrade():
+    for index_name, table_name, columns in INDEXES:
+        op.create_index(index_name, table_name, columns)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == "mysql":
+        for table_name, column in FOREIGN_KEY_COLUMNS:
+            op.create_index(column, table_name, [column])
+    for index_name, table_name, _ in reversed(INDEXES):
+        op.drop_index(index_name, table_name=table_name)
@@ -0,0 +1,24 @@
+"""Add the size in bytes of files, to sum up disk usage in the database
+
+Revision ID: d8f3b5a61c27
+Revises: c4e1a7d2b9f3
+Create Date: 2026-10-18 14:03:27.561904
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "d8f3b5a61c27"
+down_revision = "c4e1a7d2b9f3"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.add_column("file", sa.Column("size", sa.BigInteger(), nullable=True))
+
+
+def downgrade():
+    op.drop_column("file", "size")
@@ -0,0 +1,94 @@
+"""Benchmark the startup time of the command line interface.
+
+Run with `python -m benchmarks.cli_startup --repeats 10`.
+"""
+
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCENARIOS: list[list[str]] = [
+    ["--version"],
+    ["get", "tag", "--json"],
+    ["get", "file", "--json"],
+    ["get", "bundle", "--json"],
+]
+IMPORT_TIME_PATTERN = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| \s*(\S+)")
+
+
+def get_import_times(module: str) -> dict[str, tuple[int, int]]:
+    """Return the self and cumulative import times in microseconds of all imported modules."""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    import_times: dict[str, tuple[int, int]] = {}
+    for line in process.stderr.splitlines():
+        if match := IMPORT_TIME_PATTERN.match(line):
+            import_times[match.group(3)] = (int(match.group(1)), int(match.group(2)))
+    return import_times
+
+
+def time_command(arguments: list[str], repeats: int) -> list[float]:
+    """Return the wall times in seconds of running the command line interface."""
+    timings: list[float] = []
+    for _ in range(repeats):
+        start: float = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "housekeeper", *arguments], capture_output=True, check=True
+        )
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run(repeats: int) -> list[dict]:
+    """Time the import of the base command and the startup of a few commands."""
+    import_times: dict[str, tuple[int, int]] = get_import_times("housekeeper.cli.core")
+    slowest_imports: list[tuple[str, tuple[int, int]]] = sorted(
+        import_times.items(), key=lambda item: item[1][0], reverse=True
+    )[:10]
+    results: list[dict] = [
+        {
+            "scenario": "import housekeeper.cli.core",
+            "import_time_ms": import_times["housekeeper.cli.core"][1] / 1000,
+            "imported_modules": len(import_times),
+            "slowest_imports_ms": {module: times[0] / 1000 for module, times in slowest_imports},
+        }
+    ]
+    with tempfile.TemporaryDirectory() as root:
+        base_arguments = ["--database", f"sqlite:///{Path(root, 'housekeeper.db')}", "--root", root]
+        subprocess.run(
+            [sys.executable, "-m", "housekeeper", *base_arguments, "init"],
+            capture_output=True,
+            check=True,
+        )
+        for scenario in SCENARIOS:
+            timings: list[float] = time_command(base_arguments + scenario, repeats=repeats)
+            results.append(
+                {
+                    "scenario": " ".join(scenario),
+                    "min_ms": round(min(timings) * 1000, 1),
+                    "median_ms": round(statistics.median(timings) * 1000, 1),
+                }
+            )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    for result in run(repeats=args.repeats):
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Benchmark squashing the names of large listings of lane and chunk files.
+
+Run with `python -m benchmarks.squash_names --files 10000`.
+"""
+
+import argparse
+import json
+import random
+from typing import Callable
+
+from benchmarks.timing import time_call
+from housekeeper.services.file_report_service.utils import squash_names
+
+LANES_PER_SAMPLE: int = 8
+TAGS: list[dict] = [{"id": 1, "name": "fastq"}, {"id": 2, "name": "bam"}, {"id": 3, "name": "vcf"}]
+
+
+def get_listing(nr_files: int) -> list[dict]:
+    """Return file rows like those of a flowcell bundle, half lane files and half chunk files."""
+    files: list[dict] = []
+    nr_lane_files: int = nr_files // 2
+    for file_id in range(nr_lane_files):
+        sample, lane = divmod(file_id, LANES_PER_SAMPLE)
+        path = f"sample{sample}_L{lane + 1:03}.bam"
+        files.append({"id": file_id, "path": path, "full_path": path, "tags": TAGS[:2]})
+    for file_id in range(nr_lane_files, nr_files):
+        path = f"chunk_{file_id - nr_lane_files:05}.vcf"
+        files.append({"id": file_id, "path": path, "full_path": path, "tags": TAGS[1:]})
+    return files
+
+
+def run(nr_files: int, repeats: int) -> list[dict]:
+    """Time squashing sorted and shuffled listings."""
+    files: list[dict] = get_listing(nr_files)
+    shuffled_files: list[dict] = random.Random(0).sample(files, k=len(files))
+    scenarios: dict[str, Callable] = {
+        "sorted": lambda: squash_names(files),
+        "sorted natural_sort": lambda: squash_names(files, natural_sort=True),
+        "shuffled": lambda: squash_names(shuffled_files),
+        "shuffled natural_sort": lambda: squash_names(shuffled_files, natural_sort=True),
+    }
+    return [
+        {
+            "scenario": scenario,
+            "files": nr_files,
+            "rows": len(function()),
+            "seconds": time_call(function=function, repeats=repeats),
+        }
+        for scenario, function in scenarios.items()
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=10_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    for result in run(nr_files=args.files, repeats=args.repeats):
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
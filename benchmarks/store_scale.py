@@ -0,0 +1,221 @@
+"""Benchmark the hot paths of the store and the command line on a synthetic database.
+
+Run with `python -m benchmarks.store_scale --bundles 10000 --output results.json`, and use a
+file or server database with `--reuse` to generate a large database once and time it from
+several commits, passing the same scale each time.
+"""
+
+import argparse
+import datetime as dt
+import json
+import platform
+import sys
+import tempfile
+from pathlib import Path
+from typing import Callable
+
+import sqlalchemy
+from click.testing import CliRunner
+from sqlalchemy import func, select
+
+from benchmarks.synthetic import (
+    FILE_TYPES,
+    SyntheticScale,
+    generate_database,
+    get_bundle_name,
+    get_bundle_samples,
+    get_ongoing_archiving_task_ids,
+    get_sample_tag_name,
+)
+from benchmarks.timing import summarize_timings, time_calls
+from housekeeper.cli.delete import delete
+from housekeeper.cli.get import get
+from housekeeper.constants import TagMatch
+from housekeeper.store.database import create_all_tables, get_engine, initialize_database
+from housekeeper.store.models import Archive, File
+from housekeeper.store.store import Store
+
+DEFAULT_SCALE = SyntheticScale()
+NEW_BUNDLE_FILES: int = 100
+
+
+def get_new_bundle_data(directory: Path, bundle_number: int) -> dict:
+    """Return the data of a bundle with files in a directory, named by a running number."""
+    return {
+        "name": f"new_case_{bundle_number}",
+        "created_at": dt.datetime.now(),
+        "files": [
+            {"path": str(Path(directory, f"file_{index}.txt")), "archive": False, "tags": [tag]}
+            for index, tag in zip(range(NEW_BUNDLE_FILES), FILE_TYPES * NEW_BUNDLE_FILES)
+        ],
+    }
+
+
+def get_scenarios(
+    store: Store, scale: SyntheticScale, directory: Path
+) -> dict[str, Callable[[], int | None]]:
+    """Return functions running each scenario, returning the number of rows they got if any."""
+    bundle_name: str = get_bundle_name(scale.bundles // 2 + 1)
+    # Files of a type are tagged with the same sample of each bundle
+    bundle_samples: list[int] = get_bundle_samples(scale=scale, bundle_id=scale.bundles // 2 + 1)
+    sample_tag_name: str = get_sample_tag_name(
+        bundle_samples[FILE_TYPES.index("vcf") % len(bundle_samples)]
+    )
+    ongoing_task_ids: list[int] = get_ongoing_archiving_task_ids(scale)
+    context: dict = {"store": store, "root": str(directory)}
+    new_bundle_numbers = iter(range(sys.maxsize))
+    for index in range(NEW_BUNDLE_FILES):
+        Path(directory, f"file_{index}.txt").touch()
+
+    def add_bundle() -> int:
+        data: dict = get_new_bundle_data(
+            directory=directory, bundle_number=next(new_bundle_numbers)
+        )
+        store.create_file_tags(data["files"])
+        bundle, _ = store.add_bundle(data)
+        store.session.add(bundle)
+        store.session.flush()
+        return NEW_BUNDLE_FILES
+
+    def invoke(command, arguments: list[str], input: str | None = None) -> int:
+        result = CliRunner().invoke(command, arguments, obj=dict(context), input=input)
+        return len(result.output.splitlines())
+
+    scenarios: dict[str, Callable[[], int | None]] = {
+        f"get_files tags {tag_match}": (
+            lambda tag_match=tag_match: len(
+                store.get_files(tag_names=["vcf", sample_tag_name], tag_match=tag_match).all()
+            )
+        )
+        for tag_match in TagMatch
+    }
+    scenarios.update(
+        {
+            "get_files bundle": lambda: len(store.get_files(bundle_name=bundle_name).all()),
+            "get_non_archived_files limit 1000": lambda: len(
+                store.get_non_archived_files(tag_names=["fastq"], limit=1000)
+            ),
+            "add_bundle": add_bundle,
+            "update_finished_archival_tasks": lambda: store.update_finished_archival_tasks(
+                archiving_task_ids=ongoing_task_ids
+            ),
+            "cli get file tags": lambda: invoke(
+                get, ["file", "--json", "-t", "vcf", "-t", sample_tag_name]
+            ),
+            "cli get bundle": lambda: invoke(get, ["bundle", bundle_name, "--json"]),
+            "cli get bundle listing": lambda: invoke(get, ["bundle", "--json"]),
+            "cli get version verbose": lambda: invoke(
+                get, ["version", "-b", bundle_name, "--verbose"]
+            ),
+            "cli delete files listing": lambda: invoke(
+                delete, ["files", "-t", "vcf", "-b", bundle_name, "--list-files"], input="n\n"
+            ),
+        }
+    )
+    return scenarios
+
+
+def get_skipped_scenarios(store: Store, scale: SyntheticScale) -> dict[str, str]:
+    """Return why scenarios would time nothing on this database, by scenario name."""
+    ongoing_archives: int = store.session.scalar(
+        select(func.count(Archive.file_id)).where(
+            Archive.archiving_task_id.in_(get_ongoing_archiving_task_ids(scale)),
+            Archive.archived_at.is_(None),
+        )
+    )
+    if not ongoing_archives:
+        return {"update_finished_archival_tasks": "no ongoing archiving tasks at this scale"}
+    return {}
+
+
+def run(
+    database: str, scale: SyntheticScale, repeats: int, reuse: bool, scenario_names: list[str]
+) -> dict:
+    """Generate the database unless reused and time each scenario.
+
+    Changes made by a scenario are rolled back after each call, so every call sees the same data.
+    Scenarios without any data to work on are reported as skipped instead of being timed.
+    """
+    initialize_database(database)
+    store = Store(root="/")
+    create_all_tables()
+    nr_files: int = store.session.scalar(select(func.count(File.id)))
+    if nr_files and not reuse:
+        raise SystemExit(f"{database} already has {nr_files} files, use --reuse to time them")
+    if not nr_files:
+        generate_database(session=store.session, scale=scale)
+
+    def teardown():
+        store.session.rollback()
+        store.session.expunge_all()
+
+    results: list[dict] = []
+    skipped_scenarios: dict[str, str] = get_skipped_scenarios(store=store, scale=scale)
+    with tempfile.TemporaryDirectory() as directory:
+        scenarios = get_scenarios(store=store, scale=scale, directory=Path(directory))
+        for scenario, function in scenarios.items():
+            if scenario_names and scenario not in scenario_names:
+                continue
+            if scenario in skipped_scenarios:
+                print(f"Skipping {scenario}: {skipped_scenarios[scenario]}", file=sys.stderr)
+                results.append({"scenario": scenario, "skipped": skipped_scenarios[scenario]})
+                continue
+            rows: int | None = function()
+            teardown()
+            timings: list[float] = time_calls(function=function, repeats=repeats, teardown=teardown)
+            results.append({"scenario": scenario, "rows": rows, **summarize_timings(timings)})
+    return {
+        "scale": {**scale._asdict(), "files": scale.files},
+        "environment": {
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "dialect": get_engine().dialect.name,
+        },
+        "repeats": repeats,
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database", default="sqlite://", help="Database uri")
+    parser.add_argument("--reuse", action="store_true", help="Time an already generated database")
+    parser.add_argument("--bundles", type=int, default=DEFAULT_SCALE.bundles)
+    parser.add_argument(
+        "--versions-per-bundle", type=int, default=DEFAULT_SCALE.versions_per_bundle
+    )
+    parser.add_argument("--files-per-version", type=int, default=DEFAULT_SCALE.files_per_version)
+    parser.add_argument("--samples", type=int, default=DEFAULT_SCALE.samples)
+    parser.add_argument("--archived-fraction", type=float, default=DEFAULT_SCALE.archived_fraction)
+    parser.add_argument(
+        "--retrieved-fraction", type=float, default=DEFAULT_SCALE.retrieved_fraction
+    )
+    parser.add_argument("--seed", type=int, default=DEFAULT_SCALE.seed)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--scenario", action="append", default=[], help="Only time this scenario")
+    parser.add_argument("--output", type=Path, help="Write the results to this file")
+    args = parser.parse_args()
+    scale = SyntheticScale(
+        bundles=args.bundles,
+        versions_per_bundle=args.versions_per_bundle,
+        files_per_version=args.files_per_version,
+        samples=args.samples,
+        archived_fraction=args.archived_fraction,
+        retrieved_fraction=args.retrieved_fraction,
+        seed=args.seed,
+    )
+    report: dict = run(
+        database=args.database,
+        scale=scale,
+        repeats=args.repeats,
+        reuse=args.reuse,
+        scenario_names=args.scenario,
+    )
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""Generate synthetic housekeeper databases of a given scale.
+
+The same scale and seed always give the same rows, so timings from different commits can be
+compared. Rows are inserted in batches of Core executemany statements, which keeps memory flat
+when generating tens of millions of files.
+"""
+
+import datetime as dt
+import random
+from itertools import islice
+from typing import Iterator, NamedTuple
+
+from sqlalchemy import Table, insert
+from sqlalchemy.orm import Session
+
+from housekeeper.store.models import Archive, Bundle, File, Tag, Version, file_tag_link
+
+FILE_TYPES: list[str] = ["fastq", "spring", "bam", "cram", "vcf", "json"]
+SAMPLES_PER_BUNDLE: int = 3
+FILES_PER_ARCHIVING_TASK: int = 1000
+# Every tenth archiving task is still ongoing, so finished tasks can be updated
+ONGOING_TASK_INTERVAL: int = 10
+START_DATE = dt.datetime(2020, 1, 1)
+INSERT_BATCH_SIZE: int = 10_000
+
+
+class SyntheticScale(NamedTuple):
+    """Number of rows and distributions of a synthetic database."""
+
+    bundles: int = 1_000
+    versions_per_bundle: int = 2
+    files_per_version: int = 50
+    samples: int = 10_000
+    archived_fraction: float = 0.5
+    retrieved_fraction: float = 0.1
+    seed: int = 0
+
+    @property
+    def files(self) -> int:
+        return self.bundles * self.versions_per_bundle * self.files_per_version
+
+
+def get_bundle_name(bundle_id: int) -> str:
+    return f"case_{bundle_id:08}"
+
+
+def get_sample_tag_name(sample: int) -> str:
+    return f"sample_{sample}"
+
+
+def get_bundle_samples(scale: SyntheticScale, bundle_id: int) -> list[int]:
+    """Return the samples whose files are in a bundle."""
+    return [
+        (bundle_id * SAMPLES_PER_BUNDLE + index) % scale.samples
+        for index in range(SAMPLES_PER_BUNDLE)
+    ]
+
+
+def get_ongoing_archiving_task_ids(scale: SyntheticScale) -> list[int]:
+    """Return the ids of the archiving tasks which have files that are not yet archived."""
+    last_task_id: int = scale.files // FILES_PER_ARCHIVING_TASK + 1
+    return list(range(ONGOING_TASK_INTERVAL, last_task_id + 1, ONGOING_TASK_INTERVAL))
+
+
+def generate_tags(scale: SyntheticScale) -> Iterator[dict]:
+    """Yield a tag per file type followed by a tag per sample."""
+    tag_names: list[str] = FILE_TYPES + [get_sample_tag_name(s) for s in range(scale.samples)]
+    for tag_id, tag_name in enumerate(tag_names, 1):
+        yield {"id": tag_id, "name": tag_name, "created_at": START_DATE}
+
+
+def generate_bundles(scale: SyntheticScale) -> Iterator[dict]:
+    for bundle_id in range(1, scale.bundles + 1):
+        yield {
+            "id": bundle_id,
+            "name": get_bundle_name(bundle_id),
+            "created_at": START_DATE + dt.timedelta(minutes=bundle_id),
+        }
+
+
+def generate_versions(scale: SyntheticScale) -> Iterator[dict]:
+    """Yield the versions of each bundle, one day apart."""
+    for bundle_id in range(1, scale.bundles + 1):
+        for version in range(scale.versions_per_bundle):
+            yield {
+                "id": (bundle_id - 1) * scale.versions_per_bundle + version + 1,
+                "bundle_id": bundle_id,
+                "created_at": START_DATE + dt.timedelta(minutes=bundle_id, days=version),
+            }
+
+
+def generate_files(scale: SyntheticScale) -> Iterator[tuple[dict, list[dict], dict | None]]:
+    """Yield each file with its tag links and its archive, if archived.
+
+    Each file is tagged with a file type and one of the samples of its bundle.
+    """
+    random_generator = random.Random(scale.seed)
+    ongoing_task_ids: set[int] = set(get_ongoing_archiving_task_ids(scale))
+    file_id: int = 0
+    for version in generate_versions(scale):
+        bundle_name: str = get_bundle_name(version["bundle_id"])
+        samples: list[int] = get_bundle_samples(scale=scale, bundle_id=version["bundle_id"])
+        for index in range(scale.files_per_version):
+            file_id += 1
+            file_type_index: int = index % len(FILE_TYPES)
+            sample: int = samples[index % len(samples)]
+            file: dict = {
+                "id": file_id,
+                "path": f"{bundle_name}/{version['created_at'].date()}/"
+                f"{get_sample_tag_name(sample)}_{index}.{FILE_TYPES[file_type_index]}",
+                "checksum": f"{random_generator.getrandbits(160):040x}",
+                "to_archive": file_type_index < 2,
+                "size": random_generator.randrange(1, 1 << 34),
+                "mtime": int(version["created_at"].timestamp()) * 10**9,
+                "version_id": version["id"],
+            }
+            links: list[dict] = [
+                {"file_id": file_id, "tag_id": file_type_index + 1},
+                {"file_id": file_id, "tag_id": len(FILE_TYPES) + sample + 1},
+            ]
+            yield file, links, get_archive(
+                scale=scale,
+                file=file,
+                random_generator=random_generator,
+                ongoing_task_ids=ongoing_task_ids,
+            )
+
+
+def get_archive(
+    scale: SyntheticScale, file: dict, random_generator: random.Random, ongoing_task_ids: set[int]
+) -> dict | None:
+    """Return an archive for a file to archive, with a chance of being archived and retrieved."""
+    if not file["to_archive"] or random_generator.random() >= scale.archived_fraction:
+        return None
+    archiving_task_id: int = file["id"] // FILES_PER_ARCHIVING_TASK + 1
+    archive: dict = {
+        "file_id": file["id"],
+        "archiving_task_id": archiving_task_id,
+        "archived_at": None,
+        "retrieval_task_id": None,
+        "retrieved_at": None,
+    }
+    if archiving_task_id in ongoing_task_ids:
+        return archive
+    archive["archived_at"] = START_DATE
+    if random_generator.random() < scale.retrieved_fraction:
+        archive["retrieval_task_id"] = archiving_task_id
+        archive["retrieved_at"] = START_DATE
+    return archive
+
+
+def insert_rows(session: Session, table: Table, rows: Iterator[dict]) -> int:
+    """Insert rows in batches, returning the number of inserted rows."""
+    nr_rows: int = 0
+    while batch := list(islice(rows, INSERT_BATCH_SIZE)):
+        session.execute(insert(table), batch)
+        nr_rows += len(batch)
+    return nr_rows
+
+
+def generate_database(session: Session, scale: SyntheticScale) -> None:
+    """Fill an empty database with the rows of a synthetic scale, committing each batch."""
+    for table, rows in [
+        (Tag.__table__, generate_tags(scale)),
+        (Bundle.__table__, generate_bundles(scale)),
+        (Version.__table__, generate_versions(scale)),
+    ]:
+        insert_rows(session=session, table=table, rows=rows)
+        session.commit()
+
+    files: Iterator[tuple[dict, list[dict], dict | None]] = generate_files(scale)
+    while batch := list(islice(files, INSERT_BATCH_SIZE)):
+        session.execute(insert(File.__table__), [file for file, _, _ in batch])
+        session.execute(insert(file_tag_link), [link for _, links, _ in batch for link in links])
+        archives: list[dict] = [archive for _, _, archive in batch if archive]
+        if archives:
+            session.execute(insert(Archive.__table__), archives)
+        session.commit()
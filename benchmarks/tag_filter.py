@@ -0,0 +1,84 @@
+"""Benchmark the strategies for matching files which have all of a list of tags.
+
+Run with `python -m benchmarks.tag_filter --files 200000`.
+"""
+
+import argparse
+import datetime as dt
+import json
+from typing import Callable
+
+from sqlalchemy import insert
+
+from benchmarks.timing import time_call
+from housekeeper.constants import TagMatch
+from housekeeper.store.database import create_all_tables, initialize_database
+from housekeeper.store.models import Bundle, File, Tag, Version, file_tag_link
+from housekeeper.store.store import Store
+
+FILE_TYPES: list[str] = ["spring", "fastq", "bam", "vcf"]
+
+
+def populate_store(store: Store, nr_files: int, nr_samples: int) -> None:
+    """Insert files tagged with a file type and a sample id."""
+    tag_names: list[str] = FILE_TYPES + [f"sample_{sample}" for sample in range(nr_samples)]
+    store.session.execute(
+        insert(Tag), [{"id": i, "name": name} for i, name in enumerate(tag_names, 1)]
+    )
+    store.session.execute(insert(Bundle), [{"id": 1, "name": "benchmark"}])
+    store.session.execute(
+        insert(Version), [{"id": 1, "bundle_id": 1, "created_at": dt.datetime.now()}]
+    )
+    store.session.execute(
+        insert(File),
+        [{"id": i, "path": f"file_{i}", "version_id": 1} for i in range(1, nr_files + 1)],
+    )
+    links: list[dict] = []
+    for file_id in range(1, nr_files + 1):
+        links.append({"file_id": file_id, "tag_id": 1 + file_id % len(FILE_TYPES)})
+        links.append({"file_id": file_id, "tag_id": 1 + len(FILE_TYPES) + file_id % nr_samples})
+    store.session.execute(insert(file_tag_link), links)
+    store.session.commit()
+
+
+def run(nr_files: int, nr_samples: int, repeats: int) -> list[dict]:
+    """Time tag filtered file lookups with each tag matching strategy."""
+    initialize_database("sqlite:///")
+    store = Store(root="/")
+    create_all_tables()
+    populate_store(store=store, nr_files=nr_files, nr_samples=nr_samples)
+
+    scenarios: dict[str, Callable[[TagMatch], Callable]] = {
+        "get_files spring+sample": lambda tag_match: lambda: store.get_files(
+            tag_names=["spring", "sample_1"], tag_match=tag_match
+        ).all(),
+        "get_files spring limit 100": lambda tag_match: lambda: store.get_files(
+            tag_names=["spring"], tag_match=tag_match
+        )
+        .limit(100)
+        .all(),
+        "get_non_archived_files spring limit 100": lambda tag_match: lambda: (
+            store.get_non_archived_files(tag_names=["spring"], limit=100, tag_match=tag_match)
+        ),
+    }
+    results: list[dict] = []
+    for scenario, build_call in scenarios.items():
+        for tag_match in TagMatch:
+            seconds: float = time_call(function=build_call(tag_match), repeats=repeats)
+            results.append({"scenario": scenario, "tag_match": tag_match, "seconds": seconds})
+            store.session.expunge_all()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--samples", type=int, default=1_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    for result in run(nr_files=args.files, nr_samples=args.samples, repeats=args.repeats):
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Helpers for timing benchmark scenarios"""
+
+import statistics
+import time
+from typing import Callable
+
+
+def time_calls(function: Callable, repeats: int, teardown: Callable | None = None) -> list[float]:
+    """Return the wall time in seconds of each of a number of calls.
+
+    The teardown, if any, runs after each call without being timed.
+    """
+    timings: list[float] = []
+    for _ in range(repeats):
+        start: float = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+        if teardown:
+            teardown()
+    return timings
+
+
+def time_call(function: Callable, repeats: int) -> float:
+    """Return the best wall time in seconds over a number of calls."""
+    return min(time_calls(function=function, repeats=repeats))
+
+
+def summarize_timings(timings: list[float]) -> dict:
+    """Return the best, median and worst of a list of timings."""
+    return {
+        "min_seconds": min(timings),
+        "median_seconds": statistics.median(timings),
+        "max_seconds": max(timings),
+    }
@@ -7,10 +7,7 @@ Invoke as `housekeeper` (if installed)
 or `python -m housekeeper` (no install required).
 """
 
-import sys
-
-from housekeeper.cli.core import base
+from housekeeper.client import main
 
 if __name__ == "__main__":
-    # exit using whatever exit code the CLI returned
-    sys.exit(base())
+    main()
@@ -0,0 +1,88 @@
+"""Module for calculating checksums of files"""
+
+import hashlib
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from housekeeper.constants import ChecksumAlgorithm
+
+BLOCKSIZE = 8 * 1024 * 1024
+CHECKSUM_SEPARATOR = ":"
+DEFAULT_CHECKSUM_ALGORITHM = ChecksumAlgorithm.SHA1
+DIGEST_LENGTHS: dict[int, ChecksumAlgorithm] = {
+    32: ChecksumAlgorithm.MD5,
+    40: ChecksumAlgorithm.SHA1,
+    64: ChecksumAlgorithm.SHA256,
+    128: ChecksumAlgorithm.BLAKE2B,
+}
+LOG = logging.getLogger(__name__)
+
+
+def format_checksum(digest: str, algorithm: ChecksumAlgorithm) -> str:
+    """Return a checksum to store.
+
+    Checksums of the default algorithm are stored as the bare hex digest, as they always were,
+    others are prefixed by their algorithm, as in sha256:<hex>.
+    """
+    if algorithm == DEFAULT_CHECKSUM_ALGORITHM:
+        return digest
+    return f"{algorithm}{CHECKSUM_SEPARATOR}{digest}"
+
+
+def parse_checksum(stored_checksum: str) -> tuple[ChecksumAlgorithm, str]:
+    """Return the algorithm and hex digest of a stored checksum.
+
+    Checksums stored without an algorithm get the one of their digest length, or the default.
+    """
+    algorithm, separator, digest = stored_checksum.rpartition(CHECKSUM_SEPARATOR)
+    if separator and algorithm in list(ChecksumAlgorithm):
+        return ChecksumAlgorithm(algorithm), digest
+    return DIGEST_LENGTHS.get(len(stored_checksum), DEFAULT_CHECKSUM_ALGORITHM), stored_checksum
+
+
+def checksum(
+    path: Path,
+    algorithm: ChecksumAlgorithm = DEFAULT_CHECKSUM_ALGORITHM,
+    block_size: int = BLOCKSIZE,
+) -> str:
+    """Calculate the checksum for a file.
+
+    The file is read into a reusable buffer to avoid allocating a new bytes object per block.
+    """
+    hasher = hashlib.new(algorithm)
+    buffer = bytearray(block_size)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as stream:
+        while size := stream.readinto(buffer):
+            hasher.update(view[:size])
+    return hasher.hexdigest()
+
+
+def checksums(
+    paths: Iterable[Path],
+    algorithm: ChecksumAlgorithm = DEFAULT_CHECKSUM_ALGORITHM,
+    block_size: int = BLOCKSIZE,
+    workers: int = 4,
+) -> Iterator[tuple[Path, str | None]]:
+    """Calculate checksums for many files in parallel.
+
+    Yield each path with its checksum as soon as it is calculated. Files that can not be read
+    are logged and yielded with a checksum of None. Hashing releases the GIL, so threads are
+    enough to keep both the disks and the CPUs busy.
+    """
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        futures: dict[Future, Path] = {
+            executor.submit(checksum, path, algorithm, block_size): path for path in paths
+        }
+        for future in as_completed(futures):
+            path: Path = futures[future]
+            try:
+                yield path, future.result()
+            except OSError as error:
+                LOG.warning("Could not calculate checksum for %s: %s", path, error)
+                yield path, None
+    finally:
+        executor.shutdown(cancel_futures=True)
@@ -1,21 +1,27 @@
 """Module for adding via CLI"""
 
 import datetime as dt
+import json as jsonlib
 import logging
+import os
+from json import JSONDecodeError
 from logging import Logger
 from pathlib import Path
-from typing import Generator
+from typing import Generator, TextIO
 
 import click
+from sqlalchemy.exc import SQLAlchemyError
 
 from housekeeper.constants import ROOT
 from housekeeper.date import get_date
-from housekeeper.exc import VersionIncludedError
-from housekeeper.files import load_json, validate_input
+from housekeeper.exc import BundleValidationError, IncludeError, VersionIncludedError
+from housekeeper.files import get_input_errors, load_json, validate_input
 from housekeeper.include import (
+    LinkResult,
     include_version,
     link_to_relative_path,
     relative_path,
+    remove_links,
     same_file_exists_in_bundle_directory,
 )
 from housekeeper.store.models import Bundle, Tag, Version
@@ -55,40 +61,149 @@ def bundle_cmd(context: click.Context, bundle_name: str, json: str, exclude: boo
 
     validate_args(arg=bundle_name, json=json, arg_name="bundle_name")
 
-    data: dict = {"name": bundle_name, "created_at": str(dt.datetime.now())}
-    # This is to preserve the behaviour of adding a bundle without providing all information
-    if json:
-        data: dict = load_json(json)
+    try:
+        # This is to preserve the behaviour of adding a bundle without providing all information
+        data: dict = (
+            load_bundle_data(json)
+            if json
+            else validate_bundle_data({"name": bundle_name, "created_at": str(dt.datetime.now())})
+        )
+    except BundleValidationError as error:
+        LOG.error(error.message)
+        raise click.Abort
 
     bundle_name = data["name"]
     if store.get_bundle_by_name(bundle_name=bundle_name):
         LOG.warning("bundle name %s already exists", bundle_name)
         raise click.Abort
 
-    validate_input(data, input_type="bundle")
-    data["created_at"] = get_date(data.get("created_at"))
-
-    if "files" not in data:
-        data["files"] = []
-
     try:
-        new_bundle, new_version = store.add_bundle(data)
+        new_bundle, _ = store_bundle(
+            store=store, data=data, root_dir=context.obj[ROOT], exclude=exclude
+        )
     except FileNotFoundError as err:
         LOG.warning("File %s does not exist", err)
         raise click.Abort
+    except (IncludeError, VersionIncludedError) as error:
+        LOG.error(error.message)
+        raise click.Abort
+    store.session.commit()
+    LOG.info("new bundle added: %s (%s)", new_bundle.name, new_bundle.id)
+
+
+@add.command("bundles")
+@click.option(
+    "--from-jsonl",
+    "jsonl_file",
+    type=click.File(),
+    required=True,
+    help="File with one bundle json per line, use '-' to read from stdin",
+)
+@click.option("-e", "--exclude", help="Use to not include bundles when adding them.", is_flag=True)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=100,
+    show_default=True,
+    help="Number of bundles to add per commit",
+)
+@click.pass_context
+def bundles_cmd(context: click.Context, jsonl_file: TextIO, exclude: bool, batch_size: int):
+    """Add many new bundles from a stream of json documents."""
+    LOG.info("Running add bundles")
+    store: Store = context.obj["store"]
+    added_bundles: int = 0
+    failed_lines: list[int] = []
+
+    for line_number, line in enumerate(jsonl_file, 1):
+        if not line.strip():
+            continue
+        links: list[LinkResult] = []
+        try:
+            data: dict = load_bundle_data(line)
+            if store.get_bundle_by_name(bundle_name=data["name"]):
+                raise BundleValidationError(f"bundle name {data['name']} already exists")
+            with store.session.begin_nested():
+                new_bundle, links = store_bundle(
+                    store=store, data=data, root_dir=context.obj[ROOT], exclude=exclude
+                )
+        except SQLAlchemyError as error:
+            # The savepoint is rolled back, so the links of the bundle point to nothing
+            LOG.warning("Line %s: could not store bundle: %s", line_number, error)
+            remove_links(link.destination for link in links)
+            failed_lines.append(line_number)
+            continue
+        except (BundleValidationError, IncludeError, VersionIncludedError) as error:
+            LOG.warning("Line %s: %s", line_number, error.message)
+            failed_lines.append(line_number)
+            continue
+        except FileNotFoundError as error:
+            LOG.warning("Line %s: file %s does not exist", line_number, error)
+            failed_lines.append(line_number)
+            continue
+        LOG.debug("Line %s: bundle %s added", line_number, new_bundle.name)
+        added_bundles += 1
+        if added_bundles % batch_size == 0:
+            store.session.commit()
+            LOG.info("Committed %s bundles", added_bundles)
+
+    store.session.commit()
+    LOG.info("new bundles added: %s", added_bundles)
+    if failed_lines:
+        LOG.error(
+            "Could not add %s bundles, see lines: %s",
+            len(failed_lines),
+            ", ".join(str(line_number) for line_number in failed_lines),
+        )
+        raise click.Abort
+
+
+def load_bundle_data(json_str: str) -> dict:
+    """Load and validate the bundle information in a json string."""
+    try:
+        data: dict = jsonlib.loads(json_str)
+    except JSONDecodeError as error:
+        raise BundleValidationError(f"invalid json: {error}")
+    if not isinstance(data, dict):
+        raise BundleValidationError("bundle json must be an object")
+    return validate_bundle_data(data)
+
+
+def validate_bundle_data(data: dict) -> dict:
+    """Validate the bundle information and parse its creation date."""
+    data["files"] = data.get("files", [])
+    errors: dict = get_input_errors(data=data, input_type="bundle")
+    if errors:
+        raise BundleValidationError(f"bundle does not follow the models: {errors}")
+    try:
+        data["created_at"] = get_date(data.get("created_at"))
+    except ValueError as error:
+        raise BundleValidationError(str(error))
+    return data
+
+
+def store_bundle(
+    store: Store, data: dict, root_dir: str, exclude: bool
+) -> tuple[Bundle, list[LinkResult]]:
+    """Add a bundle with its first version to the session and include the version files.
+
+    Return the bundle and the links created when including its files.
+
+    Raises:
+        FileNotFoundError: if a file of the bundle does not exist.
+        VersionIncludedError: if the version is already included.
+        IncludeError: if any of the files could not be linked.
+    """
+    store.create_file_tags(data["files"])
+    new_bundle, new_version = store.add_bundle(data)
     store.session.add(new_bundle)
     new_version.bundle: Bundle = new_bundle
     store.session.add(new_version)
-    if not exclude:
-        try:
-            context_root_dir: str = context.obj[ROOT]
-            include_version(global_root=context_root_dir, version_obj=new_version)
-        except VersionIncludedError as error:
-            LOG.error(error.message)
-            raise click.Abort
-        new_version.included_at = dt.datetime.now()
-    store.session.commit()
-    LOG.info("new bundle added: %s (%s)", new_bundle.name, new_bundle.id)
+    if exclude:
+        return new_bundle, []
+    links: list[LinkResult] = include_version(global_root=root_dir, version_obj=new_version)
+    new_version.included_at = dt.datetime.now()
+    return new_bundle, links
 
 
 @add.command("file")
@@ -124,7 +239,9 @@ def file_cmd(
         validate_input(data, input_type="file")
 
     file_path: Path = Path(data.get("path", path))
-    if not file_path.exists():
+    try:
+        file_stat: os.stat_result = file_path.stat()
+    except OSError:
         LOG.warning("File: %s does not exist", file_path)
         raise click.Abort
 
@@ -146,7 +263,13 @@ def file_cmd(
         link_to_relative_path(version=version, file_path=file_path, root_path=context.obj[ROOT])
 
     housekeeper_file_path: Path = relative_path(version=version, file=file_path)
-    new_file = store.add_file(file_path=housekeeper_file_path, bundle=bundle, tags=tags)
+    new_file = store.add_file(
+        file_path=housekeeper_file_path,
+        bundle=bundle,
+        tags=tags,
+        size=file_stat.st_size,
+        mtime=file_stat.st_mtime_ns,
+    )
     store.session.add(new_file)
     store.session.commit()
     LOG.info("new file added: %s (%s)", new_file.path, new_file.id)
@@ -178,6 +301,7 @@ def version_cmd(context: click.Context, bundle_name: str, created_at: str, json:
         raise click.Abort
 
     data["created_at"] = get_date(data.get("created_at"))
+    store.create_file_tags(data.get("files", []))
     new_version = store.add_version(data, bundle)
 
     if not new_version:
@@ -209,19 +333,15 @@ def tag_cmd(context: click.Context, tags: list[str], file_id: int):
             LOG.warning(f"unable to find file with id: {file_id}")
             raise click.Abort
 
-    tag_name: str
-    for tag_name in tags:
-        tag: Tag = store.get_tag(tag_name)
-
-        if not tag:
-            LOG.info("%s: tag created", tag_name)
-            tag: Tag = store.new_tag(tag_name)
-            store.session.add(tag)
-            store.session.commit()
+    tag_map: dict[str, Tag] = store.get_or_create_tags(list(tags))
+    store.session.commit()
 
-        if not file:
-            continue
+    if not file:
+        return
 
+    tag_name: str
+    for tag_name in tags:
+        tag: Tag = tag_map[tag_name]
         if tag in file.tags:
             LOG.info("%s: tag already added", tag_name)
             continue
@@ -230,8 +350,5 @@ def tag_cmd(context: click.Context, tags: list[str], file_id: int):
 
     store.session.commit()
 
-    if not file:
-        return
-
     all_tags: Generator = (tag.name for tag in file.tags)
     LOG.info("file tags: %s", ", ".join(all_tags))
@@ -0,0 +1,170 @@
+"""Module for calculating file checksums via CLI"""
+
+import logging
+import os
+from pathlib import Path
+
+import click
+
+from housekeeper.checksum import (
+    DEFAULT_CHECKSUM_ALGORITHM,
+    checksums,
+    format_checksum,
+    parse_checksum,
+)
+from housekeeper.constants import ChecksumAlgorithm
+from housekeeper.disk import get_file_stats
+from housekeeper.store.models import File
+from housekeeper.store.store import Store
+
+LOG = logging.getLogger(__name__)
+
+
+@click.command()
+@click.option("-b", "--bundle-name", help="Only calculate checksums for files in this bundle")
+@click.option("-t", "--tag", "tag_names", multiple=True, help="filter by file tag")
+@click.option(
+    "-a",
+    "--algorithm",
+    type=click.Choice(list(ChecksumAlgorithm)),
+    default=DEFAULT_CHECKSUM_ALGORITHM,
+    show_default=True,
+    help="Hash algorithm to use",
+)
+@click.option(
+    "-w",
+    "--workers",
+    type=int,
+    default=4,
+    show_default=True,
+    help="Number of files to hash at once",
+)
+@click.option(
+    "--batch-size",
+    type=int,
+    default=100,
+    show_default=True,
+    help="Number of checksums to store per commit",
+)
+@click.option("--dry-run", is_flag=True, help="Calculate checksums without storing them")
+@click.option(
+    "--verify",
+    is_flag=True,
+    help="Verify the stored checksums with their own algorithms instead of adding missing ones",
+)
+@click.option(
+    "--fast",
+    is_flag=True,
+    help="When verifying, only re-hash files whose size or modification time changed",
+)
+@click.pass_context
+def checksum(
+    context: click.Context,
+    bundle_name: str | None,
+    tag_names: list[str],
+    algorithm: str,
+    workers: int,
+    batch_size: int,
+    dry_run: bool,
+    verify: bool,
+    fast: bool,
+):
+    """Calculate and store checksums for files that are missing one."""
+    if fast and not verify:
+        raise click.UsageError("--fast can only be used with --verify")
+    store: Store = context.obj["store"]
+    if verify:
+        files: list[File] = store.get_files(
+            bundle_name=bundle_name, tag_names=tag_names, with_checksum=True
+        ).all()
+        verify_checksums(
+            store=store,
+            files=files,
+            workers=workers,
+            batch_size=batch_size,
+            dry_run=dry_run,
+            fast=fast,
+        )
+        return
+
+    files: list[File] = store.get_files(
+        bundle_name=bundle_name, tag_names=tag_names, without_checksum=True
+    ).all()
+    if not files:
+        LOG.info("Could not find any files without checksum")
+        return
+
+    LOG.info("Calculating %s checksums for %s files", algorithm, len(files))
+    files_by_path: dict[Path, File] = {Path(file.full_path): file for file in files}
+    updated_files: int = 0
+    for path, file_checksum in checksums(
+        paths=files_by_path, algorithm=ChecksumAlgorithm(algorithm), workers=workers
+    ):
+        if not file_checksum:
+            continue
+        LOG.debug("%s: %s", path, file_checksum)
+        if dry_run:
+            continue
+        files_by_path[path].checksum = format_checksum(
+            digest=file_checksum, algorithm=ChecksumAlgorithm(algorithm)
+        )
+        updated_files += 1
+        if updated_files % batch_size == 0:
+            store.session.commit()
+
+    store.session.commit()
+    LOG.info("Stored checksums for %s of %s files", updated_files, len(files))
+
+
+def verify_checksums(
+    store: Store,
+    files: list[File],
+    workers: int,
+    batch_size: int,
+    dry_run: bool,
+    fast: bool,
+) -> None:
+    """Re-hash files, compare with their stored checksums and record their size and mtime.
+
+    Each file is hashed with the algorithm of its stored checksum. With `fast`, files whose size
+    and modification time are the recorded ones are trusted without being read. Raises
+    click.Abort if any file is missing or does not match.
+    """
+    files_by_path: dict[Path, File] = {Path(file.full_path): file for file in files}
+    failed_files: int = 0
+    files_to_hash: dict[ChecksumAlgorithm, dict[Path, tuple[File, os.stat_result]]] = {}
+    for path, file_stat in get_file_stats(paths=files_by_path, workers=workers):
+        file: File = files_by_path[path]
+        if file_stat is None:
+            LOG.error("%s: file is missing", path)
+            failed_files += 1
+            continue
+        if fast and (file.size, file.mtime) == (file_stat.st_size, file_stat.st_mtime_ns):
+            continue
+        algorithm, _ = parse_checksum(file.checksum)
+        files_to_hash.setdefault(algorithm, {})[path] = (file, file_stat)
+
+    nr_files_to_hash: int = sum(len(algorithm_files) for algorithm_files in files_to_hash.values())
+    LOG.info("Verifying %s checksums of %s files", nr_files_to_hash, len(files))
+    verified_files: int = 0
+    for algorithm, algorithm_files in files_to_hash.items():
+        for path, file_checksum in checksums(
+            paths=algorithm_files, algorithm=algorithm, workers=workers
+        ):
+            file, file_stat = algorithm_files[path]
+            if (algorithm, file_checksum) != parse_checksum(file.checksum):
+                LOG.error("%s: checksum %s does not match %s", path, file_checksum, file.checksum)
+                failed_files += 1
+                continue
+            verified_files += 1
+            if dry_run:
+                continue
+            file.size, file.mtime = file_stat.st_size, file_stat.st_mtime_ns
+            if verified_files % batch_size == 0:
+                store.session.commit()
+
+    store.session.commit()
+    LOG.info("Verified checksums for %s of %s files", verified_files, nr_files_to_hash)
+    if failed_files:
+        LOG.error("Could not verify %s files", failed_files)
+        raise click.Abort
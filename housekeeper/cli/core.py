@@ -7,22 +7,36 @@ import coloredlogs
 import yaml
 
 import housekeeper
+from housekeeper.cli.lazy_group import LazyGroup
 from housekeeper.constants import ROOT
-from housekeeper.services.file_service.file_service import FileService
-from housekeeper.services.file_report_service.file_report_service import FileReportService
-from housekeeper.store.database import initialize_database
+from housekeeper.store.database import get_query_metrics, initialize_database
+from housekeeper.store.instrumentation import format_query_metrics
 from housekeeper.store.store import Store
 
-from . import add, delete, get, include, init
-
 LOG = logging.getLogger(__name__)
 
+SUBCOMMANDS: dict[str, str] = {
+    "add": "housekeeper.cli.add.add",
+    "checksum": "housekeeper.cli.checksum.checksum",
+    "delete": "housekeeper.cli.delete.delete",
+    "get": "housekeeper.cli.get.get",
+    "include": "housekeeper.cli.include.include",
+    "init": "housekeeper.cli.init.init",
+    "serve": "housekeeper.cli.serve.serve",
+}
+
 
-@click.group()
+@click.group(cls=LazyGroup, lazy_subcommands=SUBCOMMANDS)
 @click.option("-c", "--config", type=click.File())
 @click.option("-d", "--database", help="path/URI of the SQL database")
 @click.option("-r", "--root", type=click.Path(exists=True), help="Housekeeper root dir")
 @click.option("-l", "--log-level", default="INFO")
+@click.option("--pool-size", type=int, help="Number of database connections to keep in the pool")
+@click.option("--max-overflow", type=int, help="Number of connections allowed beyond pool size")
+@click.option("--pool-recycle", type=int, help="Seconds after which a connection is replaced")
+@click.option("--pool-timeout", type=float, help="Seconds to wait for a connection from the pool")
+@click.option("--null-pool", is_flag=True, help="Open a new database connection per checkout")
+@click.option("--timings", is_flag=True, help="Print a summary of the database queries at exit")
 @click.version_option(housekeeper.__version__, prog_name=housekeeper.__title__)
 @click.pass_context
 def base(
@@ -31,6 +45,12 @@ def base(
     database: str | None,
     root: str | None,
     log_level: str,
+    pool_size: int | None,
+    max_overflow: int | None,
+    pool_recycle: int | None,
+    pool_timeout: float | None,
+    null_pool: bool,
+    timings: bool,
 ):
     """Housekeeper - Access your files!"""
     coloredlogs.install(level=log_level)
@@ -48,15 +68,25 @@ def base(
         raise click.Abort
     context.obj["database"] = db_path
     LOG.info("Use root path %s", root_path)
-    initialize_database(db_path)
-    store = Store(root=root_path)
-    context.obj["store"] = store
-    context.obj["file_service"] = FileService(store)
-    context.obj["file_report_service"] = FileReportService()
-
-
-base.add_command(init.init)
-base.add_command(add.add)
-base.add_command(include.include)
-base.add_command(get.get)
-base.add_command(delete.delete)
+    initialize_database(
+        db_path,
+        pool_size=get_option_value(context.obj, "pool_size", pool_size),
+        max_overflow=get_option_value(context.obj, "max_overflow", max_overflow),
+        pool_recycle=get_option_value(context.obj, "pool_recycle", pool_recycle),
+        pool_timeout=get_option_value(context.obj, "pool_timeout", pool_timeout),
+        null_pool=null_pool or context.obj.get("null_pool", False),
+        instrument=timings,
+    )
+    if timings:
+        context.call_on_close(print_query_metrics)
+    context.obj["store"] = Store(root=root_path)
+
+
+def print_query_metrics():
+    """Print a summary of the queries executed by the command to stderr."""
+    click.echo(format_query_metrics(get_query_metrics()), err=True)
+
+
+def get_option_value(config_values: dict, name: str, value):
+    """Return the value given on the command line, falling back on the config value."""
+    return value if value is not None else config_values.get(name)
@@ -2,11 +2,16 @@
 
 import logging
 import shutil
+from datetime import datetime
 from pathlib import Path
+from typing import Iterator
 
 import click
 
+from housekeeper.constants import STREAM_BATCH_SIZE
 from housekeeper.date import get_date
+from housekeeper.services.file_report_service.utils import batched
+from housekeeper.store.loading import FileLoading
 from housekeeper.store.models import File, Tag
 from housekeeper.store.store import Store
 
@@ -111,32 +116,38 @@ def files_cmd(context, yes, tag, bundle_name, before, notondisk, list_files, lis
     if bundle_name:
         validate_bundle_exists(store=store, bundle_name=bundle_name)
 
-    files = store.get_files_before(bundle_name=bundle_name, tag_names=tag, before_date=before_date)
-
-    if notondisk:
-        files = store.get_files_not_on_disk(files=files)
-
-    if not files:
+    file_ids: list[int] = []
+    for files in get_files_to_delete(
+        store=store,
+        tag_names=tag,
+        bundle_name=bundle_name,
+        before_date=before_date,
+        notondisk=notondisk,
+    ):
+        file_ids.extend(file.id for file in files)
+        if list_files_verbose:
+            list_files_verbosely(files=files)
+        elif list_files:
+            list_files_with_full_path(files=files)
+
+    if not file_ids:
         LOG.warning("No files found")
         raise click.Abort
 
-    if list_files_verbose:
-        list_files_verbosely(files=files)
-
-    elif list_files:
-        list_files_with_full_path(files=files)
-
-    if not (yes or click.confirm(f"Are you sure you want to delete {len(files)} files?")):
+    if not (yes or click.confirm(f"Are you sure you want to delete {len(file_ids)} files?")):
         raise click.Abort
 
-    for file in files:
-        if file.archive:
-            LOG.warning(
-                f"File {file.path} is archived, please delete it with 'cg archive delete-file' instead. Skipping."
-            )
-            continue
-        if yes or click.confirm(f"Remove file from disk and database: {file.full_path}?"):
-            delete_file(file=file, store=store)
+    for batch_ids in batched(file_ids, STREAM_BATCH_SIZE):
+        files: list[File] = store.get_files_by_ids(file_ids=batch_ids, loading=FileLoading.LISTING)
+        included_file_ids: set[int] = store.get_included_file_ids(file_ids=batch_ids)
+        for file in files:
+            if file.archive:
+                LOG.warning(
+                    f"File {file.path} is archived, please delete it with 'cg archive delete-file' instead. Skipping."
+                )
+                continue
+            if yes or click.confirm(f"Remove file from disk and database: {file.full_path}?"):
+                delete_file(file=file, store=store, is_included=file.id in included_file_ids)
 
 
 @delete.command("tag")
@@ -175,6 +186,26 @@ def validate_bundle_exists(store: Store, bundle_name: str):
         raise click.Abort
 
 
+def get_files_to_delete(
+    store: Store,
+    tag_names: list[str],
+    bundle_name: str,
+    before_date: datetime | None,
+    notondisk: bool,
+) -> Iterator[list[File]]:
+    """Yield the files to delete in batches."""
+    for files in store.get_files_before_in_batches(
+        bundle_name=bundle_name,
+        tag_names=tag_names,
+        before_date=before_date,
+        loading=FileLoading.LISTING,
+    ):
+        if notondisk:
+            files = store.get_files_not_on_disk(files=files)
+        if files:
+            yield files
+
+
 def list_files_verbosely(files):
     """List files verbosely."""
     for file in files:
@@ -190,9 +221,9 @@ def list_files_with_full_path(files):
         click.echo(file.full_path)
 
 
-def delete_file(file: File, store: Store):
+def delete_file(file: File, store: Store, is_included: bool):
     file_path = Path(file.full_path)
-    if file_should_be_unlinked(file):
+    if file_should_be_unlinked(file=file, is_included=is_included):
         file_path.unlink()
 
     store.session.delete(file)
@@ -200,10 +231,10 @@ def delete_file(file: File, store: Store):
     LOG.info(f"{file.full_path} deleted")
 
 
-def file_should_be_unlinked(file: File):
+def file_should_be_unlinked(file: File, is_included: bool):
     """Check if file should be unlinked."""
     file_path = Path(file.full_path)
-    return file.is_included and (file_path.exists() or file_path.is_symlink())
+    return is_included and (file_path.exists() or file_path.is_symlink())
 
 
 def parse_date(date: str):
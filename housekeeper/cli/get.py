@@ -2,19 +2,27 @@
 
 import json as jsonlib
 import logging
+import sys
 
 import click
 from rich.console import Console
 
+from housekeeper.constants import BUNDLE_PAGE_SIZE, CONSOLE_WIDTH, FileOutputFormat, UsageGroup
+from housekeeper.disk import SCAN_WORKERS
 from housekeeper.services.file_report_service.file_report_service import FileReportService
+from housekeeper.services.file_report_service.stream_output import write_file_rows
 from housekeeper.services.file_service.file_service import FileService
 from housekeeper.store.api import schema
 from housekeeper.store.models import Version
 from housekeeper.store.store import Store
+from housekeeper.usage import UsageReport
 
 from .tables import (
+    format_size,
+    get_bundle_summaries_table,
     get_bundles_table,
     get_tags_table,
+    get_usage_table,
     get_versions_table,
 )
 
@@ -22,8 +30,14 @@ LOG = logging.getLogger(__name__)
 
 
 @click.group()
-def get():
+@click.pass_context
+def get(context: click.Context):
     """Get info from database"""
+    store: Store = context.obj["store"]
+    context.obj.setdefault("file_service", FileService(store))
+    context.obj.setdefault(
+        "file_report_service", FileReportService(width=context.obj.get(CONSOLE_WIDTH))
+    )
 
 
 @get.command("bundle")
@@ -36,11 +50,58 @@ def get():
     is_flag=True,
     help="print compact filenames IFF verobe flag present",
 )
+@click.option(
+    "--natural-sort",
+    is_flag=True,
+    help="With --compact, sort file names with numbers in numerical order before squashing them",
+)
+@click.option(
+    "-p",
+    "--prefix",
+    "name_prefixes",
+    multiple=True,
+    help="List bundles with a name starting with this prefix, can be given several times",
+)
+@click.option(
+    "-l",
+    "--limit",
+    type=int,
+    default=BUNDLE_PAGE_SIZE,
+    show_default=True,
+    help="Number of bundles to list",
+)
+@click.option("--offset", type=int, default=0, help="Number of bundles to skip when listing")
+@click.option("-a", "--after", help="List the bundles with a name sorting after this one")
 @click.pass_context
-def bundle_cmd(context, bundle_name, bundle_id, json, compact):
-    """Get bundle information from database"""
+def bundle_cmd(
+    context,
+    bundle_name,
+    bundle_id,
+    json,
+    compact,
+    natural_sort: bool = False,
+    name_prefixes: list[str] = (),
+    limit: int = BUNDLE_PAGE_SIZE,
+    offset: int = 0,
+    after: str | None = None,
+):
+    """Get bundle information from database
+
+    Without a bundle name or id, list a page of bundles ordered by name with their number of
+    versions and files.
+    """
     store: Store = context.obj["store"]
-    bundles = store.bundles()
+    if not (bundle_name or bundle_id):
+        list_bundles(
+            store=store,
+            name_prefixes=list(name_prefixes),
+            after_name=after,
+            offset=offset,
+            limit=limit,
+            json=json,
+            console_width=context.obj.get(CONSOLE_WIDTH),
+        )
+        return
 
     if bundle_name:
         bundle = store.get_bundle_by_name(bundle_name=bundle_name)
@@ -61,14 +122,54 @@ def bundle_cmd(context, bundle_name, bundle_id, json, compact):
     if json:
         click.echo(jsonlib.dumps(result, indent=4, sort_keys=True))
         return
-    console = Console()
+    console = Console(width=context.obj.get(CONSOLE_WIDTH))
     console.print(get_bundles_table(result))
     for bundle in bundles:
         if len(bundle.versions) == 0:
             LOG.info("No versions found for bundle %s", bundle.name)
             return
         version_obj = bundle.versions[0]
-        context.invoke(version_cmd, version_id=version_obj.id, verbose=True, compact=compact)
+        context.invoke(
+            version_cmd,
+            version_id=version_obj.id,
+            verbose=True,
+            compact=compact,
+            natural_sort=natural_sort,
+        )
+
+
+def list_bundles(
+    store: Store,
+    name_prefixes: list[str],
+    after_name: str | None,
+    offset: int,
+    limit: int,
+    json: bool,
+    console_width: int | None = None,
+) -> None:
+    """Print a page of bundle summaries, pointing to the next page if there may be one"""
+    result: list[dict] = [
+        {
+            **summary._asdict(),
+            "created_at": summary.created_at.isoformat() if summary.created_at else None,
+            "latest_version_at": (
+                summary.latest_version_at.isoformat() if summary.latest_version_at else None
+            ),
+        }
+        for summary in store.get_bundle_summaries(
+            name_prefixes=name_prefixes, after_name=after_name, offset=offset, limit=limit
+        )
+    ]
+    if json:
+        click.echo(jsonlib.dumps(result, indent=4, sort_keys=True))
+        return
+    if not result:
+        LOG.info("Could not find any bundles")
+        return
+    console = Console(width=console_width)
+    console.print(get_bundle_summaries_table(result))
+    if len(result) == limit:
+        LOG.info("List the next bundles with --after %s", result[-1]["name"])
 
 
 @get.command("version")
@@ -82,46 +183,54 @@ def bundle_cmd(context, bundle_name, bundle_id, json, compact):
     is_flag=True,
     help="print compact filenames IFF verobe flag present",
 )
+@click.option(
+    "--natural-sort",
+    is_flag=True,
+    help="With --compact, sort file names with numbers in numerical order before squashing them",
+)
 @click.pass_context
-def version_cmd(context, bundle_name, json, version_id, verbose, compact):
+def version_cmd(context, bundle_name, json, version_id, verbose, compact, natural_sort):
     """Get versions from database"""
     store: Store = context.obj["store"]
     if not (bundle_name or version_id):
         LOG.info("Please select a bundle or a version")
         return
-    if bundle_name:
-        bundle = store.get_bundle_by_name(bundle_name=bundle_name)
-        if not bundle:
-            LOG.info("Could not find bundle %s", bundle_name)
-            return
-        version_objs = bundle.versions
+    if bundle_name and not version_id and not store.get_bundle_by_name(bundle_name=bundle_name):
+        LOG.info("Could not find bundle %s", bundle_name)
+        return
 
-    if version_id:
-        version: Version = store.get_version_by_id(version_id=version_id)
-        if not version:
-            LOG.warning("Could not find version %s", version_id)
-            raise click.Abort
-        version_objs = [version]
+    version_objs: list[Version] = store.get_versions(
+        bundle_name=None if version_id else bundle_name, version_id=version_id
+    )
+    if version_id and not version_objs:
+        LOG.warning("Could not find version %s", version_id)
+        raise click.Abort
 
     version_template = schema.VersionSchema()
     result = []
     for version_obj in version_objs:
-        bundle = store.get_bundle_by_id(bundle_id=version_obj.bundle_id)
         res = version_template.dump(version_obj)
-        res["bundle_name"] = bundle.name
+        res["bundle_name"] = version_obj.bundle.name
         result.append(res)
 
     if json:
         click.echo(jsonlib.dumps(result))
         return
 
-    console = Console()
+    console = Console(width=context.obj.get(CONSOLE_WIDTH))
     console.print(get_versions_table(result))
     if not verbose:
         return
 
+    file_service: FileService = context.obj["file_service"]
+    output_service: FileReportService = context.obj["file_report_service"]
+    output_service.compact = compact
+    output_service.natural_sort = natural_sort
+    output_service.json = False
     for version_obj in version_objs:
-        context.invoke(files_cmd, version_id=version_obj.id, file_names=False, compact=compact)
+        local, remote = file_service.split_local_and_remote(version_obj.files)
+        output_service.log_file_table(files=local, header="Local files", file_names=False)
+        output_service.log_file_table(files=remote, header="Remote files", file_names=True)
 
 
 @get.command("file")
@@ -130,6 +239,17 @@ def version_cmd(context, bundle_name, json, version_id, verbose, compact):
 @click.option("-fn", "--file-names", is_flag=True, help="Show only the file names")
 @click.option("-j", "--json", is_flag=True, help="Output to json format")
 @click.option("-c", "--compact", is_flag=True, help="print compact filenames")
+@click.option(
+    "--natural-sort",
+    is_flag=True,
+    help="With --compact, sort file names with numbers in numerical order before squashing them",
+)
+@click.option(
+    "-o",
+    "--output-format",
+    type=click.Choice(list(FileOutputFormat), case_sensitive=False),
+    help="Stream local and remote files as lines of ndjson or tsv instead of printing tables",
+)
 @click.argument("bundle", required=False)
 @click.pass_context
 def files_cmd(
@@ -140,12 +260,21 @@ def files_cmd(
     bundle: str,
     json: bool,
     compact: bool,
+    natural_sort: bool = False,
+    output_format: FileOutputFormat | None = None,
 ):
     """Get files from database"""
+    if output_format:
+        store: Store = context.obj["store"]
+        rows = store.get_file_rows(bundle_name=bundle, tag_names=tag_names, version_id=version_id)
+        write_file_rows(rows=rows, output_format=FileOutputFormat(output_format), stream=sys.stdout)
+        return
+
     file_service: FileService = context.obj["file_service"]
     output_service: FileReportService = context.obj["file_report_service"]
 
     output_service.compact = compact
+    output_service.natural_sort = natural_sort
     output_service.json = json
 
     local = file_service.get_local_files(bundle=bundle, tags=tag_names, version_id=version_id)
@@ -177,5 +306,76 @@ def tag_cmd(context, json, name):
     if json:
         click.echo(jsonlib.dumps(result))
         return
-    console = Console()
+    console = Console(width=context.obj.get(CONSOLE_WIDTH))
     console.print(get_tags_table(result))
+
+
+@get.command("usage")
+@click.argument("bundle-name", required=False)
+@click.option(
+    "-g",
+    "--group-by",
+    "groups",
+    type=click.Choice(list(UsageGroup), case_sensitive=False),
+    multiple=True,
+    default=[UsageGroup.BUNDLE],
+    show_default=True,
+    help="Sum up the disk usage per group, can be given several times",
+)
+@click.option(
+    "--stored-sizes",
+    is_flag=True,
+    help="Sum the file sizes stored in the database instead of reading them from disk",
+)
+@click.option(
+    "--store-sizes", is_flag=True, help="Store the file sizes read from disk in the database"
+)
+@click.option(
+    "-w",
+    "--workers",
+    type=int,
+    default=SCAN_WORKERS,
+    show_default=True,
+    help="Number of threads reading file sizes",
+)
+@click.option("-j", "--json", is_flag=True, help="Output all groups to json format")
+@click.pass_context
+def usage_cmd(
+    context,
+    bundle_name: str,
+    groups: list[UsageGroup],
+    stored_sizes: bool,
+    store_sizes: bool,
+    workers: int,
+    json: bool,
+):
+    """Get the disk usage of files, counting hardlinked files once"""
+    store: Store = context.obj["store"]
+    if stored_sizes and store_sizes:
+        raise click.UsageError(
+            "--stored-sizes and --store-sizes can not be combined, sizes are only stored when "
+            "read from disk"
+        )
+    report: UsageReport = store.get_disk_usage(
+        bundle_name=bundle_name,
+        use_stored_sizes=stored_sizes,
+        keep_file_sizes=store_sizes,
+        workers=workers,
+    )
+    if store_sizes:
+        store.update_file_sizes(report.file_sizes)
+        store.session.commit()
+        LOG.info("Stored the size of %s files", len(report.file_sizes))
+
+    result: dict = report.to_dict()
+    if json:
+        click.echo(jsonlib.dumps(result))
+        return
+    if report.missing_files:
+        LOG.warning("Could not get the size of %s files", report.missing_files)
+    console = Console(width=context.obj.get(CONSOLE_WIDTH))
+    for group in groups:
+        console.print(get_usage_table(result["groups"][group], group=UsageGroup(group)))
+    console.print(
+        f"Total: {result['total']['files']} files, {format_size(result['total']['size'])}"
+    )
@@ -6,7 +6,7 @@ import logging
 import click
 
 from housekeeper.constants import ROOT
-from housekeeper.exc import VersionIncludedError
+from housekeeper.exc import IncludeError, VersionIncludedError
 from housekeeper.include import include_version
 from housekeeper.store.store import Store
 
@@ -50,7 +50,7 @@ def include(context: click.Context, bundle_name: str, version_id: int):
 
     try:
         include_version(context.obj[ROOT], version_obj)
-    except VersionIncludedError as error:
+    except (IncludeError, VersionIncludedError) as error:
         LOG.warning(error.message)
         raise click.Abort
 
@@ -0,0 +1,33 @@
+"""Module for a click group loading its subcommands on demand"""
+
+import importlib
+
+import click
+
+
+class LazyGroup(click.Group):
+    """A click group importing the modules of its subcommands only when they are used.
+
+    Subcommands are given as a mapping from command name to the import path of the command,
+    e.g. {"get": "housekeeper.cli.get.get"}.
+    """
+
+    def __init__(self, *args, lazy_subcommands: dict[str, str] | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands: dict[str, str] = lazy_subcommands or {}
+
+    def list_commands(self, context: click.Context) -> list[str]:
+        return sorted(super().list_commands(context) + list(self.lazy_subcommands))
+
+    def get_command(self, context: click.Context, command_name: str) -> click.Command | None:
+        if command_name in self.lazy_subcommands:
+            return self._load_command(command_name)
+        return super().get_command(context, command_name)
+
+    def _load_command(self, command_name: str) -> click.Command:
+        """Import a subcommand from its module."""
+        module_name, attribute_name = self.lazy_subcommands[command_name].rsplit(".", 1)
+        command = getattr(importlib.import_module(module_name), attribute_name)
+        if not isinstance(command, click.Command):
+            raise ValueError(f"Lazy subcommand {command_name} is not a click command: {command}")
+        return command
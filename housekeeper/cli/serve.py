@@ -0,0 +1,211 @@
+"""Module for serving short lookups from a long-lived process"""
+
+import io
+import json
+import logging
+import os
+import signal
+import socketserver
+import sys
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import BinaryIO
+
+import click
+import yaml
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.exc import ArgumentError
+
+from housekeeper.cli.get import get
+from housekeeper.client import connect, is_forwarded
+from housekeeper.constants import CONSOLE_WIDTH, ROOT
+from housekeeper.services.file_report_service.file_report_service import FileReportService
+from housekeeper.store.store import Store
+
+LOG = logging.getLogger(__name__)
+SOCKET_UMASK = 0o177
+LOG_FORMAT = "%(asctime)s %(name)s %(levelname)s %(message)s"
+
+
+class MessageStream(io.TextIOBase):
+    """A text stream sending everything written to it as messages to a client."""
+
+    def __init__(self, connection: BinaryIO, name: str):
+        super().__init__()
+        self.connection = connection
+        self.name = name
+
+    @property
+    def encoding(self) -> str:
+        return "utf-8"
+
+    def write(self, data: str) -> int:
+        if not isinstance(data, str):
+            raise TypeError(f"Can only write text, not {type(data).__name__}")
+        if data:
+            message: str = json.dumps({"stream": self.name, "data": data})
+            self.connection.write(f"{message}\n".encode())
+        return len(data)
+
+    def flush(self) -> None:
+        self.connection.flush()
+
+
+class QueryRequestHandler(socketserver.StreamRequestHandler):
+    """Run one forwarded command line with the store of the server."""
+
+    server: "QueryServer"
+
+    def handle(self):
+        request: dict = json.loads(self.rfile.readline())
+        args: list[str] = request["args"]
+        options: dict = request.get("options", {})
+        refusal: str | None = self.server.get_refusal(options=options, cwd=request.get("cwd"))
+        if refusal:
+            LOG.info("Refusing %s: %s", " ".join(args), refusal)
+            self.wfile.write(f"{json.dumps({'refused': refusal})}\n".encode())
+            return
+        stdout = MessageStream(connection=self.wfile, name="stdout")
+        stderr = MessageStream(connection=self.wfile, name="stderr")
+        log_handler = logging.StreamHandler(stderr)
+        log_handler.setLevel(options.get("--log-level", "INFO").upper())
+        log_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        logging.getLogger().addHandler(log_handler)
+        try:
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                exit_code: int = self.server.run_command(args, columns=request.get("columns"))
+        finally:
+            logging.getLogger().removeHandler(log_handler)
+            self.server.store.session.rollback()
+        self.wfile.write(f"{json.dumps({'exit_code': exit_code})}\n".encode())
+
+
+class QueryServer(socketserver.UnixStreamServer):
+    """Serve forwarded command lines one at a time with a warm store and connection pool."""
+
+    def __init__(self, socket_path: str, context_obj: dict):
+        self.context_obj = context_obj
+        super().__init__(socket_path, QueryRequestHandler)
+
+    def server_bind(self):
+        """Bind the socket readable and writable by the owner only from the start."""
+        umask: int = os.umask(SOCKET_UMASK)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+
+    @property
+    def store(self) -> Store:
+        return self.context_obj["store"]
+
+    def get_refusal(self, options: dict, cwd: str | None = None) -> str | None:
+        """Return why a command with the given base options can not be served by this server.
+
+        Relative paths are resolved against the working directory of the client. Return None if
+        the options point to the database and root of the server.
+        """
+        cwd = cwd or os.getcwd()
+        if not isinstance(logging.getLevelName(options.get("--log-level", "INFO").upper()), int):
+            return f"Unknown log level {options['--log-level']}"
+        config_values: dict = {}
+        if options.get("--config"):
+            try:
+                with open(Path(cwd, options["--config"])) as config:
+                    config_values = yaml.full_load(config) or {}
+            except (OSError, yaml.YAMLError) as error:
+                return f"Could not read config: {error}"
+        database: str | None = options.get("--database") or config_values.get("database")
+        if database and resolve_database(database, cwd=cwd) != resolve_database(
+            self.context_obj["database"], cwd=os.getcwd()
+        ):
+            return f"The server does not use the database {database}"
+        root: str | None = options.get("--root") or config_values.get(ROOT)
+        if root and Path(cwd, root).resolve() != Path(self.context_obj[ROOT]).resolve():
+            return f"The server does not use the root {root}"
+        return None
+
+    def run_command(self, args: list[str], columns: int | None = None) -> int:
+        """Run a forwarded command line, with output as wide as the client terminal.
+
+        Return the exit code of the command.
+        """
+        if not is_forwarded(args):
+            click.echo(f"Command can not be served: {' '.join(args)}", err=True)
+            return 2
+        LOG.debug("Serving %s", " ".join(args))
+        obj: dict = {
+            **self.context_obj,
+            CONSOLE_WIDTH: columns,
+            "file_report_service": FileReportService(width=columns),
+        }
+        try:
+            get.main(
+                args=args[1:],
+                obj=obj,
+                prog_name="housekeeper get",
+                standalone_mode=False,
+            )
+        except click.ClickException as error:
+            error.show()
+            return error.exit_code
+        except click.Abort:
+            click.echo("Aborted!", err=True)
+            return 1
+        except click.exceptions.Exit as error:
+            return error.exit_code
+        return 0
+
+
+@click.command("serve")
+@click.option(
+    "-s",
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False),
+    required=True,
+    help="Unix socket to listen on",
+)
+@click.pass_context
+def serve(context: click.Context, socket_path: str):
+    """Serve get file, get bundle and get version requests on a Unix socket.
+
+    Point HOUSEKEEPER_SOCKET to the socket to have these commands answered by this process.
+    """
+    remove_stale_socket(socket_path)
+    server = QueryServer(socket_path=socket_path, context_obj=context.obj)
+    signal.signal(signal.SIGTERM, lambda *args: sys.exit(0))
+    LOG.info("Serving queries on %s", socket_path)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        LOG.info("Stopping the query server")
+    finally:
+        server.server_close()
+        Path(socket_path).unlink(missing_ok=True)
+
+
+def resolve_database(database: str, cwd: str) -> str:
+    """Return a database URI with a relative SQLite path resolved against a working directory."""
+    try:
+        url: URL = make_url(database)
+    except ArgumentError:
+        return database
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return url.render_as_string(hide_password=False)
+    database_path: str = os.path.normpath(os.path.join(cwd, url.database))
+    return url.set(database=database_path).render_as_string(hide_password=False)
+
+
+def remove_stale_socket(socket_path: str) -> None:
+    """Remove a socket left behind by a server that is no longer running."""
+    if not Path(socket_path).exists():
+        return
+    try:
+        connect(socket_path).close()
+    except OSError:
+        LOG.info("Removing stale socket %s", socket_path)
+        Path(socket_path).unlink()
+        return
+    LOG.error("A server is already listening on %s", socket_path)
+    raise click.Abort
@@ -5,6 +5,8 @@ from pathlib import Path
 
 from rich.table import Table
 
+from housekeeper.constants import UsageGroup
+
 
 def get_tags_table(rows: list[dict]) -> Table:
     """Return a tag table"""
@@ -43,6 +45,28 @@ def get_bundles_table(rows: list[dict]) -> Table:
     return table
 
 
+def get_bundle_summaries_table(rows: list[dict]) -> Table:
+    """Return a table of bundles with their number of versions and files"""
+    table = Table(show_header=True, header_style="bold magenta")
+    table.title = "[not italic]:package:[/] Bundle table [not italic]:package:[/]"
+    table.add_column("ID")
+    table.add_column("Bundle name")
+    table.add_column("Nr versions", justify="right")
+    table.add_column("Nr files", justify="right")
+    table.add_column("Latest version")
+    table.add_column("Created")
+    for summary in rows:
+        table.add_row(
+            str(summary["id"]),
+            summary["name"],
+            str(summary["versions"]),
+            str(summary["files"]),
+            summary["latest_version_at"].split("T")[0] if summary["latest_version_at"] else "",
+            summary["created_at"].split("T")[0] if summary["created_at"] else "",
+        )
+    return table
+
+
 def get_versions_table(rows: list[dict]) -> Table:
     """Return a versions table"""
     table = Table(show_header=True, header_style="bold magenta")
@@ -65,3 +89,29 @@ def get_versions_table(rows: list[dict]) -> Table:
             version_obj["expires_at"].split("T")[0] if version_obj["expires_at"] else "",
         )
     return table
+
+
+def format_size(size: int) -> str:
+    """Return a number of bytes in the largest unit in which it is at least one"""
+    for unit in ["B", "KiB", "MiB", "GiB", "TiB"]:
+        if size < 1024 or unit == "TiB":
+            break
+        size /= 1024
+    return f"{size:.1f} {unit}" if unit != "B" else f"{size} B"
+
+
+def get_usage_table(usages: dict[str, dict], group: str) -> Table:
+    """Return a disk usage table"""
+    table = Table(show_header=True, header_style="bold magenta")
+    table.title = (
+        f"[not italic]:floppy_disk:[/] Disk usage per {group} [not italic]:floppy_disk:[/]"
+    )
+    table.add_column(group.replace("_", " ").capitalize())
+    table.add_column("Nr files", justify="right")
+    table.add_column("Size", justify="right")
+    for key, usage in usages.items():
+        if group == UsageGroup.VERSION:
+            bundle_name, _, created_at = key.rpartition("/")
+            key = f"{bundle_name}/{created_at.split('T')[0]}"
+        table.add_row(key, str(usage["files"]), format_size(usage["size"]))
+    return table
@@ -0,0 +1,142 @@
+"""Thin client forwarding short lookups to a running `housekeeper serve` process.
+
+Only the standard library is imported here, so that forwarded commands skip the import of the
+database layer. Commands are forwarded when the HOUSEKEEPER_SOCKET environment variable points to
+a served socket and the command line, after any options of the base command, starts with one of
+the forwarded commands. The base options are sent along, and the server refuses the command if
+they point to another database or root than its own. Everything else, including a refused
+command or a socket that cannot be reached, falls back on the full command line interface.
+"""
+
+import json
+import os
+import shutil
+import socket
+import sys
+from typing import TextIO
+
+SOCKET_ENV_VARIABLE = "HOUSEKEEPER_SOCKET"
+FORWARDED_COMMANDS: tuple[tuple[str, str], ...] = (
+    ("get", "bundle"),
+    ("get", "file"),
+    ("get", "version"),
+)
+# Options of the base command which are sent along when forwarding, --timings is left out since
+# the timings of a forwarded command would be those of the server
+BASE_OPTIONS_WITH_VALUE: set[str] = {
+    "-c",
+    "--config",
+    "-d",
+    "--database",
+    "-r",
+    "--root",
+    "-l",
+    "--log-level",
+    "--pool-size",
+    "--max-overflow",
+    "--pool-recycle",
+    "--pool-timeout",
+}
+BASE_FLAGS: set[str] = {"--null-pool"}
+LONG_OPTION_NAMES: dict[str, str] = {
+    "-c": "--config",
+    "-d": "--database",
+    "-r": "--root",
+    "-l": "--log-level",
+}
+
+
+def split_base_options(args: list[str]) -> tuple[dict[str, str | bool], list[str]]:
+    """Return the leading options of the base command by their long name, and the rest of the
+    command line."""
+    options: dict[str, str | bool] = {}
+    index: int = 0
+    while index < len(args):
+        arg: str = args[index]
+        if arg in BASE_FLAGS:
+            options[arg] = True
+            index += 1
+            continue
+        name, separator, value = arg.partition("=")
+        if name in BASE_OPTIONS_WITH_VALUE and not separator:
+            value = args[index + 1] if index + 1 < len(args) else ""
+            index += 1
+        elif name not in BASE_OPTIONS_WITH_VALUE:
+            if arg.startswith("--") or arg[:2] not in BASE_OPTIONS_WITH_VALUE:
+                break
+            name, value = arg[:2], arg[2:]
+        options[LONG_OPTION_NAMES.get(name, name)] = value
+        index += 1
+    return options, args[index:]
+
+
+def get_command_args(args: list[str]) -> list[str]:
+    """Return a command line without the leading options of the base command."""
+    return split_base_options(args)[1]
+
+
+def is_forwarded(args: list[str]) -> bool:
+    """Return whether a command line can be handled by the query server."""
+    return tuple(get_command_args(args)[:2]) in FORWARDED_COMMANDS
+
+
+def connect(socket_path: str) -> socket.socket:
+    """Return a connection to the query server."""
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(socket_path)
+    except OSError:
+        connection.close()
+        raise
+    return connection
+
+
+def forward_command(
+    connection: socket.socket,
+    args: list[str],
+    stdout: TextIO | None = None,
+    stderr: TextIO | None = None,
+) -> int | None:
+    """Send a command line to the query server, write its output and return its exit code.
+
+    Return None if the server refused the command, because its base options do not match.
+    """
+    streams: dict[str, TextIO] = {"stdout": stdout or sys.stdout, "stderr": stderr or sys.stderr}
+    options, command_args = split_base_options(args)
+    request: dict = {
+        "args": command_args,
+        "options": options,
+        "cwd": os.getcwd(),
+        "columns": shutil.get_terminal_size().columns,
+    }
+    connection.sendall(f"{json.dumps(request)}\n".encode())
+    with connection.makefile("r", encoding="utf-8") as responses:
+        for response in responses:
+            message: dict = json.loads(response)
+            if "refused" in message:
+                return None
+            if "exit_code" in message:
+                return message["exit_code"]
+            streams[message["stream"]].write(message["data"])
+    streams["stderr"].write("The query server closed the connection\n")
+    return 1
+
+
+def main():
+    """Run a command, on the query server if possible."""
+    args: list[str] = sys.argv[1:]
+    socket_path: str | None = os.environ.get(SOCKET_ENV_VARIABLE)
+    if socket_path and is_forwarded(args):
+        try:
+            connection: socket.socket = connect(socket_path)
+        except OSError:
+            pass
+        else:
+            with connection:
+                exit_code: int | None = forward_command(connection=connection, args=args)
+            if exit_code is not None:
+                sys.exit(exit_code)
+
+    from housekeeper.cli.core import base
+
+    base()
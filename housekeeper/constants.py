@@ -1,11 +1,61 @@
 """Constants for housekeeper"""
 
 from datetime import timedelta
+from enum import StrEnum
 
 LOGLEVELS = ["DEBUG", "INFO", "WARNING", "CRITICAL"]
 PIPELINES = ("mip",)
 # three months before clean up by default
 TIME_TO_CLEANUP = timedelta(days=(30 * 3))
 ARCHIVE_TYPES = ("data", "result", "meta", "archive")
+STREAM_BATCH_SIZE = 1000
+BUNDLE_PAGE_SIZE = 100
 EXTRA_STATUSES = ["coverage", "frequency", "genotype", "visualizer", "rawdata", "qc"]
 ROOT: str = "root"
+CONSOLE_WIDTH: str = "console_width"
+
+
+class ArchiveState(StrEnum):
+    """States of a file in the archiving and retrieval of it."""
+
+    NOT_ARCHIVED: str = "not_archived"
+    ARCHIVING: str = "archiving"
+    ARCHIVED: str = "archived"
+    RETRIEVED: str = "retrieved"
+
+
+class ChecksumAlgorithm(StrEnum):
+    """Hash algorithms supported when calculating file checksums."""
+
+    BLAKE2B: str = "blake2b"
+    MD5: str = "md5"
+    SHA1: str = "sha1"
+    SHA256: str = "sha256"
+
+
+class FileOutputFormat(StrEnum):
+    """Machine readable formats for streaming file listings."""
+
+    NDJSON: str = "ndjson"
+    TSV: str = "tsv"
+
+
+class TagMatch(StrEnum):
+    """Strategies for matching files which have all of a list of tags.
+
+    GROUP_BY aggregates over every candidate file, EXISTS lets a LIMIT stop early and INTERSECT
+    resolves the matching file ids from the tag index before reading any file.
+    """
+
+    EXISTS: str = "exists"
+    GROUP_BY: str = "group_by"
+    INTERSECT: str = "intersect"
+
+
+class UsageGroup(StrEnum):
+    """Attributes of files by which their disk usage can be summed up."""
+
+    BUNDLE: str = "bundle"
+    VERSION: str = "version"
+    TAG: str = "tag"
+    ARCHIVE_STATE: str = "archive_state"
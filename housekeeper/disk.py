@@ -0,0 +1,82 @@
+"""Module for checking the presence and size of files on disk"""
+
+import logging
+import os
+import stat
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Iterable, Iterator
+
+LOG = logging.getLogger(__name__)
+SCAN_WORKERS = 8
+
+
+def get_file_names_in_directory(directory: Path, wanted_names: set[str]) -> set[str]:
+    """Return which of the wanted names are files in a directory, following symlinks.
+
+    Only the entries with a wanted name are checked for being a file, which may need a stat
+    call each. A directory which does not exist contains no files.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return {
+                entry.name for entry in entries if entry.name in wanted_names and entry.is_file()
+            }
+    except (FileNotFoundError, NotADirectoryError):
+        return set()
+
+
+def get_missing_paths_in_directory(directory: Path, file_names: list[str]) -> list[Path]:
+    """Return the paths of the given file names that are not files in the directory."""
+    try:
+        existing_names: set[str] = get_file_names_in_directory(
+            directory=directory, wanted_names=set(file_names)
+        )
+    except OSError as error:
+        LOG.debug("Could not list %s, checking files one by one: %s", directory, error)
+        return [Path(directory, name) for name in file_names if not Path(directory, name).is_file()]
+    return [Path(directory, name) for name in file_names if name not in existing_names]
+
+
+def get_missing_paths(paths: Iterable[Path], workers: int = SCAN_WORKERS) -> Iterator[Path]:
+    """Yield the paths that are not files on disk.
+
+    The paths are grouped by directory and each directory is listed once, spread over a pool of
+    threads. Missing paths are yielded as soon as their directory has been listed.
+    """
+    file_names_per_directory: dict[Path, list[str]] = defaultdict(list)
+    for path in paths:
+        file_names_per_directory[path.parent].append(path.name)
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        futures: list[Future] = [
+            executor.submit(get_missing_paths_in_directory, directory, file_names)
+            for directory, file_names in file_names_per_directory.items()
+        ]
+        for future in as_completed(futures):
+            yield from future.result()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def get_file_stat(path: Path) -> os.stat_result | None:
+    """Return the stat of a path following symlinks, or None if it is not a file."""
+    try:
+        file_stat: os.stat_result = path.stat()
+    except OSError:
+        return None
+    return file_stat if stat.S_ISREG(file_stat.st_mode) else None
+
+
+def get_file_stats(
+    paths: Iterable[Path], workers: int = SCAN_WORKERS
+) -> Iterator[tuple[Path, os.stat_result | None]]:
+    """Yield each path with its stat, or None if it is not a file on disk, in the given order.
+
+    The paths are stat'ed over a pool of threads since most of the wait is on the file system.
+    """
+    paths: list[Path] = list(paths)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        yield from zip(paths, executor.map(get_file_stat, paths))
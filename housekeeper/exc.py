@@ -12,3 +12,9 @@ class VersionIncludedError(HousekeeperError):
 
 class BundleValidationError(HousekeeperError):
     pass
+
+
+class IncludeError(HousekeeperError):
+    def __init__(self, message, results: list):
+        super().__init__(message)
+        self.results = results
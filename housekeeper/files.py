@@ -5,7 +5,6 @@ import logging
 from json.decoder import JSONDecodeError
 
 import click
-from marshmallow.exceptions import ValidationError
 
 from housekeeper.store.api import schema as schemas
 
@@ -25,8 +24,8 @@ def load_json(json_str: str) -> dict:
     return data
 
 
-def validate_input(data: dict, input_type: str):
-    """Validate input with the marshmallow schemas"""
+def get_input_errors(data: dict, input_type: str) -> dict:
+    """Return the errors found when validating input with the marshmallow schemas"""
     valid_schemas = {
         "bundle": schemas.InputBundleSchema(),
         "file": schemas.InputFileSchema(),
@@ -37,14 +36,16 @@ def validate_input(data: dict, input_type: str):
         LOG.warning("Invalid input type %s", input_type)
         raise ValueError()
 
-    LOG.info("Validating bundle schema")
-
     formatted_data = schema.dump(data)
-    try:
-        LOG.info("Validate marshmallow schema")
-        schema.load(formatted_data)
-    except ValidationError as err:
+    return schema.validate(formatted_data)
+
+
+def validate_input(data: dict, input_type: str):
+    """Validate input with the marshmallow schemas"""
+    LOG.info("Validating bundle schema")
+    errors: dict = get_input_errors(data=data, input_type=input_type)
+    if errors:
         LOG.warning("Input data does not follow the models")
-        LOG.error(err)
+        LOG.error(errors)
         raise click.Abort
     LOG.info("Input looks fine")
@@ -1,33 +1,81 @@
 """Module for code to include files in housekeeper"""
 
-import hashlib
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Iterable, NamedTuple
 
-from housekeeper.exc import VersionIncludedError
+from housekeeper.checksum import checksum  # noqa: F401
+from housekeeper.exc import IncludeError, VersionIncludedError
 from housekeeper.store.models import Version
 
-BLOCKSIZE = 65536
 EMPTY_STR = ""
+LINK_WORKERS = 8
 LOG = logging.getLogger(__name__)
 
 
+class LinkResult(NamedTuple):
+    """The outcome of linking a file into a bundle version."""
+
+    source: Path
+    destination: Path
+    error: OSError | None = None
+    stat: os.stat_result | None = None
+
+
 def link_file(file_path: Path, new_path: Path, hardlink: bool = True) -> None:
     """Create a link for a file"""
     if hardlink:
         LOG.debug("Creating hardlink")
-        os.link(file_path.resolve(), new_path)
+        os.link(file_path, new_path, follow_symlinks=True)
     else:
         LOG.debug("Creating softlink")
         new_path.symlink_to(file_path)
     LOG.info("linked file: %s -> %s", file_path, new_path)
 
 
-def include_version(global_root: str, version_obj: Version, hardlink: bool = True):
+def link_files(
+    links: list[tuple[Path, Path]], hardlink: bool = True, workers: int = LINK_WORKERS
+) -> list[LinkResult]:
+    """Create links for many files using a bounded pool of threads.
+
+    Return the outcome of each link in the order given, with the stat of the linked file.
+    Failed links are not raised.
+    """
+
+    def try_link_file(link: tuple[Path, Path]) -> LinkResult:
+        file_path, new_path = link
+        try:
+            link_file(file_path=file_path, new_path=new_path, hardlink=hardlink)
+            file_stat: os.stat_result = new_path.stat()
+        except OSError as error:
+            LOG.warning("Could not link file %s -> %s: %s", file_path, new_path, error)
+            return LinkResult(source=file_path, destination=new_path, error=error)
+        return LinkResult(source=file_path, destination=new_path, stat=file_stat)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(try_link_file, links))
+
+
+def remove_links(paths: Iterable[Path]) -> None:
+    """Remove links created by a failed include."""
+    for path in paths:
+        try:
+            path.unlink()
+        except OSError as error:
+            LOG.warning("Could not remove link %s: %s", path, error)
+
+
+def include_version(
+    global_root: str, version_obj: Version, hardlink: bool = True, workers: int = LINK_WORKERS
+) -> list[LinkResult]:
     """Include files in existing bundle version.
 
-    Including a file means to link them into a folder in the root directory
+    Including a file means to link them into a folder in the root directory. The files are
+    linked in parallel and if any link fails, the links already created are removed and the
+    file paths of the version are left unchanged. Files without a recorded size and
+    modification time get those of their link.
     """
     LOG.info("Use global root path %s", global_root)
     global_root_dir = Path(global_root)
@@ -39,23 +87,24 @@ def include_version(global_root: str, version_obj: Version, hardlink: bool = Tru
     version_root_dir.mkdir(parents=True, exist_ok=True)
     LOG.info("created new bundle version dir: %s", version_root_dir)
 
-    for file_obj in version_obj.files:
-        # hardlink file to the internal structure
-        file_obj_path = Path(file_obj.path)
-        new_path = version_root_dir / file_obj_path.name
-        link_file(file_path=file_obj_path, new_path=new_path, hardlink=hardlink)
-        file_obj.path = str(new_path).replace(f"{global_root_dir}/", EMPTY_STR, 1)
-
-
-def checksum(path: Path) -> str:
-    """Calculcate checksum for a file."""
-    hasher = hashlib.sha1()
-    with open(path, "rb") as stream:
-        buf = stream.read(BLOCKSIZE)
-        while len(buf) > 0:
-            hasher.update(buf)
-            buf = stream.read(BLOCKSIZE)
-    return hasher.hexdigest()
+    # hardlink files to the internal structure
+    links: list[tuple[Path, Path]] = [
+        (Path(file_obj.path), version_root_dir / Path(file_obj.path).name)
+        for file_obj in version_obj.files
+    ]
+    results: list[LinkResult] = link_files(links=links, hardlink=hardlink, workers=workers)
+    failed_results: list[LinkResult] = [result for result in results if result.error]
+    if failed_results:
+        remove_links(result.destination for result in results if not result.error)
+        raise IncludeError(
+            f"could not link {len(failed_results)} of {len(results)} files", results=results
+        )
+
+    for file_obj, result in zip(version_obj.files, results):
+        file_obj.path = str(result.destination).replace(f"{global_root_dir}/", EMPTY_STR, 1)
+        if file_obj.size is None or file_obj.mtime is None:
+            file_obj.size, file_obj.mtime = result.stat.st_size, result.stat.st_mtime_ns
+    return results
 
 
 def same_file_exists_in_bundle_directory(
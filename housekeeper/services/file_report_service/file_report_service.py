@@ -1,25 +1,75 @@
+import json as jsonlib
+from typing import Iterable, Iterator
+
 import click
-from housekeeper.services.file_report_service.utils import format_files, get_files_table
-from housekeeper.store.models import File
 from rich.console import Console
-import json as jsonlib
+
+from housekeeper.constants import STREAM_BATCH_SIZE
+from housekeeper.services.file_report_service.utils import (
+    batched,
+    format_files,
+    get_files_table,
+    squash_names,
+    squash_names_in_batches,
+)
+from housekeeper.store.models import File
 
 
 class FileReportService:
-    def __init__(self, compact: bool = False, json: bool = False):
-        self.console = Console()
+    def __init__(
+        self,
+        compact: bool = False,
+        natural_sort: bool = False,
+        json: bool = False,
+        batch_size=STREAM_BATCH_SIZE,
+        width: int | None = None,
+    ):
+        self.console = Console(width=width)
         self.compact = compact
+        self.natural_sort = natural_sort
         self.json = json
+        self.batch_size = batch_size
 
-    def log_file_table(self, files: list[File], header: str, file_names: bool) -> None:
-        rows = format_files(files)
-        table = get_files_table(
-            rows=rows,
-            header=header,
-            file_names=file_names,
-            compact=self.compact,
-        )
-        self.console.print(table, no_wrap=True)
+    def log_file_table(self, files: Iterable[File], header: str, file_names: bool) -> None:
+        """Write the files as a table, or as json if requested, one batch of files at a time.
 
+        Compact names are squashed across batches, so a table may hold fewer rows than a batch.
+        With `natural_sort` all files are sorted by name first, which needs the whole listing.
+        """
+        batches: Iterator[list[dict]] = (
+            format_files(batch) for batch in batched(files, self.batch_size)
+        )
         if self.json:
-            click.echo(jsonlib.dumps(rows))
+            self.echo_json(batches)
+            return
+
+        if self.compact and self.natural_sort:
+            all_rows: list[dict] = [row for rows in batches for row in rows]
+            batches = batched(squash_names(all_rows, natural_sort=True), self.batch_size)
+        elif self.compact:
+            batches = squash_names_in_batches(batches)
+        row_count = 0
+        for rows in batches:
+            table = get_files_table(
+                rows=rows,
+                header=header,
+                file_names=file_names,
+                show_header=row_count == 0,
+                start=row_count + 1,
+            )
+            self.console.print(table, no_wrap=True)
+            row_count += len(rows)
+        if not row_count:
+            table = get_files_table(rows=[], header=header, file_names=file_names)
+            self.console.print(table, no_wrap=True)
+
+    @staticmethod
+    def echo_json(batches: Iterable[list[dict]]) -> None:
+        """Write a json list with one row per line as the rows come in."""
+        separator = ""
+        click.echo("[", nl=False)
+        for rows in batches:
+            for row in rows:
+                click.echo(f"{separator}\n{jsonlib.dumps(row)}", nl=False)
+                separator = ","
+        click.echo("\n]")
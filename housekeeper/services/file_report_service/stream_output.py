@@ -0,0 +1,52 @@
+"""Write file listings as a stream of machine readable lines"""
+
+import json
+from itertools import groupby
+from operator import itemgetter
+from typing import Iterable, Iterator, TextIO
+
+from sqlalchemy import Row
+
+from housekeeper.constants import FileOutputFormat
+from housekeeper.store.models import File
+
+TSV_COLUMNS: list[str] = ["id", "path", "full_path", "tags", "remote"]
+
+
+def get_files_from_rows(rows: Iterable[Row]) -> Iterator[dict]:
+    """Collapse rows of (file id, path, tag name, is remote) ordered by file id into files."""
+    for file_id, file_rows in groupby(rows, key=itemgetter(0)):
+        file_rows: list[Row] = list(file_rows)
+        path: str = file_rows[0].path
+        yield {
+            "id": file_id,
+            "path": path,
+            "full_path": File.get_full_path(path),
+            "tags": [row.name for row in file_rows if row.name is not None],
+            "remote": bool(file_rows[0].is_remote),
+        }
+
+
+def write_ndjson(files: Iterable[dict], stream: TextIO) -> None:
+    """Write one json object per file and line."""
+    for file in files:
+        stream.write(json.dumps(file))
+        stream.write("\n")
+
+
+def write_tsv(files: Iterable[dict], stream: TextIO) -> None:
+    """Write a header and one tab separated line per file, with the tags separated by commas."""
+    stream.write("\t".join(TSV_COLUMNS) + "\n")
+    for file in files:
+        stream.write(
+            f"{file['id']}\t{file['path']}\t{file['full_path']}\t{','.join(file['tags'])}\t"
+            f"{str(file['remote']).lower()}\n"
+        )
+
+
+WRITERS = {FileOutputFormat.NDJSON: write_ndjson, FileOutputFormat.TSV: write_tsv}
+
+
+def write_file_rows(rows: Iterable[Row], output_format: FileOutputFormat, stream: TextIO) -> None:
+    """Write the files of a stream of file rows in the given format."""
+    WRITERS[output_format](files=get_files_from_rows(rows), stream=stream)
@@ -1,11 +1,16 @@
 import re
+from itertools import islice
 from pathlib import Path
+from typing import Iterable, Iterator
 
 from rich.table import Table
 
 from housekeeper.store.api import schema
 from housekeeper.store.models import File
 
+SUFFIX_PATTERN: re.Pattern = re.compile(r"(\d+)\.(\w{2,3})$")
+DIGITS_PATTERN: re.Pattern = re.compile(r"(\d+)")
+
 
 def format_files(files: list[File]):
     template = schema.FileSchema()
@@ -16,16 +21,36 @@ def format_files(files: list[File]):
     return formatted_files
 
 
-def get_files_table(rows: list[dict], header: str, file_names: bool, compact=False) -> Table:
-    """Return a tag table"""
-    table = Table(show_header=True, header_style="bold magenta", expand=True)
-    table.title = f"[not italic]:scroll:[/] {header} [not italic]:scroll:[/]"
-    table.add_column("ID")
-    table.add_column("File name")
-    table.add_column("Tags")
+def batched(items: Iterable, size: int) -> Iterator[list]:
+    """Yield lists of at most `size` items from an iterable."""
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def get_files_table(
+    rows: list[dict],
+    header: str,
+    file_names: bool,
+    compact=False,
+    show_header: bool = True,
+    start: int = 1,
+) -> Table:
+    """Return a file table.
+
+    Tables printed one after another line up since the column widths only depend on the console
+    width. Use `show_header` to leave out the title and header of tables continuing a listing,
+    and `start` to continue the row numbering.
+    """
+    table = Table(show_header=show_header, header_style="bold magenta", expand=True)
+    if show_header:
+        table.title = f"[not italic]:scroll:[/] {header} [not italic]:scroll:[/]"
+    table.add_column("ID", ratio=1)
+    table.add_column("File name", ratio=7)
+    table.add_column("Tags", ratio=3)
     if compact:
         rows = squash_names(rows)
-    for i, file_obj in enumerate(rows, 1):
+    for i, file_obj in enumerate(rows, start):
         file_tags = ", ".join(tag["name"] for tag in file_obj["tags"])
         file_path = Path(file_obj["full_path"])
         if file_names:
@@ -38,7 +63,7 @@ def get_files_table(rows: list[dict], header: str, file_names: bool, compact=Fal
     return table
 
 
-def squash_names(list_of_files: list[dict]) -> list[dict]:
+def squash_names(list_of_files: list[dict], natural_sort: bool = False) -> list[dict]:
     """If subsequent elements (filenames) in 'list_of_files' end in an integer - And that integer is
     following the previous - those are squashed when displayed.
     Example:
@@ -49,64 +74,124 @@ def squash_names(list_of_files: list[dict]) -> list[dict]:
 
         Traverse a list of dictionaries, where each dictionary represents
         a file with 'name', 'path' and 'tag', etc. For each name in the list ending
-        with integer n, for every subsequent name ending in n+1, n+2, ... n+i displayed
-        name will be: name[n-i].
+        with integer n, for every subsequent name with the same prefix and suffix ending in
+        n+1, n+2, ... n+i displayed name will be: name[n-i]. Zero padded integers are kept
+        padded, so name001 to name010 becomes name[001-010].
 
-        The input list will not be sorted.
+        The input list is only sorted when `natural_sort` is set, in which case names differing
+        only in their integer are put next to each other in numerical order and always squashed.
 
-        For each element e in the list, e will be searched by regular expression for integers
-         at a specific location; this is cached for the next iteration where a comparison is done. If
-        subsequent cache is updated, if not, the result is printed. Print will look in the cache
-        to check if the current iteration has a subsequent integer ending. Tags associated with squashed
-        filenames will be sorted and duplicates removed.
+        Each filename is split once and the list is traversed once, collecting runs of
+        subsequent names. Tags associated with squashed filenames are sorted by id and
+        duplicates removed. The input dictionaries are not modified.
     """
-    list_of_squashed = []
-    tag_list = []
-    if not list_of_files:
-        return list_of_squashed
-    head = list_of_files[0]
-    tail = list_of_files[1:]
-    previous_file, previous_counter, previous_suffix = _get_suffix(head["path"])
-    squash = [previous_counter]
-    previous_hkjson = head
-    for hk_json in tail + [{"path": ""}]:  # Add padding for final iteration
-        filename, counter, suffix = _get_suffix(hk_json["path"])
-        if counter == str(_to_int(previous_counter) + 1) and (previous_file == filename):
-            squash = squash + [counter]
-            tag_list = tag_list + (hk_json["tags"])
-        elif len(squash) == 1:  # only previous element in the list
-            list_of_squashed.append(previous_hkjson)
-            squash = [counter]
+    split_files: list[tuple[tuple[str, str, str], dict]] = [
+        (_get_suffix(hk_json["path"]), hk_json) for hk_json in list_of_files
+    ]
+    if natural_sort:
+        split_files.sort(key=lambda split_file: _get_natural_sort_key(*split_file[0]))
+    list_of_squashed: list[dict] = []
+    run: list[dict] = []
+    run_prefix = run_suffix = previous_counter = first_counter = ""
+    for (prefix, counter, suffix), hk_json in split_files:
+        if (
+            run
+            and prefix == run_prefix
+            and suffix == run_suffix
+            and _is_next_counter(previous=previous_counter, counter=counter)
+        ):
+            run.append(hk_json)
         else:
-            squashed_path = f"{previous_file}[{squash[0]}-{squash[-1]}]{previous_suffix}"
-            previous_hkjson["path"] = squashed_path
-            previous_hkjson["full_path"] = squashed_path
-            previous_hkjson["tags"] = remove_duplicates(sorted(tag_list, key=lambda i: i["id"]))
-            previous_hkjson["id"] = "-"
-            list_of_squashed.append(previous_hkjson)
-            squash = [counter]
-            tag_list = []
+            if run:
+                list_of_squashed.append(
+                    _squash_run(
+                        run=run,
+                        name=f"{run_prefix}[{first_counter}-{previous_counter}]{run_suffix}",
+                    )
+                )
+            run = [hk_json]
+            run_prefix, run_suffix, first_counter = prefix, suffix, counter
         previous_counter = counter
-        previous_suffix = suffix
-        previous_file = filename
-        previous_hkjson = hk_json
+    if run:
+        list_of_squashed.append(
+            _squash_run(
+                run=run, name=f"{run_prefix}[{first_counter}-{previous_counter}]{run_suffix}"
+            )
+        )
     return list_of_squashed
 
 
-def remove_duplicates(tag_list: list[dict]) -> list[dict]:
-    """Remove duoplicate elements from `tag_list`"""
-    no_duplicates = []
-    for i in tag_list:
-        if i not in no_duplicates:
-            no_duplicates.append(i)
-    return no_duplicates
+def squash_names_in_batches(batches: Iterable[list[dict]]) -> Iterator[list[dict]]:
+    """Squash the names of files coming in batches, see `squash_names`.
+
+    The run of names ending a batch is held back and squashed together with the next batch, so
+    that runs crossing batches are squashed as one.
+    """
+    pending: list[dict] = []
+    for rows in batches:
+        rows = pending + rows
+        run_start: int = _get_last_run_start(rows)
+        pending = rows[run_start:]
+        if squashed := squash_names(rows[:run_start]):
+            yield squashed
+    if pending:
+        yield squash_names(pending)
+
+
+def _get_last_run_start(list_of_files: list[dict]) -> int:
+    """Return the index of the first file in the run of subsequent names ending the list."""
+    run_start: int = len(list_of_files) - 1
+    if run_start < 0:
+        return 0
+    prefix, counter, suffix = _get_suffix(list_of_files[run_start]["path"])
+    while run_start > 0:
+        previous_prefix, previous_counter, previous_suffix = _get_suffix(
+            list_of_files[run_start - 1]["path"]
+        )
+        if (previous_prefix, previous_suffix) != (prefix, suffix) or not _is_next_counter(
+            previous=previous_counter, counter=counter
+        ):
+            break
+        run_start -= 1
+        counter = previous_counter
+    return run_start
+
+
+def _squash_run(run: list[dict], name: str) -> dict:
+    """Return the only file of a run, or a copy of the last file showing the squashed name."""
+    if len(run) == 1:
+        return run[0]
+    unique_tags: dict = {tag["id"]: tag for hk_json in run for tag in hk_json["tags"]}
+    return {
+        **run[-1],
+        "id": "-",
+        "path": name,
+        "full_path": name,
+        "tags": [unique_tags[tag_id] for tag_id in sorted(unique_tags)],
+    }
+
+
+def _is_next_counter(previous: str, counter: str) -> bool:
+    """Return True if `counter` is the integer after `previous`, with the same zero padding."""
+    return bool(previous and counter) and str(int(previous) + 1).zfill(len(previous)) == counter
+
+
+def _get_natural_sort_key(prefix: str, counter: str, suffix: str) -> tuple:
+    """Return a key ordering names by prefix, suffix and then integer, so that runs are adjacent.
+
+    Digits in the prefix are compared as integers, so sample2 comes before sample10.
+    """
+    prefix_parts: list = [
+        int(part) if index % 2 else part for index, part in enumerate(DIGITS_PATTERN.split(prefix))
+    ]
+    return prefix_parts, suffix, _to_int(counter), counter
 
 
 def _get_suffix(filename: str) -> tuple[str, str, str]:
     """Split a filename if ending with an integer before suffix."""
-    parsed: list[str] = re.split(pattern=r"(\d+)\.(\w{2,3}$)", string=filename)
-    if len(parsed) == 4:
-        return parsed[0], parsed[1], f".{parsed[2]}"
+    match: re.Match | None = SUFFIX_PATTERN.search(filename)
+    if match:
+        return filename[: match.start()], match.group(1), f".{match.group(2)}"
     return filename, "", ""
 
 
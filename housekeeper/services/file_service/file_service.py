@@ -1,3 +1,6 @@
+from typing import Iterable, Iterator
+
+from housekeeper.store.loading import FileLoading
 from housekeeper.store.models import File
 from housekeeper.store.store import Store
 
@@ -6,12 +9,33 @@ class FileService:
     def __init__(self, store: Store):
         self.store = store
 
-    def get_local_files(self, bundle: str, tags: list[str], version_id: int) -> list[File]:
-        return self.store.get_files(
-            bundle_name=bundle, tag_names=tags, version_id=version_id, local_only=True
-        ).all()
+    def get_local_files(self, bundle: str, tags: list[str], version_id: int) -> Iterator[File]:
+        return self.store.stream_files(
+            bundle_name=bundle,
+            tag_names=tags,
+            version_id=version_id,
+            local_only=True,
+            loading=FileLoading.LISTING,
+        )
+
+    def get_remote_files(self, bundle: str, tags: list[str], version_id: int) -> Iterator[File]:
+        return self.store.stream_files(
+            bundle_name=bundle,
+            tag_names=tags,
+            version_id=version_id,
+            remote_only=True,
+            loading=FileLoading.LISTING,
+        )
+
+    @staticmethod
+    def split_local_and_remote(files: Iterable[File]) -> tuple[list[File], list[File]]:
+        """Return loaded files ordered by id, split into local files and remote files.
 
-    def get_remote_files(self, bundle: str, tags: list[str], version_id: int) -> list[File]:
-        return self.store.get_files(
-            bundle_name=bundle, tag_names=tags, version_id=version_id, remote_only=True
-        ).all()
+        A file is remote when it is archived and not retrieved, as for `get_remote_files`.
+        """
+        local: list[File] = []
+        remote: list[File] = []
+        for file in sorted(files, key=lambda file: file.id):
+            is_remote: bool = file.archive is not None and file.archive.retrieved_at is None
+            (remote if is_remote else local).append(file)
+        return local, remote
@@ -5,11 +5,14 @@ from typing import Type
 from sqlalchemy.orm import Query, Session
 
 from housekeeper.store.models import File, Model, Version
+from housekeeper.store.tag_cache import TagCache
 
 
 class BaseHandler:
     """This is a base class holding different models."""
 
+    tag_cache: TagCache | None = None
+
     def __init__(self, session: Session):
         self.session = session
 
@@ -2,13 +2,18 @@
 
 import datetime as dt
 import logging
+import os
 from pathlib import Path
 from typing import Dict, Tuple
 
+from sqlalchemy import CursorResult, Insert, insert
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from housekeeper.store.base import BaseHandler
 from housekeeper.store.crud.read import ReadHandler
+from housekeeper.store.filters.archive_filters import ArchiveFilter, apply_archive_filter
 from housekeeper.store.models import Archive, Bundle, File, Tag, Version
 
 LOG = logging.getLogger(__name__)
@@ -21,6 +26,7 @@ class CreateHandler(BaseHandler):
         super().__init__(session=session)
         CreateHandler.get_bundle_by_name = ReadHandler.get_bundle_by_name
         CreateHandler.get_tag = ReadHandler.get_tag
+        CreateHandler.get_tags_by_names = ReadHandler.get_tags_by_names
         CreateHandler.get_version_by_date_and_bundle_name = (
             ReadHandler.get_version_by_date_and_bundle_name
         )
@@ -69,10 +75,18 @@ class CreateHandler(BaseHandler):
                 paths = file_data["path"]
             for path in paths:
                 LOG.debug("adding file: %s", path)
-                if not Path(path).exists():
+                try:
+                    file_stat: os.stat_result = Path(path).stat()
+                except OSError:
                     raise FileNotFoundError(path)
                 tags = [tag_map[tag_name] for tag_name in file_data["tags"]]
-                new_file = self.new_file(path, to_archive=file_data["archive"], tags=tags)
+                new_file = self.new_file(
+                    path,
+                    to_archive=file_data["archive"],
+                    tags=tags,
+                    size=file_stat.st_size,
+                    mtime=file_stat.st_mtime_ns,
+                )
                 version_obj.files.append(new_file)
 
     def new_version(self, created_at: dt.datetime, expires_at: dt.datetime = None) -> Version:
@@ -110,33 +124,72 @@ class CreateHandler(BaseHandler):
         bundle: Bundle,
         to_archive: bool = False,
         tags: list[str] = None,
+        size: int = None,
+        mtime: int = None,
     ) -> File:
-        """Build a new file object and add it to the latest version of an existing bundle."""
+        """Build a new file object and add it to the latest version of an existing bundle.
+
+        The size in bytes and modification time in nanoseconds are those of the file on disk.
+        """
         version = bundle.versions[0]
         tags = tags or []
-        tag_objs = [tag_obj for tag_name, tag_obj in self._build_tags(tags).items()]
+        tag_objs = list(self.get_or_create_tags(tags).values())
         file_path_to_use: str = str(file_path)
         new_file = self.new_file(
             path=file_path_to_use,
             to_archive=to_archive,
             tags=tag_objs,
+            size=size,
+            mtime=mtime,
         )
         new_file.version = version
         return new_file
 
-    def _build_tags(self, tag_names: list[str]) -> Dict[str, Tag]:
-        """Build a list of tag objects.
+    def _build_tags(self, tag_names: list[str], lock: bool = False) -> Dict[str, Tag]:
+        """Build a map of tag names to tag objects.
 
-        Take a list of tags, if a tag does not exist, create a new tag object.
-        Map the tag name to a tag object and return a list of those
+        Fetch all existing tags in a single query and create new tag objects for the missing
+        ones, which are not added to the session.
         """
-        tags = {}
+        tags: Dict[str, Tag] = {
+            tag.name: tag for tag in self.get_tags_by_names(tag_names=tag_names, lock=lock)
+        }
         for tag_name in tag_names:
-            tag_obj = self.get_tag(tag_name)
-            if tag_obj is None:
+            if tag_name not in tags:
                 LOG.debug("create new tag: %s", tag_name)
-                tag_obj = self.new_tag(tag_name)
-            tags[tag_name] = tag_obj
+                tags[tag_name] = self.new_tag(tag_name)
+        return tags
+
+    def get_or_create_tags(self, tag_names: list[str]) -> Dict[str, Tag]:
+        """Return a map of tag names to tag objects, adding missing tags to the database.
+
+        The missing tags are inserted in one batch within a savepoint. If another writer
+        created any of them first, the savepoint is rolled back and the tags are resolved again.
+        """
+        try:
+            return self._add_new_tags(self._build_tags(tag_names))
+        except IntegrityError:
+            LOG.debug("Tags were created concurrently, resolving them again")
+            return self._add_new_tags(self._build_tags(tag_names, lock=True))
+
+    def create_file_tags(self, files: list[dict]) -> None:
+        """Add the missing tags of the given files to the database, see `get_or_create_tags`.
+
+        Call this before building a bundle or version of the files, so that their tags are found
+        by then, also when another writer created the same tags.
+        """
+        tag_names = {tag_name for file_data in files for tag_name in file_data["tags"]}
+        self.get_or_create_tags(list(tag_names))
+
+    def _add_new_tags(self, tags: Dict[str, Tag]) -> Dict[str, Tag]:
+        """Add the tags not yet in the database to the session and flush them."""
+        new_tags: list[Tag] = [tag for tag in tags.values() if tag.id is None]
+        if not new_tags:
+            return tags
+        with self.session.begin_nested():
+            self.session.add_all(new_tags)
+        for tag in new_tags:
+            LOG.info("%s: tag created", tag.name)
         return tags
 
     def new_file(
@@ -145,9 +198,18 @@ class CreateHandler(BaseHandler):
         checksum: str = None,
         to_archive: bool = False,
         tags: list[Tag] = None,
+        size: int = None,
+        mtime: int = None,
     ) -> File:
         """Create a new file object based on the information given."""
-        return File(path=path, checksum=checksum, to_archive=to_archive, tags=tags)
+        return File(
+            path=path,
+            checksum=checksum,
+            to_archive=to_archive,
+            tags=tags,
+            size=size,
+            mtime=mtime,
+        )
 
     def new_tag(self, name: str, category: str = None) -> Tag:
         """Create a new tag object based on the information given."""
@@ -157,3 +219,56 @@ class CreateHandler(BaseHandler):
     def create_archive(self, file_id: int, archiving_task_id: int) -> Archive:
         """Creates an archive object to the given file, with the given archive task id."""
         return Archive(file_id=file_id, archiving_task_id=archiving_task_id)
+
+    def add_archives(self, file_and_task_ids: list[tuple[int, int]]) -> list[int]:
+        """Add archives for many files from (file_id, archiving_task_id) pairs in one statement.
+
+        Files which already have an archive entry are skipped and their ids returned. Rows
+        conflicting with archives added concurrently are skipped by the database.
+        """
+        archiving_task_id_by_file_id: dict[int, int] = {}
+        for file_id, archiving_task_id in file_and_task_ids:
+            archiving_task_id_by_file_id.setdefault(file_id, archiving_task_id)
+        if not archiving_task_id_by_file_id:
+            return []
+
+        archived_file_ids: list[int] = [
+            file_id
+            for file_id, in apply_archive_filter(
+                archives=self._get_query(table=Archive),
+                filter_functions=[ArchiveFilter.BY_FILE_IDS],
+                file_ids=list(archiving_task_id_by_file_id),
+            ).with_entities(Archive.file_id)
+        ]
+        for file_id in archived_file_ids:
+            LOG.warning(f"File {file_id} is already archived, skipping")
+            del archiving_task_id_by_file_id[file_id]
+        if archiving_task_id_by_file_id:
+            dialect: str = self.session.get_bind().dialect.name
+            result: CursorResult = self.session.connection().execute(
+                self._get_insert_skipping_conflicts(dialect),
+                [
+                    {"file_id": file_id, "archiving_task_id": archiving_task_id}
+                    for file_id, archiving_task_id in archiving_task_id_by_file_id.items()
+                ],
+            )
+            skipped_rows: int = len(archiving_task_id_by_file_id) - result.rowcount
+            # Rows left as they were by MySQL are counted as found, so skipped rows are not known
+            if dialect != "mysql" and result.rowcount >= 0 and skipped_rows:
+                LOG.warning(f"Skipped {skipped_rows} archives added concurrently by another writer")
+        return archived_file_ids
+
+    @staticmethod
+    def _get_insert_skipping_conflicts(dialect: str) -> Insert:
+        """Return an insert into the archive table which skips rows with an existing file id.
+
+        MySQL has no insert doing nothing on conflicts, the file id of a conflicting row is set
+        to itself instead. Ignoring errors would also hide foreign key and NOT NULL violations.
+        """
+        if dialect == "mysql":
+            return mysql.insert(Archive).on_duplicate_key_update(file_id=Archive.file_id)
+        if dialect == "postgresql":
+            return postgresql.insert(Archive).on_conflict_do_nothing(index_elements=["file_id"])
+        if dialect == "sqlite":
+            return sqlite.insert(Archive).on_conflict_do_nothing(index_elements=["file_id"])
+        return insert(Archive)
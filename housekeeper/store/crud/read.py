@@ -3,10 +3,15 @@
 import datetime
 import datetime as dt
 import logging
+from itertools import islice
 from pathlib import Path
+from typing import Iterator
 
-from sqlalchemy.orm import Query, Session
+from sqlalchemy import Row, Select, and_, func, select
+from sqlalchemy.orm import Query, Session, make_transient_to_detached
 
+from housekeeper.constants import BUNDLE_PAGE_SIZE, STREAM_BATCH_SIZE, TagMatch
+from housekeeper.disk import SCAN_WORKERS, get_file_stats, get_missing_paths
 from housekeeper.store.base import BaseHandler
 from housekeeper.store.filters.archive_filters import ArchiveFilter, apply_archive_filter
 from housekeeper.store.filters.bundle_filters import BundleFilters, apply_bundle_filter
@@ -17,7 +22,9 @@ from housekeeper.store.filters.version_bundle_filters import (
     apply_version_bundle_filter,
 )
 from housekeeper.store.filters.version_filters import VersionFilter, apply_version_filter
-from housekeeper.store.models import Archive, Bundle, File, Tag, Version
+from housekeeper.store.loading import FileLoading, VersionLoading
+from housekeeper.store.models import Archive, Bundle, File, Tag, Version, file_tag_link
+from housekeeper.usage import FileUsage, UsageReport, get_file_usages
 
 LOG = logging.getLogger(__name__)
 
@@ -51,6 +58,53 @@ class ReadHandler(BaseHandler):
             bundle_name=bundle_name,
         ).first()
 
+    def get_bundle_summaries(
+        self,
+        name_prefixes: list[str] | None = None,
+        after_name: str | None = None,
+        offset: int = 0,
+        limit: int = BUNDLE_PAGE_SIZE,
+    ) -> list[Row]:
+        """Return a page of bundles ordered by name, with their number of versions and files.
+
+        Each row has the id, name and creation date of a bundle, its number of versions and files
+        and the creation date of its latest version. The page is selected before aggregating, so
+        only the versions and files of its bundles are counted, in a single query. Pass the name of
+        the last bundle of a page as `after_name` to get the next one.
+        """
+        filter_functions: list[BundleFilters] = []
+        if name_prefixes:
+            filter_functions.append(BundleFilters.BY_NAME_PREFIXES)
+        if after_name:
+            filter_functions.append(BundleFilters.AFTER_NAME)
+        page = (
+            apply_bundle_filter(
+                bundles=select(Bundle.id, Bundle.name, Bundle.created_at),
+                filter_functions=filter_functions,
+                bundle_name=after_name,
+                name_prefixes=name_prefixes,
+            )
+            .order_by(Bundle.name)
+            .offset(offset)
+            .limit(limit)
+            .subquery()
+        )
+        summaries: Select = (
+            select(
+                page.c.id,
+                page.c.name,
+                page.c.created_at,
+                func.count(func.distinct(Version.id)).label("versions"),
+                func.count(File.id).label("files"),
+                func.max(Version.created_at).label("latest_version_at"),
+            )
+            .outerjoin(Version, Version.bundle_id == page.c.id)
+            .outerjoin(File, File.version_id == Version.id)
+            .group_by(page.c.id, page.c.name, page.c.created_at)
+            .order_by(page.c.name)
+        )
+        return self.session.execute(summaries).all()
+
     def get_version_by_date_and_bundle_name(
         self, version_date: dt.datetime, bundle_name: str
     ) -> Version:
@@ -70,15 +124,90 @@ class ReadHandler(BaseHandler):
             version_id=version_id,
         ).first()
 
+    def get_versions(
+        self,
+        bundle_name: str | None = None,
+        version_id: int | None = None,
+        loading: VersionLoading | None = VersionLoading.LISTING,
+    ) -> list[Version]:
+        """Return the versions of a bundle, or a version by id, latest first.
+
+        With the default `loading`, the bundle of each version and its files with their tags and
+        archives are loaded in a constant number of queries, however many versions there are.
+        """
+        query: Query = self._get_query(table=Version)
+        if loading:
+            query: Query = query.options(*loading.value)
+        if bundle_name:
+            query: Query = apply_bundle_filter(
+                bundles=query.join(Version.bundle),
+                filter_functions=[BundleFilters.BY_NAME],
+                bundle_name=bundle_name,
+            )
+        if version_id:
+            query: Query = apply_version_filter(
+                versions=query, filter_functions=[VersionFilter.BY_ID], version_id=version_id
+            )
+        return query.order_by(Version.created_at.desc(), Version.id).all()
+
     def get_tag(self, tag_name: str = None) -> Tag:
         """Return a tag from the database."""
         LOG.debug(f"Fetching tag with name: {tag_name}")
+        cached_tags: dict[str, Tag] = self._get_cached_tags(tag_names=[tag_name])
+        if cached_tags:
+            return cached_tags[tag_name]
         return apply_tag_filter(
             tags=self._get_query(table=Tag),
             filter_functions=[TagFilter.BY_NAME],
             tag_name=tag_name,
         ).first()
 
+    def get_tags_by_names(self, tag_names: list[str], lock: bool = False) -> list[Tag]:
+        """Return the tags matching the given tag names using a single query.
+
+        Tags found in the tag cache are not queried. Use `lock` to read the latest committed rows
+        with a shared lock, bypassing the tag cache and any snapshot held by the current
+        transaction.
+        """
+        LOG.debug(f"Fetching tags with names: {', '.join(tag_names)}")
+        if not tag_names:
+            return []
+        cached_tags: dict[str, Tag] = {} if lock else self._get_cached_tags(tag_names=tag_names)
+        uncached_tag_names: list[str] = [name for name in tag_names if name not in cached_tags]
+        if not uncached_tag_names:
+            return list(cached_tags.values())
+        tags: Query = apply_tag_filter(
+            tags=self._get_query(table=Tag),
+            filter_functions=[TagFilter.BY_NAMES],
+            tag_names=uncached_tag_names,
+        )
+        if lock:
+            tags = tags.with_for_update(read=True)
+        return list(cached_tags.values()) + tags.all()
+
+    def load_tag_cache(self) -> None:
+        """Load the ids of all tags into the tag cache."""
+        if self.tag_cache is None:
+            return
+        LOG.debug("Loading the tag cache")
+        tag_ids: dict[str, int] = dict(self.session.execute(select(Tag.name, Tag.id)).all())
+        self.tag_cache.load(tag_ids)
+
+    def _get_cached_tags(self, tag_names: list[str]) -> dict[str, Tag]:
+        """Return the tags found in the tag cache by name, without querying the tag table."""
+        if self.tag_cache is None:
+            return {}
+        if not self.tag_cache.is_fresh:
+            self.load_tag_cache()
+        cached_tags: dict[str, Tag] = {}
+        for tag_name in tag_names:
+            tag_id: int | None = self.tag_cache.get_tag_id(tag_name)
+            if tag_id is not None:
+                tag = Tag(id=tag_id, name=tag_name)
+                make_transient_to_detached(tag)
+                cached_tags[tag_name] = self.session.merge(tag, load=False)
+        return cached_tags
+
     def get_tags(self) -> Query:
         """Return all tags from the database."""
         LOG.debug("Fetching all tags")
@@ -92,6 +221,29 @@ class ReadHandler(BaseHandler):
             file_id=file_id,
         ).first()
 
+    def get_files_by_ids(
+        self, file_ids: list[int], loading: FileLoading | None = None
+    ) -> list[File]:
+        """Return the files with the given ids, ordered by id."""
+        query: Query = self._get_query(table=File)
+        if loading:
+            query: Query = query.options(*loading.value)
+        return (
+            apply_file_filter(files=query, filter_functions=[FileFilter.BY_IDS], file_ids=file_ids)
+            .order_by(File.id)
+            .all()
+        )
+
+    def get_included_file_ids(self, file_ids: list[int]) -> set[int]:
+        """Return the ids of the given files that are included in the root."""
+        query: Query = apply_file_filter(
+            files=self.session.query(File.id),
+            filter_functions=[FileFilter.BY_IDS, FileFilter.FILES_BY_IS_INCLUDED],
+            file_ids=file_ids,
+            is_included=True,
+        )
+        return {file_id for (file_id,) in query}
+
     def get_files(
         self,
         bundle_name: str = None,
@@ -100,9 +252,21 @@ class ReadHandler(BaseHandler):
         file_path: str = None,
         local_only: bool = None,
         remote_only: bool = None,
+        without_checksum: bool = None,
+        with_checksum: bool = None,
+        is_included: bool | None = None,
+        tag_match: TagMatch = TagMatch.GROUP_BY,
+        loading: FileLoading | None = None,
     ) -> Query:
-        """Return a query with specified filters for files from the database."""
+        """Return a query with specified filters for files from the database.
+
+        Use `tag_match` to choose how files having all the given tags are matched and `loading`
+        to load relationships of the files up front instead of one file at a time. Use
+        `is_included` to get only files included in the root, or only those with external paths.
+        """
         query: Query = self._get_query(table=File)
+        if loading:
+            query: Query = query.options(*loading.value)
         if bundle_name:
             LOG.debug(f"Fetching files from bundle {bundle_name}")
             query: Query = apply_bundle_filter(
@@ -114,10 +278,8 @@ class ReadHandler(BaseHandler):
             formatted_tags: str = ",".join(tag_names)
             LOG.debug(f"Fetching files with tags in [{formatted_tags}]")
 
-            query: Query = apply_file_filter(
-                files=query.join(File.tags),
-                filter_functions=[FileFilter.FILES_BY_TAGS],
-                tag_names=tag_names,
+            query: Query = self._filter_files_by_tags(
+                files=query, tag_names=tag_names, tag_match=tag_match
             )
         if version_id:
             LOG.debug(f"Fetching files from version {version_id}")
@@ -144,6 +306,22 @@ class ReadHandler(BaseHandler):
                 filter_functions=[FileFilter.IS_REMOTE],
                 is_archived=False,
             )
+        if without_checksum:
+            query: Query = apply_file_filter(
+                files=query,
+                filter_functions=[FileFilter.WITHOUT_CHECKSUM],
+            )
+        if with_checksum:
+            query: Query = apply_file_filter(
+                files=query,
+                filter_functions=[FileFilter.WITH_CHECKSUM],
+            )
+        if is_included is not None:
+            query: Query = apply_file_filter(
+                files=query,
+                filter_functions=[FileFilter.FILES_BY_IS_INCLUDED],
+                is_included=is_included,
+            )
         return query
 
     def get_files_before(
@@ -151,25 +329,195 @@ class ReadHandler(BaseHandler):
         bundle_name: str = None,
         tag_names: list[str] = None,
         before_date: dt.datetime = None,
+        loading: FileLoading | None = None,
     ) -> list[File]:
         """Return files before a specific date from store."""
-        query = self.get_files(tag_names=tag_names, bundle_name=bundle_name)
+        return self._get_files_before_query(
+            bundle_name=bundle_name, tag_names=tag_names, before_date=before_date, loading=loading
+        ).all()
+
+    def get_files_before_in_batches(
+        self,
+        bundle_name: str = None,
+        tag_names: list[str] = None,
+        before_date: dt.datetime = None,
+        loading: FileLoading | None = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> Iterator[list[File]]:
+        """Yield files before a specific date from store in batches, see `get_file_batches`."""
+        return self.get_file_batches(
+            query=self._get_files_before_query(
+                bundle_name=bundle_name,
+                tag_names=tag_names,
+                before_date=before_date,
+                loading=loading,
+            ),
+            batch_size=batch_size,
+        )
+
+    def _get_files_before_query(
+        self,
+        bundle_name: str = None,
+        tag_names: list[str] = None,
+        before_date: dt.datetime = None,
+        loading: FileLoading | None = None,
+    ) -> Query:
+        query = self.get_files(tag_names=tag_names, bundle_name=bundle_name, loading=loading)
         if before_date:
             query = apply_version_filter(
                 versions=self._get_join_version_query(query),
                 filter_functions=[VersionFilter.BY_DATE],
                 before_date=before_date,
             )
-        return query.all()
+        return query
+
+    def stream_files(self, batch_size: int = STREAM_BATCH_SIZE, **filters) -> Iterator[File]:
+        """Yield the files matching the filters of `get_files` one batch at a time."""
+        for batch in self.get_file_batches(query=self.get_files(**filters), batch_size=batch_size):
+            yield from batch
 
     @staticmethod
-    def get_files_not_on_disk(files: list[File]) -> list[File]:
-        """Return list of files that are not on disk."""
+    def get_file_batches(query: Query, batch_size: int = STREAM_BATCH_SIZE) -> Iterator[list[File]]:
+        """Yield the files of a query in batches ordered by id, keeping memory use constant.
+
+        Each batch is fetched with its own query starting after the last id of the previous batch.
+        No cursor is left open between batches, so relationships can be loaded and the session
+        committed while iterating.
+        """
+        query: Query = query.order_by(File.id)
+        last_id: int = 0
+        while batch := (
+            apply_file_filter(files=query, filter_functions=[FileFilter.AFTER_ID], file_id=last_id)
+            .limit(batch_size)
+            .all()
+        ):
+            last_id = batch[-1].id
+            yield batch
+
+    def get_file_rows(
+        self,
+        bundle_name: str = None,
+        tag_names: list[str] = None,
+        version_id: int = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> Iterator[Row]:
+        """Yield (file id, path, tag name, is remote) rows of files ordered by id, one per tag.
+
+        Only these columns are selected and the rows are streamed from a server side cursor
+        without building any ORM objects, which is safe since no other query runs meanwhile.
+        """
+        files: Select = (
+            select(
+                File.id,
+                File.path,
+                Tag.name,
+                and_(Archive.file_id != None, Archive.retrieved_at == None).label("is_remote"),
+            )
+            .outerjoin(file_tag_link, file_tag_link.c.file_id == File.id)
+            .outerjoin(Tag, Tag.id == file_tag_link.c.tag_id)
+            .outerjoin(Archive, Archive.file_id == File.id)
+        )
+        if bundle_name or version_id:
+            files = files.join(Version, Version.id == File.version_id)
+        if bundle_name:
+            files = apply_bundle_filter(
+                bundles=files.join(Bundle, Bundle.id == Version.bundle_id),
+                filter_functions=[BundleFilters.BY_NAME],
+                bundle_name=bundle_name,
+            )
+        if version_id:
+            files = apply_version_filter(
+                versions=files, filter_functions=[VersionFilter.BY_ID], version_id=version_id
+            )
+        if tag_names:
+            files = apply_file_filter(
+                files=files,
+                filter_functions=[FileFilter.FILES_BY_TAG_INTERSECTION],
+                tag_names=tag_names,
+            )
+        files = files.order_by(File.id, Tag.name)
+        yield from self.session.execute(
+            files.execution_options(stream_results=True, yield_per=batch_size)
+        )
+
+    def get_usage_rows(
+        self, bundle_name: str = None, batch_size: int = STREAM_BATCH_SIZE
+    ) -> Iterator[Row]:
+        """Yield the columns needed to sum up the disk usage of files, ordered by id, one per tag.
+
+        Like get_file_rows, the rows are streamed from a server side cursor.
+        """
+        files: Select = (
+            select(
+                File.id,
+                File.path,
+                File.size,
+                Bundle.name.label("bundle_name"),
+                Version.created_at,
+                Tag.name.label("tag_name"),
+                (Archive.file_id != None).label("has_archive"),
+                Archive.archived_at,
+                Archive.retrieved_at,
+            )
+            .join(Version, Version.id == File.version_id)
+            .join(Bundle, Bundle.id == Version.bundle_id)
+            .outerjoin(file_tag_link, file_tag_link.c.file_id == File.id)
+            .outerjoin(Tag, Tag.id == file_tag_link.c.tag_id)
+            .outerjoin(Archive, Archive.file_id == File.id)
+        )
+        if bundle_name:
+            files = apply_bundle_filter(
+                bundles=files, filter_functions=[BundleFilters.BY_NAME], bundle_name=bundle_name
+            )
+        files = files.order_by(File.id, Tag.name)
+        yield from self.session.execute(
+            files.execution_options(stream_results=True, yield_per=batch_size)
+        )
+
+    def get_disk_usage(
+        self,
+        bundle_name: str = None,
+        use_stored_sizes: bool = False,
+        keep_file_sizes: bool = False,
+        workers: int = SCAN_WORKERS,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> UsageReport:
+        """Return the disk usage of files per bundle, version, tag and archive state.
+
+        The files are stat'ed in parallel, a batch at a time, and hardlinks to the same inode are
+        only counted once. With `use_stored_sizes` the sizes in the database are summed instead,
+        without touching the disk or telling hardlinks apart. Use `keep_file_sizes` to keep the
+        size of each file in the report for storing them.
+        """
+        report = UsageReport(keep_file_sizes=keep_file_sizes)
+        file_usages: Iterator[FileUsage] = get_file_usages(
+            self.get_usage_rows(bundle_name=bundle_name, batch_size=batch_size)
+        )
+        if use_stored_sizes:
+            for file_usage in file_usages:
+                report.add_file(file=file_usage, size=file_usage.size)
+            return report
+
+        while file_batch := list(islice(file_usages, batch_size)):
+            paths: list[Path] = [Path(File.get_full_path(file.path)) for file in file_batch]
+            for file_usage, (_, file_stat) in zip(
+                file_batch, get_file_stats(paths=paths, workers=workers)
+            ):
+                report.add_file_stat(file=file_usage, file_stat=file_stat)
+        return report
+
+    @staticmethod
+    def get_files_not_on_disk(files: list[File], workers: int = SCAN_WORKERS) -> list[File]:
+        """Return list of files that are not on disk.
+
+        Each directory holding any of the files is listed once instead of checking every file.
+        """
         if not files:
             return []
 
-        files_not_on_disk = [f for f in files if not Path(f.full_path).is_file()]
-        return files_not_on_disk
+        paths: list[Path] = [Path(file.full_path) for file in files]
+        missing_paths: set[Path] = set(get_missing_paths(paths=paths, workers=workers))
+        return [file for file, path in zip(files, paths) if path in missing_paths]
 
     def get_archived_files_for_bundle(self, bundle_name: str, tags: list | None) -> list[File]:
         """Returns all files in the given bundle, with the given tags, and are archived."""
@@ -240,20 +588,98 @@ class ReadHandler(BaseHandler):
         """Return the bundle name for the specified file."""
         return self.get_files(file_path=file_path).first().version.bundle.name
 
-    def get_non_archived_files(self, tag_names: list[str], limit: int | None = None) -> list[File]:
+    def get_non_archived_files(
+        self,
+        tag_names: list[str],
+        limit: int | None = None,
+        tag_match: TagMatch = TagMatch.GROUP_BY,
+    ) -> list[File]:
         """Return all spring files which are not marked as archived in Housekeeper."""
         return (
-            apply_file_filter(
+            self._get_non_archived_files_query(tag_names=tag_names, tag_match=tag_match)
+            .limit(limit)
+            .all()
+        )
+
+    def get_non_archived_files_page(
+        self,
+        tag_names: list[str],
+        after_file_id: int = 0,
+        limit: int = STREAM_BATCH_SIZE,
+        skip_locked: bool = False,
+        tag_match: TagMatch = TagMatch.GROUP_BY,
+    ) -> list[File]:
+        """Return the next page of non-archived files ordered by id, after the given file id.
+
+        Pass the id of the last file of a page to get the next one. Use `skip_locked` to claim the
+        files with SELECT ... FOR UPDATE SKIP LOCKED where the database supports it, so that
+        concurrent workers get different files. The claim holds until the transaction ends.
+        """
+        if skip_locked and tag_match == TagMatch.GROUP_BY:
+            tag_match = TagMatch.EXISTS
+        files: Query = apply_file_filter(
+            files=self._get_non_archived_files_query(tag_names=tag_names, tag_match=tag_match),
+            filter_functions=[FileFilter.AFTER_ID],
+            file_id=after_file_id,
+        )
+        files = files.order_by(File.id).limit(limit)
+        if skip_locked:
+            if self._supports_skip_locked():
+                files = files.with_for_update(skip_locked=True, of=File)
+            else:
+                LOG.debug("The database does not support SKIP LOCKED, files are not claimed")
+        return files.all()
+
+    def _get_non_archived_files_query(self, tag_names: list[str], tag_match: TagMatch) -> Query:
+        if tag_match != TagMatch.GROUP_BY:
+            files: Query = self._filter_files_by_tags(
+                files=self._get_query(table=File), tag_names=tag_names, tag_match=tag_match
+            )
+        else:
+            files: Query = apply_file_filter(
                 self._get_join_file_tags_archive_query(),
-                filter_functions=[
-                    FileFilter.FILES_BY_TAGS,
-                    FileFilter.FILES_BY_IS_ARCHIVED,
-                ],
+                filter_functions=[FileFilter.FILES_BY_TAGS],
                 tag_names=tag_names,
-                is_archived=False,
             )
-            .limit(limit)
-            .all()
+        return apply_file_filter(
+            files,
+            filter_functions=[FileFilter.FILES_BY_IS_ARCHIVED],
+            is_archived=False,
+        )
+
+    def _supports_skip_locked(self) -> bool:
+        """Return whether the database supports SELECT ... FOR UPDATE SKIP LOCKED.
+
+        The dialect of the connection is used, since the server version is only known once
+        connected. An unknown version is taken as not supporting it.
+        """
+        dialect = self.session.connection().dialect
+        if dialect.name == "postgresql":
+            return True
+        if dialect.name == "mysql" and dialect.server_version_info:
+            minimum_version = (10, 6) if dialect.is_mariadb else (8, 0, 1)
+            return dialect.server_version_info >= minimum_version
+        return False
+
+    @staticmethod
+    def _filter_files_by_tags(files: Query, tag_names: list[str], tag_match: TagMatch) -> Query:
+        """Filter a file query on files having all the given tags, using the given strategy."""
+        if tag_match == TagMatch.EXISTS:
+            return apply_file_filter(
+                files=files,
+                filter_functions=[FileFilter.FILES_BY_ALL_TAGS],
+                tag_names=tag_names,
+            )
+        if tag_match == TagMatch.INTERSECT:
+            return apply_file_filter(
+                files=files,
+                filter_functions=[FileFilter.FILES_BY_TAG_INTERSECTION],
+                tag_names=tag_names,
+            )
+        return apply_file_filter(
+            files=files.join(File.tags),
+            filter_functions=[FileFilter.FILES_BY_TAGS],
+            tag_names=tag_names,
         )
 
     def get_archives(
@@ -5,14 +5,16 @@ This module handles updating entries in the store/database.
 import logging
 from datetime import datetime
 
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
+from housekeeper.constants import STREAM_BATCH_SIZE
 from housekeeper.store.base import BaseHandler
 from housekeeper.store.filters.archive_filters import (
     ArchiveFilter,
     apply_archive_filter,
 )
-from housekeeper.store.models import Archive
+from housekeeper.store.models import Archive, File
 
 LOG = logging.getLogger(__name__)
 
@@ -41,23 +43,35 @@ class UpdateHandler(BaseHandler):
 
     def update_finished_archival_task(self, archiving_task_id: int) -> None:
         """Sets the archived_at field to now for all archives with the given archiving task id."""
-        completed_archives: list[Archive] = apply_archive_filter(
-            archives=self._get_query(table=Archive),
-            filter_functions=[ArchiveFilter.BY_ARCHIVING_TASK_ID],
-            task_id=archiving_task_id,
-        ).all()
-        for archive in completed_archives:
-            self.update_archiving_time_stamp(archive=archive)
+        self.update_finished_archival_tasks(archiving_task_ids=[archiving_task_id])
 
     def update_finished_retrieval_task(self, retrieval_task_id: int) -> None:
-        """Sets the archived_at field to now for all archives with the given archiving task id."""
-        completed_archives: list[Archive] = apply_archive_filter(
+        """Sets the retrieved_at field to now for all archives with the given retrieval task id."""
+        self.update_finished_retrieval_tasks(retrieval_task_ids=[retrieval_task_id])
+
+    def update_finished_archival_tasks(self, archiving_task_ids: list[int]) -> int:
+        """Sets the archived_at field to now for all archives with any of the given archiving task
+        ids and no previous timestamp, in a single statement. Returns the number of updated
+        archives."""
+        if not archiving_task_ids:
+            return 0
+        return apply_archive_filter(
+            archives=self._get_query(table=Archive),
+            filter_functions=[ArchiveFilter.BY_ARCHIVING_TASK_IDS, ArchiveFilter.NOT_ARCHIVED],
+            task_ids=archiving_task_ids,
+        ).update({Archive.archived_at: datetime.now()}, synchronize_session="evaluate")
+
+    def update_finished_retrieval_tasks(self, retrieval_task_ids: list[int]) -> int:
+        """Sets the retrieved_at field to now for all archives with any of the given retrieval task
+        ids and no previous timestamp, in a single statement. Returns the number of updated
+        archives."""
+        if not retrieval_task_ids:
+            return 0
+        return apply_archive_filter(
             archives=self._get_query(table=Archive),
-            filter_functions=[ArchiveFilter.BY_RETRIEVAL_TASK_ID],
-            task_id=retrieval_task_id,
-        ).all()
-        for archive in completed_archives:
-            self.update_retrieval_time_stamp(archive=archive)
+            filter_functions=[ArchiveFilter.BY_RETRIEVAL_TASK_IDS, ArchiveFilter.NOT_RETRIEVED],
+            task_ids=retrieval_task_ids,
+        ).update({Archive.retrieved_at: datetime.now()}, synchronize_session="evaluate")
 
     @staticmethod
     def update_retrieval_task_id(archive: Archive, retrieval_task_id: int):
@@ -68,3 +82,41 @@ class UpdateHandler(BaseHandler):
     def update_archiving_task_id(archive: Archive, archiving_task_id: int):
         """Sets the archiving_task_id in the Archive entry for the provided file."""
         archive.archiving_task_id: int = archiving_task_id
+
+    def update_retrieval_task_id_for_files(
+        self, file_ids: list[int], retrieval_task_id: int
+    ) -> int:
+        """Sets the retrieval_task_id in the Archive entries for the provided files in a single
+        statement. Returns the number of updated archives."""
+        if not file_ids:
+            return 0
+        return apply_archive_filter(
+            archives=self._get_query(table=Archive),
+            filter_functions=[ArchiveFilter.BY_FILE_IDS],
+            file_ids=file_ids,
+        ).update({Archive.retrieval_task_id: retrieval_task_id}, synchronize_session="evaluate")
+
+    def update_archiving_task_id_for_files(
+        self, file_ids: list[int], archiving_task_id: int
+    ) -> int:
+        """Sets the archiving_task_id in the Archive entries for the provided files in a single
+        statement. Returns the number of updated archives."""
+        if not file_ids:
+            return 0
+        return apply_archive_filter(
+            archives=self._get_query(table=Archive),
+            filter_functions=[ArchiveFilter.BY_FILE_IDS],
+            file_ids=file_ids,
+        ).update({Archive.archiving_task_id: archiving_task_id}, synchronize_session="evaluate")
+
+    def update_file_sizes(self, file_sizes: dict[int, int]) -> None:
+        """Sets the size of files by their id, in one executemany update per batch of files."""
+        file_ids: list[int] = list(file_sizes)
+        for start in range(0, len(file_ids), STREAM_BATCH_SIZE):
+            self.session.execute(
+                update(File),
+                [
+                    {"id": file_id, "size": file_sizes[file_id]}
+                    for file_id in file_ids[start : start + STREAM_BATCH_SIZE]
+                ],
+            )
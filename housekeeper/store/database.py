@@ -1,23 +1,101 @@
 from sqlalchemy import create_engine, inspect
+from sqlalchemy.engine import make_url
 from sqlalchemy.engine.base import Engine
 from sqlalchemy.engine.reflection import Inspector
+from sqlalchemy.engine.url import URL
 from sqlalchemy.orm import Session, scoped_session, sessionmaker
+from sqlalchemy.pool import NullPool, QueuePool
 
 from housekeeper.exc import HousekeeperError
+from housekeeper.store.instrumentation import QUERY_METRICS, listen_to_query_events
 from housekeeper.store.models import Model
+from housekeeper.store.pool import (
+    MeteredQueuePool,
+    get_pool_counters,
+    get_pool_status,
+    listen_to_pool_events,
+)
 
 SESSION: Session | None = None
 ENGINE: Engine | None = None
 
 
-def initialize_database(db_uri: str) -> None:
-    """Initialize the global SQLAlchemy engine and session for housekeeper db."""
+def initialize_database(
+    db_uri: str,
+    pool_size: int | None = None,
+    max_overflow: int | None = None,
+    pool_recycle: int | None = None,
+    pool_timeout: float | None = None,
+    null_pool: bool = False,
+    instrument: bool = False,
+) -> None:
+    """Initialize the global SQLAlchemy engine and session for housekeeper db.
+
+    Pool settings that are not given keep the SQLAlchemy defaults. Use `null_pool` to open a
+    new connection per checkout, which suits short lived command line runs, and `instrument`
+    to record the count, latency and rows of the executed statements.
+    """
     global SESSION, ENGINE
-    ENGINE = create_engine(db_uri, pool_pre_ping=True, future=True)
+    ENGINE = create_engine(
+        db_uri,
+        pool_pre_ping=True,
+        future=True,
+        **get_pool_arguments(
+            db_url=make_url(db_uri),
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_recycle=pool_recycle,
+            pool_timeout=pool_timeout,
+            null_pool=null_pool,
+        ),
+    )
+    listen_to_pool_events(ENGINE)
+    if instrument:
+        QUERY_METRICS.reset()
+        listen_to_query_events(ENGINE)
     session_factory = sessionmaker(ENGINE)
     SESSION = scoped_session(session_factory)
 
 
+def get_pool_arguments(
+    db_url: URL,
+    pool_size: int | None,
+    max_overflow: int | None,
+    pool_recycle: int | None,
+    pool_timeout: float | None,
+    null_pool: bool,
+) -> dict:
+    """Return the engine arguments configuring the connection pool."""
+    if null_pool:
+        return {"poolclass": NullPool}
+    pool_arguments: dict = {}
+    if pool_recycle is not None:
+        pool_arguments["pool_recycle"] = pool_recycle
+    if not issubclass(db_url.get_dialect().get_pool_class(db_url), QueuePool):
+        return pool_arguments
+    pool_arguments["poolclass"] = MeteredQueuePool
+    queue_arguments: dict = {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": pool_timeout,
+    }
+    pool_arguments.update(
+        {argument: value for argument, value in queue_arguments.items() if value is not None}
+    )
+    return pool_arguments
+
+
+def get_pool_metrics() -> dict:
+    """Return the usage counters and the current status of the connection pool."""
+    engine: Engine = get_engine()
+    return {**get_pool_counters(engine), **get_pool_status(engine)}
+
+
+def get_query_metrics() -> dict:
+    """Return the statement counts, latencies and slowest statements recorded so far."""
+    return QUERY_METRICS.as_dict()
+
+
 def get_session() -> Session:
     """
     Get a SQLAlchemy session with a connection to housekeeper db.
@@ -39,6 +39,31 @@ def filter_by_retrieval_task_id(archives: Query, task_id: int, **kwargs) -> Quer
     return archives.filter(Archive.retrieval_task_id == task_id)
 
 
+def filter_by_archiving_task_ids(archives: Query, task_ids: list[int], **kwargs) -> Query:
+    """Return archives where the archiving task id is one of the given."""
+    return archives.filter(Archive.archiving_task_id.in_(task_ids))
+
+
+def filter_by_retrieval_task_ids(archives: Query, task_ids: list[int], **kwargs) -> Query:
+    """Return archives where the retrieval task id is one of the given."""
+    return archives.filter(Archive.retrieval_task_id.in_(task_ids))
+
+
+def filter_by_file_ids(archives: Query, file_ids: list[int], **kwargs) -> Query:
+    """Return archives of the given files."""
+    return archives.filter(Archive.file_id.in_(file_ids))
+
+
+def filter_not_archived(archives: Query, **kwargs) -> Query:
+    """Return archives without an archived_at timestamp."""
+    return archives.filter(Archive.archived_at == None)
+
+
+def filter_not_retrieved(archives: Query, **kwargs) -> Query:
+    """Return archives without a retrieved_at timestamp."""
+    return archives.filter(Archive.retrieved_at == None)
+
+
 def filter_by_retrieved_before(archives: Query, retrieved_before: datetime, **kwargs) -> Query:
     """Returns archives which were retrieved before the given date."""
     return archives.filter(Archive.retrieved_at < retrieved_before)
@@ -53,6 +78,11 @@ class ArchiveFilter(Enum):
     BY_ARCHIVING_TASK_ID: Callable = filter_by_archiving_task_id
     BY_RETRIEVAL_TASK_ID: Callable = filter_by_retrieval_task_id
     BY_RETRIEVED_BEFORE: Callable = filter_by_retrieved_before
+    BY_ARCHIVING_TASK_IDS: Callable = filter_by_archiving_task_ids
+    BY_RETRIEVAL_TASK_IDS: Callable = filter_by_retrieval_task_ids
+    BY_FILE_IDS: Callable = filter_by_file_ids
+    NOT_ARCHIVED: Callable = filter_not_archived
+    NOT_RETRIEVED: Callable = filter_not_retrieved
 
 
 def apply_archive_filter(
@@ -60,10 +90,16 @@ def apply_archive_filter(
     filter_functions: list[ArchiveFilter],
     task_id: int = None,
     retrieved_before: datetime = None,
+    task_ids: list[int] = None,
+    file_ids: list[int] = None,
 ) -> Query:
     """Apply filtering functions to archives and return filtered Query."""
     for filter_function in filter_functions:
         archives: Query = filter_function(
-            archives=archives, task_id=task_id, retrieved_before=retrieved_before
+            archives=archives,
+            task_id=task_id,
+            retrieved_before=retrieved_before,
+            task_ids=task_ids,
+            file_ids=file_ids,
         )
     return archives
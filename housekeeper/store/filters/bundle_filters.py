@@ -1,6 +1,7 @@
 from enum import Enum
 from typing import Callable
 
+from sqlalchemy import or_
 from sqlalchemy.orm import Query
 
 from housekeeper.store.models import Bundle
@@ -16,11 +17,25 @@ def filter_bundle_by_id(bundles: Query, bundle_id: int, **kwargs) -> Query:
     return bundles.filter(Bundle.id == bundle_id)
 
 
+def filter_bundles_by_name_prefixes(bundles: Query, name_prefixes: list[str], **kwargs) -> Query:
+    """Return bundles with a name starting with any of the prefixes."""
+    return bundles.filter(
+        or_(*[Bundle.name.startswith(prefix, autoescape=True) for prefix in name_prefixes])
+    )
+
+
+def filter_bundles_after_name(bundles: Query, bundle_name: str, **kwargs) -> Query:
+    """Return bundles with a name sorting after the given name."""
+    return bundles.filter(Bundle.name > bundle_name)
+
+
 class BundleFilters(Enum):
     """Define Bundle filter functions."""
 
     BY_NAME: Callable = filter_bundle_by_name
     BY_ID: Callable = filter_bundle_by_id
+    BY_NAME_PREFIXES: Callable = filter_bundles_by_name_prefixes
+    AFTER_NAME: Callable = filter_bundles_after_name
 
 
 def apply_bundle_filter(
@@ -28,6 +43,7 @@ def apply_bundle_filter(
     filter_functions: list[Callable],
     bundle_name: str | None = None,
     bundle_id: int | None = None,
+    name_prefixes: list[str] | None = None,
 ) -> Query:
     """Apply filtering functions and return filtered query."""
     for filter_function in filter_functions:
@@ -35,5 +51,6 @@ def apply_bundle_filter(
             bundles=bundles,
             bundle_name=bundle_name,
             bundle_id=bundle_id,
+            name_prefixes=name_prefixes,
         )
     return bundles
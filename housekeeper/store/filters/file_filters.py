@@ -1,10 +1,19 @@
 from enum import Enum
 from typing import Callable
 
-from sqlalchemy import and_, func as sqlalchemy_func, or_
+from sqlalchemy import (
+    Select,
+    and_,
+    exists,
+    func as sqlalchemy_func,
+    intersect,
+    or_,
+    select,
+)
 from sqlalchemy.orm import Query
+from sqlalchemy.sql.selectable import ScalarSelect
 
-from housekeeper.store.models import Archive, File, Tag
+from housekeeper.store.models import Archive, File, Tag, file_tag_link
 
 
 def filter_files_by_id(files: Query, file_id: int, **kwargs) -> Query:
@@ -12,6 +21,16 @@ def filter_files_by_id(files: Query, file_id: int, **kwargs) -> Query:
     return files.filter(File.id == file_id)
 
 
+def filter_files_by_ids(files: Query, file_ids: list[int], **kwargs) -> Query:
+    """Filter files by file ids."""
+    return files.filter(File.id.in_(file_ids))
+
+
+def filter_files_after_id(files: Query, file_id: int, **kwargs) -> Query:
+    """Filter files with an id greater than the given file id."""
+    return files.filter(File.id > file_id)
+
+
 def filter_files_by_path(files: Query, file_path: str, **kwargs) -> Query:
     """Filter files by path."""
     return files.filter(File.path == file_path)
@@ -26,11 +45,52 @@ def filter_files_by_tags(files: Query, tag_names: list[str], **kwargs) -> Query:
     )
 
 
+def filter_files_by_all_tags(files: Query, tag_names: list[str], **kwargs) -> Query:
+    """Filter files having all the given tags, using one EXISTS subquery per tag.
+
+    Unlike filter_files_by_tags, this does not require the query to be joined with the tags and
+    does not aggregate over the matching files, so a LIMIT can stop the scan early.
+    """
+    for tag_name in dict.fromkeys(tag_names):
+        files = files.filter(
+            exists().where(
+                file_tag_link.c.file_id == File.id,
+                file_tag_link.c.tag_id == _get_tag_id_subquery(tag_name),
+            )
+        )
+    return files
+
+
+def filter_files_by_tag_intersection(files: Query, tag_names: list[str], **kwargs) -> Query:
+    """Filter files having all the given tags, using the intersection of the file ids per tag.
+
+    The file ids are computed from the tag index alone before any file row is read, which makes
+    this the fastest option when one of the tags is selective and all matches are fetched.
+    """
+    file_ids_per_tag: list[Select] = [
+        select(file_tag_link.c.file_id).where(
+            file_tag_link.c.tag_id == _get_tag_id_subquery(tag_name)
+        )
+        for tag_name in dict.fromkeys(tag_names)
+    ]
+    return files.filter(File.id.in_(intersect(*file_ids_per_tag)))
+
+
+def _get_tag_id_subquery(tag_name: str) -> ScalarSelect:
+    """Return a subquery resolving a tag name to its id."""
+    return select(Tag.id).where(Tag.name == tag_name).scalar_subquery()
+
+
 def filter_files_by_is_archived(files: Query, is_archived: bool, **kwargs) -> Query:
     """Filters the query depending on if the files are archived or not."""
     return files.filter((File.archive != None) == is_archived)
 
 
+def filter_files_by_is_included(files: Query, is_included: bool, **kwargs) -> Query:
+    """Filters the query depending on if the files are included in the root or external."""
+    return files.filter(File.is_included if is_included else File.is_external)
+
+
 def filter_files_by_is_remote(files: Query, **kwargs) -> Query:
     """Filters the query depending on if the files are remote or not."""
     files = files.outerjoin(File.archive)
@@ -45,23 +105,42 @@ def filter_files_by_is_local(files: Query, **kwargs) -> Query:
     return files.filter(local_condition)
 
 
+def filter_files_without_checksum(files: Query, **kwargs) -> Query:
+    """Filters the query on files that do not have a checksum."""
+    return files.filter(File.checksum == None)
+
+
+def filter_files_with_checksum(files: Query, **kwargs) -> Query:
+    """Filters the query on files that have a checksum."""
+    return files.filter(File.checksum != None)
+
+
 class FileFilter(Enum):
     """Define filter functions for Files joined tables."""
 
     BY_ID: Callable = filter_files_by_id
+    BY_IDS: Callable = filter_files_by_ids
+    AFTER_ID: Callable = filter_files_after_id
     BY_PATH: Callable = filter_files_by_path
     FILES_BY_TAGS: Callable = filter_files_by_tags
+    FILES_BY_ALL_TAGS: Callable = filter_files_by_all_tags
+    FILES_BY_TAG_INTERSECTION: Callable = filter_files_by_tag_intersection
     FILES_BY_IS_ARCHIVED: Callable = filter_files_by_is_archived
+    FILES_BY_IS_INCLUDED: Callable = filter_files_by_is_included
     IS_REMOTE: Callable = filter_files_by_is_remote
     IS_LOCAL: Callable = filter_files_by_is_local
+    WITHOUT_CHECKSUM: Callable = filter_files_without_checksum
+    WITH_CHECKSUM: Callable = filter_files_with_checksum
 
 
 def apply_file_filter(
     files: Query,
     filter_functions: list[Callable],
     file_id: int | None = None,
+    file_ids: list[int] | None = None,
     file_path: str | None = None,
     is_archived: bool | None = None,
+    is_included: bool | None = None,
     tag_names: list[str] | None = None,
 ) -> Query:
     """Apply filtering functions and return filtered query."""
@@ -69,8 +148,10 @@ def apply_file_filter(
         files: Query = filter_function(
             files=files,
             file_id=file_id,
+            file_ids=file_ids,
             file_path=file_path,
             is_archived=is_archived,
+            is_included=is_included,
             tag_names=tag_names,
         )
     return files
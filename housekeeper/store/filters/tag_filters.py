@@ -6,26 +6,34 @@ from sqlalchemy.orm import Query
 from housekeeper.store.models import Tag
 
 
-def filter_tag_by_name(tags: Query, tag_name: str) -> Query:
+def filter_tag_by_name(tags: Query, tag_name: str, **kwargs) -> Query:
     """Return tag by bundle name."""
     return tags.filter(Tag.name == tag_name)
 
 
+def filter_tags_by_names(tags: Query, tag_names: list[str], **kwargs) -> Query:
+    """Return tags with a name in the given list of tag names."""
+    return tags.filter(Tag.name.in_(tag_names))
+
+
 class TagFilter(Enum):
     """Define Tag filter functions."""
 
     BY_NAME: Callable = filter_tag_by_name
+    BY_NAMES: Callable = filter_tags_by_names
 
 
 def apply_tag_filter(
     tags: Query,
     filter_functions: list[Callable],
     tag_name: str | None = None,
+    tag_names: list[str] | None = None,
 ) -> Query:
     """Apply filtering functions to tag and return filtered Query."""
     for filter_function in filter_functions:
         tags: Query = filter_function(
             tags=tags,
             tag_name=tag_name,
+            tag_names=tag_names,
         )
     return tags
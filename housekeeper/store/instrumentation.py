@@ -0,0 +1,216 @@
+"""Query metrics for the housekeeper database"""
+
+import heapq
+import itertools
+import math
+import random
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine.base import Engine
+
+SLOWEST_STATEMENTS = 5
+DURATION_SAMPLE_SIZE = 10_000
+PARAMETERS_MAX_LENGTH = 200
+PERCENTILES: list[int] = [50, 95, 99]
+START_TIMES_KEY = "query_start_times"
+# Row count reported by MySQL drivers for unbuffered results, whose rows are not counted yet
+UNBUFFERED_ROW_COUNT = 2**64 - 1
+
+
+class QueryMetrics:
+    """Counts, latencies and affected and returned rows of the statements executed on an engine.
+
+    The rows returned are only known for drivers reporting the row count of queries, such as
+    PyMySQL, other queries are counted as without row count. Percentiles are taken from a uniform
+    sample of at most `duration_sample_size` durations, so memory use does not grow with the
+    number of statements.
+    """
+
+    def __init__(
+        self,
+        slowest_statements: int = SLOWEST_STATEMENTS,
+        duration_sample_size: int = DURATION_SAMPLE_SIZE,
+    ):
+        self._lock = threading.Lock()
+        self._order = itertools.count()
+        self._random = random.Random()
+        self.slowest_statements: int = slowest_statements
+        self.duration_sample_size: int = duration_sample_size
+        self.statements: int = 0
+        self.rows_affected: int = 0
+        self.rows_returned: int = 0
+        self.queries_without_row_count: int = 0
+        self.total_seconds: float = 0.0
+        self.max_seconds: float = 0.0
+        self.durations: list[float] = []
+        self.slowest: list[tuple[float, int, str, str]] = []
+
+    def record(
+        self,
+        statement: str,
+        parameters,
+        seconds: float,
+        rows_affected: int = 0,
+        rows_returned: int | None = 0,
+    ) -> None:
+        """Record an executed statement, keeping it if it is among the slowest.
+
+        Pass `rows_returned` as None for a query whose number of rows is not known.
+        """
+        with self._lock:
+            self.statements += 1
+            self.rows_affected += max(rows_affected, 0)
+            if rows_returned is None:
+                self.queries_without_row_count += 1
+            else:
+                self.rows_returned += rows_returned
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+            self._sample_duration(seconds)
+            if len(self.slowest) < self.slowest_statements or seconds > self.slowest[0][0]:
+                entry = (seconds, next(self._order), statement, _format_parameters(parameters))
+                if len(self.slowest) < self.slowest_statements:
+                    heapq.heappush(self.slowest, entry)
+                else:
+                    heapq.heapreplace(self.slowest, entry)
+
+    def _sample_duration(self, seconds: float) -> None:
+        """Keep the duration with the same chance as every recorded duration before it."""
+        if len(self.durations) < self.duration_sample_size:
+            self.durations.append(seconds)
+            return
+        index: int = self._random.randrange(self.statements)
+        if index < self.duration_sample_size:
+            self.durations[index] = seconds
+
+    def reset(self) -> None:
+        """Forget all recorded statements."""
+        with self._lock:
+            self.statements = 0
+            self.rows_affected = 0
+            self.rows_returned = 0
+            self.queries_without_row_count = 0
+            self.total_seconds = 0.0
+            self.max_seconds = 0.0
+            self.durations = []
+            self.slowest = []
+
+    def as_dict(self) -> dict:
+        """Return the counts, the total and percentile latencies and the slowest statements."""
+        with self._lock:
+            durations: list[float] = sorted(self.durations)
+            return {
+                "statements": self.statements,
+                "rows_affected": self.rows_affected,
+                "rows_returned": self.rows_returned,
+                "queries_without_row_count": self.queries_without_row_count,
+                "total_seconds": self.total_seconds,
+                "max_seconds": self.max_seconds,
+                **{
+                    f"p{percentile}_seconds": get_percentile(durations, percentile)
+                    for percentile in PERCENTILES
+                },
+                "slowest": [
+                    {"seconds": seconds, "statement": statement, "parameters": parameters}
+                    for seconds, _, statement, parameters in sorted(self.slowest, reverse=True)
+                ],
+            }
+
+
+QUERY_METRICS = QueryMetrics()
+
+
+def get_percentile(sorted_values: list[float], percentile: int) -> float:
+    """Return the nearest rank percentile of sorted values, or 0 if there are none."""
+    if not sorted_values:
+        return 0.0
+    rank: int = math.ceil(percentile / 100 * len(sorted_values))
+    return sorted_values[max(rank, 1) - 1]
+
+
+def _format_parameters(parameters) -> str:
+    """Return the parameters of a statement as text, shortened if long as for executemany."""
+    text: str = repr(parameters)
+    if len(text) > PARAMETERS_MAX_LENGTH:
+        return f"{text[:PARAMETERS_MAX_LENGTH]}..."
+    return text
+
+
+def format_rows_returned(metrics: dict) -> str:
+    """Return the rows returned, n/a if unknown, noting the queries without a row count."""
+    if not metrics["queries_without_row_count"]:
+        return str(metrics["rows_returned"])
+    if not metrics["rows_returned"]:
+        return "n/a"
+    return f"{metrics['rows_returned']} (n/a for {metrics['queries_without_row_count']} queries)"
+
+
+def format_query_metrics(metrics: dict) -> str:
+    """Return a summary of query metrics for printing at the end of a command."""
+    lines: list[str] = [
+        f"Statements: {metrics['statements']}, rows affected: {metrics['rows_affected']}, "
+        f"rows returned: {format_rows_returned(metrics)}, "
+        f"total: {metrics['total_seconds'] * 1000:.1f} ms",
+        "Latency: "
+        + ", ".join(
+            f"p{percentile} {metrics[f'p{percentile}_seconds'] * 1000:.2f} ms"
+            for percentile in PERCENTILES
+        )
+        + f", max {metrics['max_seconds'] * 1000:.2f} ms",
+    ]
+    if metrics["slowest"]:
+        lines.append("Slowest statements:")
+    for statement in metrics["slowest"]:
+        lines.append(
+            f"  {statement['seconds'] * 1000:.2f} ms {' '.join(statement['statement'].split())}"
+            f" -- {statement['parameters']}"
+        )
+    return "\n".join(lines)
+
+
+def get_rows_returned(cursor) -> int | None:
+    """Return the number of rows of a query as reported by the driver, None if it is unknown.
+
+    Statements without a result, such as SAVEPOINT, return no rows.
+    """
+    if cursor.description is None:
+        return 0
+    if cursor.rowcount < 0 or cursor.rowcount == UNBUFFERED_ROW_COUNT:
+        return None
+    return cursor.rowcount
+
+
+def listen_to_query_events(engine: Engine, metrics: QueryMetrics = QUERY_METRICS) -> None:
+    """Record the duration of each statement the engine executes, the rows affected by inserts,
+    updates and deletes and the rows returned by queries, as reported by the driver.
+
+    The duration is the time spent in the driver executing the statement, which for streamed
+    results does not include fetching the rows.
+    """
+
+    def before_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+        connection.info.setdefault(START_TIMES_KEY, []).append(time.perf_counter())
+
+    def after_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+        seconds: float = time.perf_counter() - connection.info[START_TIMES_KEY].pop()
+        is_write: bool = bool(
+            context and (context.isinsert or context.isupdate or context.isdelete)
+        )
+        metrics.record(
+            statement=statement,
+            parameters=parameters,
+            seconds=seconds,
+            rows_affected=cursor.rowcount if is_write else 0,
+            rows_returned=get_rows_returned(cursor) if not is_write else 0,
+        )
+
+    def handle_error(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get(START_TIMES_KEY):
+            connection.info[START_TIMES_KEY].pop()
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine, "handle_error", handle_error)
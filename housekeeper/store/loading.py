@@ -0,0 +1,28 @@
+"""Eager loading profiles for queries"""
+
+from enum import Enum
+
+from sqlalchemy.orm import joinedload, selectinload
+
+from housekeeper.store.models import File, Version
+
+
+class FileLoading(Enum):
+    """Define which relationships to load together with the files of a query."""
+
+    TAGS: tuple = (selectinload(File.tags),)
+    LISTING: tuple = (
+        selectinload(File.tags),
+        joinedload(File.archive),
+        joinedload(File.version).joinedload(Version.bundle),
+    )
+
+
+class VersionLoading(Enum):
+    """Define which relationships to load together with the versions of a query."""
+
+    LISTING: tuple = (
+        joinedload(Version.bundle),
+        selectinload(Version.files).selectinload(File.tags),
+        selectinload(Version.files).joinedload(File.archive),
+    )
@@ -3,17 +3,88 @@
 import datetime as dt
 from pathlib import Path
 
-from sqlalchemy import Column, ForeignKey, Table, UniqueConstraint, orm, types
+from sqlalchemy import (
+    Column,
+    ColumnElement,
+    ForeignKey,
+    Index,
+    Table,
+    UniqueConstraint,
+    and_,
+    case,
+    func,
+    literal,
+    not_,
+    or_,
+    orm,
+    types,
+)
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import backref, declarative_base
+from sqlalchemy.sql.visitors import InternalTraversal
 
 Model = declarative_base()
 
+ABSOLUTE_PATH_PREFIX: str = "/"
+LIKE_ESCAPE: str = "!"
+
+
+class PathStartswith(ColumnElement[bool]):
+    """Check if a path starts with a prefix, comparing them byte by byte whatever the collation."""
+
+    type = types.Boolean()
+    _is_implicitly_boolean = True
+    inherit_cache = True
+    _traverse_internals = [
+        ("path", InternalTraversal.dp_clauseelement),
+        ("prefix", InternalTraversal.dp_clauseelement),
+        ("prefix_end", InternalTraversal.dp_clauseelement),
+        ("pattern", InternalTraversal.dp_clauseelement),
+    ]
+
+    def __init__(self, path: ColumnElement[str], prefix: str):
+        self.path = path
+        self.prefix = literal(prefix)
+        self.prefix_end = literal(f"{prefix[:-1]}{chr(ord(prefix[-1]) + 1)}")
+        escaped_prefix: str = "".join(
+            f"{LIKE_ESCAPE}{character}" if character in f"{LIKE_ESCAPE}%_" else character
+            for character in prefix
+        )
+        self.pattern = literal(f"{escaped_prefix}%")
+
+
+@compiles(PathStartswith)
+def _compile_path_startswith(element: PathStartswith, compiler, **kwargs) -> str:
+    """Compare the start of the path with the prefix, which is exact on any collation."""
+    path_start = func.substr(element.path, 1, func.length(element.prefix))
+    return f"({compiler.process(path_start == element.prefix, **kwargs)})"
+
+
+@compiles(PathStartswith, "sqlite")
+def _compile_path_startswith_sqlite(element: PathStartswith, compiler, **kwargs) -> str:
+    """Compare the path with the range of paths starting with the prefix, so that the path index
+    can be used. This is exact since SQLite compares text by bytes by default."""
+    path_range = and_(element.path >= element.prefix, element.path < element.prefix_end)
+    return f"({compiler.process(path_range, **kwargs)})"
+
+
+@compiles(PathStartswith, "mysql")
+def _compile_path_startswith_mysql(element: PathStartswith, compiler, **kwargs) -> str:
+    """Match the path with an escaped pattern as binary, so that neither a case insensitive
+    collation nor wildcards in the prefix affect the result."""
+    path: str = compiler.process(element.path, **kwargs)
+    pattern: str = compiler.process(element.pattern, **kwargs)
+    return f"({path} LIKE BINARY {pattern} ESCAPE '{LIKE_ESCAPE}')"
+
+
 file_tag_link = Table(
     "file_tag_link",
     Model.metadata,
     Column("file_id", types.Integer, ForeignKey("file.id", ondelete="CASCADE"), nullable=False),
     Column("tag_id", types.Integer, ForeignKey("tag.id", ondelete="CASCADE"), nullable=False),
     UniqueConstraint("file_id", "tag_id", name="_file_tag_uc"),
+    Index("ix_file_tag_link_tag_id_file_id", "tag_id", "file_id"),
 )
 
 
@@ -21,6 +92,11 @@ class Archive(Model):
     """Information regarding the archiving of a file."""
 
     __tablename__ = "archive"
+    __table_args__ = (
+        Index("ix_archive_archiving_task_id", "archiving_task_id"),
+        Index("ix_archive_retrieval_task_id", "retrieval_task_id"),
+        Index("ix_archive_retrieved_at", "retrieved_at"),
+    )
     archiving_task_id = Column(types.Integer, nullable=False)
     retrieval_task_id = Column(types.Integer, nullable=True)
     file_id = Column(ForeignKey("file.id"), nullable=False, primary_key=True)
@@ -51,6 +127,10 @@ class Version(Model):
     """Keeps track of versions."""
 
     __tablename__ = "version"
+    __table_args__ = (
+        Index("ix_version_bundle_id_created_at", "bundle_id", "created_at"),
+        Index("ix_version_created_at", "created_at"),
+    )
 
     id = Column(types.Integer, primary_key=True)
     created_at = Column(types.DateTime, nullable=False)
@@ -84,11 +164,14 @@ class File(Model):
     """Represent a file."""
 
     __tablename__ = "file"
+    __table_args__ = (Index("ix_file_version_id", "version_id"),)
 
     id = Column(types.Integer, primary_key=True)
     path = Column(types.String(256), unique=True, nullable=False)
     checksum = Column(types.String(256))
     to_archive = Column(types.Boolean, nullable=False, default=False)
+    size = Column(types.BigInteger)
+    mtime = Column(types.BigInteger)
 
     version_id = Column(ForeignKey(Version.id, ondelete="CASCADE"), nullable=False)
     tags = orm.relationship(
@@ -100,17 +183,61 @@ class File(Model):
 
     app_root = None
 
-    @property
+    @hybrid_property
     def full_path(self) -> str:
         """Return the full path to the file."""
-        if Path(self.path).is_absolute():
-            return self.path
-        return str(self.app_root / self.path)
-
-    @property
+        return self.get_full_path(self.path)
+
+    @full_path.inplace.expression
+    @classmethod
+    def _full_path_expression(cls) -> ColumnElement[str]:
+        """Return the full path in SQL, prefixing relative paths with the root."""
+        return case(
+            (PathStartswith(cls.path, ABSOLUTE_PATH_PREFIX), cls.path),
+            else_=literal(cls.get_root_prefix()) + cls.path,
+        )
+
+    @classmethod
+    def get_full_path(cls, path: str) -> str:
+        """Return the full path of a file path, which is relative to the root unless absolute."""
+        if Path(path).is_absolute():
+            return path
+        return str(cls.app_root / path)
+
+    @classmethod
+    def get_root_prefix(cls) -> str:
+        """Return the root with a trailing slash, which starts the paths of files under it."""
+        return f"{str(cls.app_root).rstrip('/')}/"
+
+    @hybrid_property
     def is_included(self) -> bool:
-        """Check if the file is included in Housekeeper."""
-        return str(self.app_root) in self.full_path
+        """Check if the file is included in Housekeeper, that is relative to or under the root."""
+        return not self.path.startswith(ABSOLUTE_PATH_PREFIX) or self.path.startswith(
+            self.get_root_prefix()
+        )
+
+    @is_included.inplace.expression
+    @classmethod
+    def _is_included_expression(cls) -> ColumnElement[bool]:
+        """Return whether files are included in SQL."""
+        return or_(
+            not_(PathStartswith(cls.path, ABSOLUTE_PATH_PREFIX)),
+            PathStartswith(cls.path, cls.get_root_prefix()),
+        )
+
+    @hybrid_property
+    def is_external(self) -> bool:
+        """Check if the file has an absolute path outside of the root."""
+        return not self.is_included
+
+    @is_external.inplace.expression
+    @classmethod
+    def _is_external_expression(cls) -> ColumnElement[bool]:
+        """Return whether files are external in SQL."""
+        return and_(
+            PathStartswith(cls.path, ABSOLUTE_PATH_PREFIX),
+            not_(PathStartswith(cls.path, cls.get_root_prefix())),
+        )
 
 
 class Tag(Model):
@@ -0,0 +1,148 @@
+"""Connection pool metrics for the housekeeper database"""
+
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine.base import Engine
+from sqlalchemy.exc import DisconnectionError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.util.queue import Queue
+
+
+class PoolMetrics:
+    """Counters describing the usage of a connection pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts: int = 0
+        self.checkins: int = 0
+        self.connects: int = 0
+        self.invalidations: int = 0
+        self.pre_ping_failures: int = 0
+        self.timeouts: int = 0
+        self.wait_time_total: float = 0.0
+        self.wait_time_max: float = 0.0
+
+    def increment(self, counter: str) -> None:
+        """Increment the given counter by one."""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def record_wait(self, seconds: float) -> None:
+        """Record the time spent waiting for a connection from the pool."""
+        with self._lock:
+            self.wait_time_total += seconds
+            self.wait_time_max = max(self.wait_time_max, seconds)
+
+    def as_dict(self) -> dict:
+        """Return the counters as a dictionary."""
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "pre_ping_failures": self.pre_ping_failures,
+                "timeouts": self.timeouts,
+                "wait_time_total": self.wait_time_total,
+                "wait_time_max": self.wait_time_max,
+            }
+
+
+class MeteredQueue(Queue):
+    """Queue of pooled connections recording how long taking a connection waits."""
+
+    metrics: PoolMetrics
+
+    def get(self, block: bool = True, timeout: float | None = None):
+        start: float = time.perf_counter()
+        try:
+            return super().get(block, timeout)
+        finally:
+            self.metrics.record_wait(time.perf_counter() - start)
+
+
+class MeteredQueuePool(QueuePool):
+    """Queue pool keeping the usage metrics of its connections.
+
+    Only the wait for a free connection in the queue is timed, not opening new connections. The
+    metrics are handed over to the pool replacing this one when the engine is disposed.
+    """
+
+    _queue_class = MeteredQueue
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._set_metrics(PoolMetrics())
+
+    def _set_metrics(self, metrics: PoolMetrics) -> None:
+        self.metrics: PoolMetrics = metrics
+        self._pool.metrics = metrics
+
+    def _do_get(self):
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.increment("timeouts")
+            raise
+
+    def recreate(self) -> "MeteredQueuePool":
+        pool: MeteredQueuePool = super().recreate()
+        pool._set_metrics(self.metrics)
+        return pool
+
+
+def listen_to_pool_events(engine: Engine) -> None:
+    """Count the connection pool events of the engine, if its pool keeps metrics.
+
+    Connections failing the pre-ping on checkout are counted apart from other invalidations.
+    """
+    if not isinstance(engine.pool, MeteredQueuePool):
+        return
+    metrics: PoolMetrics = engine.pool.metrics
+    for event_name, counter in [
+        ("checkout", "checkouts"),
+        ("checkin", "checkins"),
+        ("connect", "connects"),
+        ("soft_invalidate", "invalidations"),
+    ]:
+        event.listen(engine, event_name, _make_listener(metrics=metrics, counter=counter))
+
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        if isinstance(exception, DisconnectionError):
+            metrics.increment("pre_ping_failures")
+        else:
+            metrics.increment("invalidations")
+
+    event.listen(engine, "invalidate", on_invalidate)
+
+
+def _make_listener(metrics: PoolMetrics, counter: str):
+    """Return a pool event listener incrementing the given counter."""
+
+    def listener(*args, **kwargs):
+        metrics.increment(counter)
+
+    return listener
+
+
+def get_pool_counters(engine: Engine) -> dict:
+    """Return the usage counters of the connection pool of the engine, if it keeps any."""
+    if not isinstance(engine.pool, MeteredQueuePool):
+        return {}
+    return engine.pool.metrics.as_dict()
+
+
+def get_pool_status(engine: Engine) -> dict:
+    """Return the current size and usage of the connection pool of the engine."""
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {}
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
@@ -9,6 +9,7 @@ from housekeeper.store.crud.read import ReadHandler
 from housekeeper.store.crud.update import UpdateHandler
 from housekeeper.store.database import get_session
 from housekeeper.store.models import File, Version
+from housekeeper.store.tag_cache import TAG_CACHE_TTL, TagCache, listen_to_session_events
 
 LOG = logging.getLogger(__name__)
 
@@ -19,8 +20,10 @@ class Store(CreateHandler, ReadHandler, UpdateHandler):
     database connection is needed, e.g., a command line interface.
     """
 
-    def __init__(self, root: str):
+    def __init__(self, root: str, tag_cache_ttl: float = TAG_CACHE_TTL, warm_tag_cache=False):
         self.session = get_session()
+        self.tag_cache = TagCache(ttl=tag_cache_ttl)
+        listen_to_session_events(session=self.session(), tag_cache=self.tag_cache)
         ReadHandler(self.session)
         CreateHandler(self.session)
         UpdateHandler(self.session)
@@ -30,3 +33,5 @@ class Store(CreateHandler, ReadHandler, UpdateHandler):
         Version.app_root = Path(root)
 
         super().__init__(self.session)
+        if warm_tag_cache:
+            self.load_tag_cache()
@@ -0,0 +1,109 @@
+"""Per process cache of tag ids by tag name"""
+
+import logging
+import threading
+import time
+import weakref
+from typing import Iterable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from housekeeper.store.models import Tag
+
+LOG = logging.getLogger(__name__)
+
+TAG_CACHE_TTL = 300
+
+
+class TagCache:
+    """Map tag names to tag ids, reloaded as a whole when older than the time to live.
+
+    Only names found in the cache are trusted. A name missing from the cache is looked up in the
+    database, so tags created by other processes are found before the cache expires. Tags added
+    in the current transaction are pending until it is committed, and dropped if it is rolled
+    back.
+    """
+
+    def __init__(self, ttl: float = TAG_CACHE_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._tag_ids: dict[str, int] = {}
+        self._pending_names: set[str] = set()
+        self._loaded_at: float | None = None
+
+    @property
+    def is_fresh(self) -> bool:
+        """Return whether the cache is loaded and younger than its time to live."""
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl
+
+    def load(self, tag_ids: dict[str, int]) -> None:
+        """Replace the cached tag ids."""
+        with self._lock:
+            self._tag_ids = dict(tag_ids)
+            self._loaded_at = time.monotonic()
+        LOG.debug("Cached %s tags", len(tag_ids))
+
+    def get_tag_id(self, tag_name: str) -> int | None:
+        """Return the cached id of a tag, or None if it is unknown or the cache is not fresh."""
+        if not self.is_fresh:
+            return None
+        return self._tag_ids.get(tag_name)
+
+    def add(self, tag_ids: dict[str, int]) -> None:
+        """Cache the ids of tags added in the current transaction."""
+        with self._lock:
+            self._tag_ids.update(tag_ids)
+            self._pending_names.update(tag_ids)
+
+    def discard(self, tag_names: Iterable[str]) -> None:
+        """Drop the ids of the given tags, so that they are looked up in the database."""
+        with self._lock:
+            for tag_name in tag_names:
+                self._tag_ids.pop(tag_name, None)
+                self._pending_names.discard(tag_name)
+
+    def commit(self) -> None:
+        """Keep the tags added in the committed transaction."""
+        with self._lock:
+            self._pending_names.clear()
+
+    def rollback(self) -> None:
+        """Drop the tags added in the rolled back transaction."""
+        with self._lock:
+            for tag_name in self._pending_names:
+                self._tag_ids.pop(tag_name, None)
+            self._pending_names.clear()
+
+    def invalidate(self) -> None:
+        """Drop the cached tag ids so that they are reloaded on the next lookup."""
+        with self._lock:
+            self._tag_ids = {}
+            self._pending_names.clear()
+            self._loaded_at = None
+
+
+def listen_to_session_events(session: Session, tag_cache: TagCache) -> None:
+    """Keep the tag cache in step with the tags flushed, committed and rolled back in a session.
+
+    The listeners only hold a weak reference to the tag cache, so they do not keep it alive.
+    """
+    tag_cache_ref = weakref.ref(tag_cache)
+
+    def after_flush(session: Session, flush_context) -> None:
+        if (tag_cache := tag_cache_ref()) is None:
+            return
+        tag_cache.add({tag.name: tag.id for tag in session.new if isinstance(tag, Tag)})
+        tag_cache.discard(tag.name for tag in session.deleted if isinstance(tag, Tag))
+
+    def after_commit(session: Session) -> None:
+        if (tag_cache := tag_cache_ref()) is not None:
+            tag_cache.commit()
+
+    def after_soft_rollback(session: Session, previous_transaction) -> None:
+        if (tag_cache := tag_cache_ref()) is not None:
+            tag_cache.rollback()
+
+    event.listen(session, "after_flush", after_flush)
+    event.listen(session, "after_commit", after_commit)
+    event.listen(session, "after_soft_rollback", after_soft_rollback)
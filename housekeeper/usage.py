@@ -0,0 +1,123 @@
+"""Module for summing up the disk usage of files"""
+
+import os
+from collections import defaultdict
+from itertools import groupby
+from operator import itemgetter
+from typing import Iterable, Iterator, NamedTuple
+
+from sqlalchemy import Row
+
+from housekeeper.constants import ArchiveState, UsageGroup
+
+
+class FileUsage(NamedTuple):
+    """A file with the attributes its disk usage is grouped by."""
+
+    id: int
+    path: str
+    size: int | None
+    bundle: str
+    version: str
+    tags: list[str]
+    archive_state: ArchiveState
+
+
+class Usage:
+    """Number of files and bytes, counting the bytes of files hardlinked to the same inode once."""
+
+    def __init__(self):
+        self.files: int = 0
+        self.size: int = 0
+        self.inodes: set[tuple[int, int]] = set()
+
+    def add(self, size: int, inode: tuple[int, int] | None = None) -> None:
+        """Add a file, only adding its size the first time its (device, inode) is seen."""
+        self.files += 1
+        if inode is not None:
+            if inode in self.inodes:
+                return
+            self.inodes.add(inode)
+        self.size += size
+
+    def to_dict(self) -> dict:
+        return {"files": self.files, "size": self.size}
+
+
+class UsageReport:
+    """Disk usage of files in total and summed up per bundle, version, tag and archive state.
+
+    Files with several tags are counted under each of their tags. The size of each file is only
+    kept by id with `keep_file_sizes`, for storing the sizes afterwards.
+    """
+
+    def __init__(self, keep_file_sizes: bool = False):
+        self.total = Usage()
+        self.groups: dict[UsageGroup, dict[str, Usage]] = {
+            group: defaultdict(Usage) for group in UsageGroup
+        }
+        self.missing_files: int = 0
+        self.keep_file_sizes: bool = keep_file_sizes
+        self.file_sizes: dict[int, int] = {}
+
+    def add_file(self, file: FileUsage, size: int | None, inode: tuple[int, int] | None = None):
+        """Add the size of a file to each of its groups, or count it as missing if it has none."""
+        if size is None:
+            self.missing_files += 1
+            return
+        if self.keep_file_sizes:
+            self.file_sizes[file.id] = size
+        self.total.add(size=size, inode=inode)
+        keys_per_group: dict[UsageGroup, list[str]] = {
+            UsageGroup.BUNDLE: [file.bundle],
+            UsageGroup.VERSION: [file.version],
+            UsageGroup.TAG: file.tags,
+            UsageGroup.ARCHIVE_STATE: [file.archive_state],
+        }
+        for group, keys in keys_per_group.items():
+            for key in keys:
+                self.groups[group][key].add(size=size, inode=inode)
+
+    def add_file_stat(self, file: FileUsage, file_stat: os.stat_result | None) -> None:
+        """Add a file by the size and inode of its stat, which is None if it is not on disk."""
+        if file_stat is None:
+            self.add_file(file=file, size=None)
+            return
+        self.add_file(file=file, size=file_stat.st_size, inode=(file_stat.st_dev, file_stat.st_ino))
+
+    def to_dict(self) -> dict:
+        return {
+            "total": self.total.to_dict(),
+            "missing_files": self.missing_files,
+            "groups": {
+                group: {key: usage.to_dict() for key, usage in sorted(usages.items())}
+                for group, usages in self.groups.items()
+            },
+        }
+
+
+def get_archive_state(row: Row) -> ArchiveState:
+    """Return the archive state of a file from its archive columns."""
+    if not row.has_archive:
+        return ArchiveState.NOT_ARCHIVED
+    if row.retrieved_at:
+        return ArchiveState.RETRIEVED
+    if row.archived_at:
+        return ArchiveState.ARCHIVED
+    return ArchiveState.ARCHIVING
+
+
+def get_file_usages(rows: Iterable[Row]) -> Iterator[FileUsage]:
+    """Collapse usage rows, one per file and tag ordered by file id, into files."""
+    for file_id, file_rows in groupby(rows, key=itemgetter(0)):
+        file_rows: list[Row] = list(file_rows)
+        first_row: Row = file_rows[0]
+        yield FileUsage(
+            id=file_id,
+            path=first_row.path,
+            size=first_row.size,
+            bundle=first_row.bundle_name,
+            version=f"{first_row.bundle_name}/{first_row.created_at.isoformat()}",
+            tags=[row.tag_name for row in file_rows if row.tag_name is not None],
+            archive_state=get_archive_state(first_row),
+        )
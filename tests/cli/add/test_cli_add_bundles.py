@@ -0,0 +1,145 @@
+"""Tests for adding many bundles via CLI"""
+
+import json
+import logging
+from pathlib import Path
+
+import pytest
+from click import Context
+from click.testing import CliRunner
+
+from housekeeper.cli.add import bundles_cmd
+from housekeeper.store.models import Bundle, File
+from housekeeper.store.store import Store
+
+
+@pytest.fixture
+def bundles_jsonl(bundle_data: dict, other_bundle: dict) -> str:
+    """Return two bundles as json lines"""
+    lines: list[str] = []
+    for data in [bundle_data, other_bundle]:
+        data = dict(data, created_at=str(data["created_at"]))
+        lines.append(json.dumps(data))
+    return "\n".join(lines) + "\n"
+
+
+def test_add_bundles_from_file(
+    base_context: Context, cli_runner: CliRunner, bundles_jsonl: str, project_dir: Path
+):
+    """Test to add bundles from a json lines file"""
+    # GIVEN a context with an empty store and a file with two bundles
+    store: Store = base_context["store"]
+    jsonl_path = Path(project_dir, "bundles.jsonl")
+    jsonl_path.write_text(bundles_jsonl)
+
+    # WHEN adding the bundles from the file
+    result = cli_runner.invoke(
+        bundles_cmd, ["--from-jsonl", str(jsonl_path), "--batch-size", "1"], obj=base_context
+    )
+
+    # THEN assert it succeeded
+    assert result.exit_code == 0
+    # THEN both bundles should be added and included
+    bundles: list[Bundle] = store._get_query(table=Bundle).all()
+    assert len(bundles) == 2
+    assert all(bundle.versions[0].included_at for bundle in bundles)
+
+
+def test_add_bundles_from_stdin_with_invalid_lines(
+    base_context: Context, cli_runner: CliRunner, bundles_jsonl: str, caplog
+):
+    """Test that invalid bundles are reported while the valid bundles are added"""
+    caplog.set_level(logging.DEBUG)
+    # GIVEN a stream with two valid bundles, a malformed line and a bundle without name
+    store: Store = base_context["store"]
+    jsonl: str = bundles_jsonl + "{not json\n" + json.dumps({"created_at": "2020-05-01"}) + "\n"
+
+    # WHEN adding the bundles from stdin without including them
+    result = cli_runner.invoke(
+        bundles_cmd, ["--from-jsonl", "-", "--exclude"], obj=base_context, input=jsonl
+    )
+
+    # THEN assert it failed
+    assert result.exit_code == 1
+    # THEN the invalid lines should be reported
+    assert "Line 3: invalid json" in caplog.text
+    assert "Line 4: bundle does not follow the models" in caplog.text
+    # THEN the valid bundles should be added
+    assert store._get_query(table=Bundle).count() == 2
+
+
+def test_add_bundles_existing_bundle(
+    populated_context: Context, cli_runner: CliRunner, bundles_jsonl: str, caplog
+):
+    """Test that a bundle which already exists is reported"""
+    caplog.set_level(logging.DEBUG)
+    # GIVEN a store where the first bundle in the stream exists
+    store: Store = populated_context["store"]
+    bundle_count: int = store._get_query(table=Bundle).count()
+
+    # WHEN adding the bundles
+    result = cli_runner.invoke(
+        bundles_cmd, ["--from-jsonl", "-", "--exclude"], obj=populated_context, input=bundles_jsonl
+    )
+
+    # THEN assert it failed
+    assert result.exit_code == 1
+    # THEN the existing bundle should be reported
+    assert "Line 1: bundle name" in caplog.text
+    # THEN only the new bundle should be added
+    assert store._get_query(table=Bundle).count() == bundle_count + 1
+
+
+def test_add_bundles_database_error(
+    base_context: Context, cli_runner: CliRunner, bundle_data: dict, other_bundle: dict, caplog
+):
+    """Test that a bundle failing in the database is reported while the others are added"""
+    caplog.set_level(logging.DEBUG)
+    # GIVEN a stream where the second bundle has the same file paths as the first
+    store: Store = base_context["store"]
+    lines: list[str] = [
+        json.dumps(dict(data, created_at=str(data["created_at"])))
+        for data in [bundle_data, dict(bundle_data, name="duplicate_files"), other_bundle]
+    ]
+
+    # WHEN adding the bundles without including them
+    result = cli_runner.invoke(
+        bundles_cmd,
+        ["--from-jsonl", "-", "--exclude", "--batch-size", "2"],
+        obj=base_context,
+        input="\n".join(lines) + "\n",
+    )
+
+    # THEN assert it failed after processing all lines
+    assert result.exit_code == 1
+    assert "Line 2: could not store bundle" in caplog.text
+
+    # THEN the other bundles should be added
+    names: set[str] = {bundle.name for bundle in store._get_query(table=Bundle)}
+    assert names == {bundle_data["name"], other_bundle["name"]}
+
+
+def test_add_bundles_database_error_removes_links(
+    populated_context: Context, cli_runner: CliRunner, bundle_data: dict, project_dir: Path
+):
+    """Test that the links of a bundle failing in the database are removed"""
+    # GIVEN a stored file with the path a new bundle would link its first file to
+    store: Store = populated_context["store"]
+    data: dict = dict(bundle_data, name="new_bundle", created_at=str(bundle_data["created_at"]))
+    link_dir = Path(data["name"], str(bundle_data["created_at"].date()))
+    taken_path = Path(link_dir, Path(data["files"][0]["path"]).name)
+    existing_file: File = store._get_query(table=File).first()
+    existing_file.path = str(taken_path)
+    store.session.commit()
+
+    # WHEN adding the bundle and including its files
+    result = cli_runner.invoke(
+        bundles_cmd, ["--from-jsonl", "-"], obj=populated_context, input=json.dumps(data) + "\n"
+    )
+
+    # THEN the bundle should not be added
+    assert result.exit_code == 1
+    assert not store.get_bundle_by_name(bundle_name=data["name"])
+
+    # THEN none of its files should be left linked
+    assert not any(Path(project_dir, link_dir).iterdir())
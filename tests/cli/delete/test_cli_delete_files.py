@@ -128,3 +128,39 @@ def test_delete_file(populated_context: dict, cli_runner: CliRunner, spring_file
 
     # THEN the file should have been deleted
     assert not store.get_files(file_path=spring_file_2.as_posix()).first()
+
+
+def test_delete_files_not_on_disk_scans_once(
+    populated_context: dict, cli_runner: CliRunner, mocker, tmp_path: Path
+):
+    """Tests that files not on disk are looked up once and the counted files are deleted."""
+    # GIVEN a bundle where a file is not on disk
+    store: Store = populated_context["store"]
+    bundle: Bundle = store._get_query(table=Bundle).first()
+    missing_file: File = store.get_files(bundle_name=bundle.name).first()
+    missing_file.path = Path(tmp_path, "missing.txt").as_posix()
+    store.session.commit()
+    missing_file_ids: set[int] = {
+        file.id
+        for file in store.get_files_not_on_disk(
+            files=store.get_files(bundle_name=bundle.name).all()
+        )
+        if not file.archive
+    }
+    assert missing_file.id in missing_file_ids
+    file_ids: set[int] = {file.id for file in store.get_files()}
+    scan = mocker.spy(store, "get_files_not_on_disk")
+
+    # WHEN deleting the files of the bundle that are not on disk
+    result = cli_runner.invoke(
+        delete.files_cmd,
+        ["--bundle-name", bundle.name, "--notondisk", "--yes"],
+        obj=populated_context,
+    )
+
+    # THEN the disk should have been scanned once
+    assert result.exit_code == 0
+    assert scan.call_count == 1
+
+    # THEN only the files not on disk should have been deleted
+    assert {file.id for file in store.get_files()} == file_ids - missing_file_ids
@@ -163,3 +163,69 @@ def test_get_bundles_no_bundle(base_context, cli_runner, helpers):
 
     # THEN assert that no bundles where fetched
     assert len(json_bundles) == 0
+
+
+def test_get_bundles_summaries(populated_context, cli_runner, helpers):
+    """Test that listing bundles gives their number of versions and files"""
+
+    # GIVEN a context with a populated store and a cli runner
+    store: Store = populated_context["store"]
+    bundle: Bundle = store.bundles().order_by(Bundle.name).first()
+
+    # WHEN listing the first bundle
+    json_bundles = helpers.get_json(
+        cli_runner.invoke(bundle_cmd, ["--json", "--limit", "1"], obj=populated_context).output
+    )
+
+    # THEN the bundle should be listed with its number of versions and files
+    assert json_bundles == [
+        {
+            "id": bundle.id,
+            "name": bundle.name,
+            "created_at": bundle.created_at.isoformat(),
+            "versions": len(bundle.versions),
+            "files": sum(len(version.files) for version in bundle.versions),
+            "latest_version_at": bundle.versions[0].created_at.isoformat(),
+        }
+    ]
+
+
+def test_get_bundles_prefix_and_cursor(populated_context, cli_runner, helpers):
+    """Test listing bundles by name prefix and after a bundle name"""
+
+    # GIVEN a context with a populated store with several bundles
+    store: Store = populated_context["store"]
+    names: list[str] = [bundle.name for bundle in store.bundles().order_by(Bundle.name)]
+    assert len(names) > 1
+
+    # WHEN listing the bundles after the first one
+    after_bundles = helpers.get_json(
+        cli_runner.invoke(bundle_cmd, ["--json", "--after", names[0]], obj=populated_context).output
+    )
+
+    # THEN the other bundles should be listed
+    assert [bundle["name"] for bundle in after_bundles] == names[1:]
+
+    # WHEN listing the bundles by the name of the first one as prefix
+    prefix_bundles = helpers.get_json(
+        cli_runner.invoke(bundle_cmd, ["--json", "-p", names[0]], obj=populated_context).output
+    )
+
+    # THEN the first bundle should be listed
+    assert names[0] in [bundle["name"] for bundle in prefix_bundles]
+
+
+def test_get_bundles_table(populated_context, cli_runner, helpers):
+    """Test that listing bundles prints a table without the files of each version"""
+
+    # GIVEN a context with a populated store and a cli runner
+    store: Store = populated_context["store"]
+    bundle: Bundle = store.bundles().order_by(Bundle.name).first()
+
+    # WHEN listing the bundles
+    output = helpers.get_stdout(cli_runner.invoke(bundle_cmd, [], obj=populated_context).output)
+
+    # THEN the bundles should be listed without their files
+    assert bundle.name in output
+    assert "Nr versions" in output
+    assert "Local files" not in output
@@ -1,5 +1,6 @@
 """Tests for cli get file functionality"""
 
+import json
 from pathlib import Path
 from unittest.mock import ANY, call
 
@@ -7,7 +8,11 @@ from pytest_mock import MockerFixture
 from rich.table import Table
 
 from housekeeper.cli.get import files_cmd
-from housekeeper.services.file_report_service.utils import _get_suffix, squash_names
+from housekeeper.services.file_report_service.utils import (
+    _get_suffix,
+    squash_names,
+    squash_names_in_batches,
+)
 from housekeeper.store.models import File
 from housekeeper.store.store import Store
 
@@ -48,6 +53,68 @@ def test_get_files_json(populated_context, cli_runner):
         assert file.path in result.output
 
 
+def test_get_files_json_output(populated_context, cli_runner):
+    """Test that the files are written as a json list with one file per line"""
+    # GIVEN a context with a store with local files
+    store: Store = populated_context["store"]
+    local_files: list[File] = store.get_files(local_only=True).all()
+    assert local_files
+
+    # GIVEN an output service writing one file per batch
+    populated_context["file_report_service"].batch_size = 1
+
+    # WHEN fetching all files as json
+    result = cli_runner.invoke(files_cmd, ["--json"], obj=populated_context)
+
+    # THEN the local files should be written as a json list
+    local_output: str = result.output.split("\n]\n")[0] + "\n]"
+    assert len(json.loads(local_output)) == len(local_files)
+
+    # THEN each file should be on its own line
+    assert len(local_output.splitlines()) == len(local_files) + 2
+
+
+def test_get_files_ndjson(populated_context, cli_runner):
+    """Test streaming all files as one json object per line"""
+    # GIVEN a store with files
+    store: Store = populated_context["store"]
+    files: list[File] = store.get_files().all()
+    assert files
+
+    # WHEN fetching all files as ndjson
+    result = cli_runner.invoke(files_cmd, ["--output-format", "ndjson"], obj=populated_context)
+
+    # THEN each file should be written on its own line with its tags
+    assert result.exit_code == 0
+    written_files: list[dict] = [json.loads(line) for line in result.output.splitlines()]
+    assert [written_file["id"] for written_file in written_files] == sorted(
+        file.id for file in files
+    )
+    for file, written_file in zip(sorted(files, key=lambda file: file.id), written_files):
+        assert written_file["full_path"] == file.full_path
+        assert sorted(written_file["tags"]) == sorted(tag.name for tag in file.tags)
+
+
+def test_get_files_tsv(populated_context, cli_runner, vcf_tag_name):
+    """Test streaming the files with a tag as tab separated lines"""
+    # GIVEN a store with files with a tag
+    store: Store = populated_context["store"]
+    files: list[File] = store.get_files(tag_names=[vcf_tag_name]).all()
+    assert files
+
+    # WHEN fetching the files with the tag as tsv
+    result = cli_runner.invoke(
+        files_cmd, ["--tag", vcf_tag_name, "--output-format", "tsv"], obj=populated_context
+    )
+
+    # THEN a header and a line per file should be written
+    assert result.exit_code == 0
+    header, *lines = result.output.splitlines()
+    assert header.split("\t") == ["id", "path", "full_path", "tags", "remote"]
+    assert len(lines) == len(files)
+    assert all(vcf_tag_name in line.split("\t")[3].split(",") for line in lines)
+
+
 def test_get_files(populated_context, cli_runner, mocker: MockerFixture):
     """Test to get all files from a populated store in human friendly format"""
     # GIVEN a context and a store
@@ -169,3 +236,103 @@ def test_get_suffix():
     # THEN assert filename parsing *does* split name into (prefix, integer, suffix)
     assert (split_name1, "", "") != _get_suffix(split_name1)
     assert (split_name2, "", "") != _get_suffix(split_name2)
+
+
+def test_squash_names_zero_padded_with_tags():
+    """Test squashing zero padded names merges the tags of all squashed files once"""
+    # GIVEN zero padded lane files sharing a tag and each with a lane tag
+    shared_tag = {"id": 1, "name": "fastq"}
+    file_list = [
+        {
+            "path": f"sample_L{lane:03}.bam",
+            "full_path": f"/tests/sample_L{lane:03}.bam",
+            "tags": [shared_tag, {"id": lane + 1, "name": f"lane{lane}"}],
+            "id": lane,
+        }
+        for lane in range(8, 12)
+    ]
+
+    # WHEN calling `squash_names` on the files
+    squashed = squash_names(file_list)
+
+    # THEN the files should be squashed into one name keeping the padding
+    assert [file["path"] for file in squashed] == ["sample_L[008-011].bam"]
+
+    # THEN the tags of all files should be included once, sorted by id
+    assert [tag["id"] for tag in squashed[0]["tags"]] == [1, 9, 10, 11, 12]
+
+    # THEN the input files should not be modified
+    assert file_list[0]["path"] == "sample_L008.bam"
+
+
+def test_squash_names_natural_sort():
+    """Test squashing unsorted names only when sorting them naturally"""
+    # GIVEN chunk files of two samples in no particular order
+    paths = ["s2_chunk10.vcf", "s1_chunk2.vcf", "s2_chunk9.vcf", "s1_chunk1.vcf", "s1.vcf"]
+    file_list = [
+        {"path": path, "full_path": f"/tests/{path}", "tags": [], "id": file_id}
+        for file_id, path in enumerate(paths)
+    ]
+
+    # WHEN calling `squash_names` without sorting
+    squashed = squash_names(file_list)
+
+    # THEN only the names following each other should be squashed
+    assert [file["path"] for file in squashed] == [
+        "s2_chunk10.vcf",
+        "s1_chunk2.vcf",
+        "s2_chunk9.vcf",
+        "s1_chunk1.vcf",
+        "s1.vcf",
+    ]
+
+    # WHEN calling `squash_names` with natural sorting
+    squashed = squash_names(file_list, natural_sort=True)
+
+    # THEN the chunks of each sample should be squashed in numerical order
+    assert [file["path"] for file in squashed] == [
+        "s1.vcf",
+        "s1_chunk[1-2].vcf",
+        "s2_chunk[9-10].vcf",
+    ]
+
+
+def test_squash_names_in_batches():
+    """Test squashing names coming in batches squashes runs crossing batches as one"""
+    # GIVEN batches of files where runs of names continue in the next batch
+    paths = [
+        ["s1_chunk1.vcf", "s1_chunk2.vcf"],
+        ["s1_chunk3.vcf", "s1.vcf"],
+        ["s2_1.vcf"],
+        ["s2_2.vcf"],
+    ]
+    batches = [
+        [{"path": path, "full_path": f"/tests/{path}", "tags": [], "id": path} for path in batch]
+        for batch in paths
+    ]
+
+    # WHEN squashing the names of the batches
+    squashed = [file for batch in squash_names_in_batches(batches) for file in batch]
+
+    # THEN the runs should be squashed across the batches
+    assert [file["path"] for file in squashed] == ["s1_chunk[1-3].vcf", "s1.vcf", "s2_[1-2].vcf"]
+
+
+def test_get_files_compact_natural_sort(populated_context: dict, cli_runner, tmp_path: Path):
+    """Test that unsorted file names are squashed when sorting them naturally"""
+    # GIVEN local files whose chunk names are not listed in order
+    store: Store = populated_context["store"]
+    files: list[File] = [file for file in store.get_files().all() if not file.archive][:3]
+    for file, chunk in zip(files, [3, 1, 2]):
+        file.path = Path(tmp_path, f"s1_chunk{chunk}.vcf").as_posix()
+        Path(file.path).touch()
+    store.session.commit()
+
+    # WHEN getting the compact files with natural sorting
+    result = cli_runner.invoke(
+        files_cmd, ["--compact", "--natural-sort", "--file-names"], obj=populated_context
+    )
+
+    # THEN the chunks should be squashed into one name
+    assert result.exit_code == 0
+    assert "s1_chunk[1-3].vcf" in result.output
@@ -0,0 +1,75 @@
+"""Tests for the get usage cli functionality."""
+
+import json
+
+from click.testing import CliRunner, Result
+
+from housekeeper.cli.get import usage_cmd
+from housekeeper.constants import UsageGroup
+from housekeeper.store.models import File
+from housekeeper.store.store import Store
+
+
+def test_get_usage_json(populated_context: dict, cli_runner: CliRunner):
+    """Test getting the disk usage of all files as json"""
+    # GIVEN a store with files
+
+    # WHEN getting the disk usage as json
+    result: Result = cli_runner.invoke(usage_cmd, ["--json"], obj=populated_context)
+
+    # THEN the usage should be written for all groups
+    assert result.exit_code == 0
+    usage: dict = json.loads(result.output)
+    assert set(usage["groups"]) == set(UsageGroup)
+
+
+def test_get_usage_store_sizes(populated_context: dict, cli_runner: CliRunner, tmp_path):
+    """Test storing the sizes of files read from disk"""
+    # GIVEN a store with a file on disk
+    store: Store = populated_context["store"]
+    file: File = store.get_files().first()
+    file_path = tmp_path / "file.txt"
+    file_path.write_text("content")
+    file.path = file_path.as_posix()
+    store.session.commit()
+
+    # WHEN getting the disk usage per tag and storing the sizes
+    result: Result = cli_runner.invoke(
+        usage_cmd, ["--group-by", "tag", "--store-sizes"], obj=populated_context
+    )
+
+    # THEN the size of the file should be stored
+    assert result.exit_code == 0
+    assert store.get_file_by_id(file.id).size == len("content")
+
+
+def test_get_usage_stored_sizes_and_store_sizes(populated_context: dict, cli_runner: CliRunner):
+    """Test that stored sizes can not be stored again"""
+    # GIVEN a store with files
+
+    # WHEN getting the disk usage from the stored sizes while storing the sizes
+    result: Result = cli_runner.invoke(
+        usage_cmd, ["--stored-sizes", "--store-sizes"], obj=populated_context
+    )
+
+    # THEN the command should fail with a usage error
+    assert result.exit_code == 2
+    assert "--stored-sizes and --store-sizes can not be combined" in result.output
+
+
+def test_get_usage_per_version(populated_context: dict, cli_runner: CliRunner):
+    """Test that versions are printed with their bundle and creation date"""
+    # GIVEN a store with a version of a bundle
+    store: Store = populated_context["store"]
+    file: File = store.get_files().first()
+    version_name: str = f"{file.version.bundle.name}/{file.version.created_at.date()}"
+
+    # WHEN printing the disk usage per version
+    result: Result = cli_runner.invoke(
+        usage_cmd, ["--group-by", "version", "--stored-sizes"], obj=populated_context
+    )
+
+    # THEN the version should be printed with its creation date only
+    assert result.exit_code == 0
+    assert version_name in result.output
+    assert file.version.created_at.isoformat() not in result.output
@@ -98,3 +98,24 @@ def test_get_version_version_id(populated_context: Context, cli_runner: CliRunne
 
     # THEN assert that the program exits succesfully
     assert result.exit_code == 0
+
+
+def test_get_version_verbose(populated_context: Context, cli_runner: CliRunner, helpers):
+    """Test that the files of each version are listed when verbose"""
+    # GIVEN a context that is populated with a bundle with files
+    store: Store = populated_context["store"]
+    bundle_obj: Bundle = store._get_query(table=Bundle).first()
+    file_ids: list[int] = [file.id for version in bundle_obj.versions for file in version.files]
+    assert file_ids
+
+    # WHEN getting the versions of the bundle with their files
+    result = cli_runner.invoke(
+        version_cmd, ["-b", bundle_obj.name, "--verbose"], obj=populated_context
+    )
+
+    # THEN the local and remote files of the versions should be listed
+    assert result.exit_code == 0
+    assert "Local files" in result.output
+    assert "Remote files" in result.output
+    for file_id in file_ids:
+        assert f"│ {file_id} " in result.output
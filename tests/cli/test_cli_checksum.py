@@ -0,0 +1,125 @@
+"""Tests for the checksum cli command"""
+
+import hashlib
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from housekeeper.cli.checksum import checksum as checksum_cmd
+from housekeeper.store.models import File
+from housekeeper.store.store import Store
+
+
+def test_checksum_fills_missing_checksums(
+    populated_context: dict, cli_runner: CliRunner, checksum: str, checksum_file: Path
+):
+    """Test that the command stores checksums for files without one."""
+    # GIVEN a store with a file without checksum that exists on disk
+    store: Store = populated_context["store"]
+    file: File = store.get_files().first()
+    file.path = str(checksum_file.absolute())
+    store.session.commit()
+    assert not file.checksum
+
+    # WHEN running the checksum command
+    result = cli_runner.invoke(checksum_cmd, [], obj=populated_context)
+
+    # THEN the command should succeed
+    assert result.exit_code == 0
+
+    # THEN the checksum should be stored for the file
+    assert file.checksum == checksum
+
+
+def test_checksum_dry_run(populated_context: dict, cli_runner: CliRunner, checksum_file: Path):
+    """Test that no checksums are stored in dry run mode."""
+    # GIVEN a store with a file without checksum that exists on disk
+    store: Store = populated_context["store"]
+    file: File = store.get_files().first()
+    file.path = str(checksum_file.absolute())
+    store.session.commit()
+
+    # WHEN running the checksum command in dry run mode
+    result = cli_runner.invoke(checksum_cmd, ["--dry-run"], obj=populated_context)
+
+    # THEN the command should succeed
+    assert result.exit_code == 0
+
+    # THEN no checksum should be stored
+    assert not file.checksum
+
+
+def test_checksum_verify_fast(
+    populated_context: dict, cli_runner: CliRunner, checksum: str, checksum_file: Path
+):
+    """Test that fast verification only re-hashes files changed since they were recorded."""
+    # GIVEN a store with one file on disk, recorded with a wrong checksum but its current stat
+    store: Store = populated_context["store"]
+    files: list[File] = store.get_files().all()
+    for file in files:
+        file.checksum = None
+    file: File = files[0]
+    file.path = str(checksum_file.absolute())
+    file.checksum = "wrong"
+    file_stat = checksum_file.stat()
+    file.size, file.mtime = file_stat.st_size, file_stat.st_mtime_ns
+    store.session.commit()
+
+    # WHEN verifying the checksums in fast mode
+    result = cli_runner.invoke(checksum_cmd, ["--verify", "--fast"], obj=populated_context)
+
+    # THEN the unchanged file should be trusted without being read
+    assert result.exit_code == 0
+
+    # WHEN the file seems changed and is verified in fast mode
+    file.mtime = 0
+    store.session.commit()
+    result = cli_runner.invoke(checksum_cmd, ["--verify", "--fast"], obj=populated_context)
+
+    # THEN the file should be re-hashed and the mismatch reported
+    assert result.exit_code != 0
+
+    # WHEN the checksum is correct and the file is verified again
+    file.checksum = checksum
+    store.session.commit()
+    result = cli_runner.invoke(checksum_cmd, ["--verify", "--fast"], obj=populated_context)
+
+    # THEN the file should be verified and its current modification time recorded
+    assert result.exit_code == 0
+    assert file.mtime == file_stat.st_mtime_ns
+
+
+def test_checksum_verify_stored_algorithms(
+    populated_context: dict, cli_runner: CliRunner, checksum_file: Path, tmp_path: Path
+):
+    """Test that each file is verified with the algorithm of its stored checksum."""
+    # GIVEN files on disk with checksums stored with different algorithms
+    store: Store = populated_context["store"]
+    files: list[File] = store.get_files().all()
+    for file in files:
+        file.checksum = None
+    content: bytes = checksum_file.read_bytes()
+    files[0].path = str(checksum_file.absolute())
+    files[0].checksum = f"sha256:{hashlib.sha256(content).hexdigest()}"
+    files[1].path = str(Path(tmp_path, "copy.txt"))
+    Path(files[1].path).write_bytes(content)
+    files[1].checksum = hashlib.md5(content).hexdigest()
+    store.session.commit()
+
+    # WHEN verifying the checksums with the default algorithm
+    result = cli_runner.invoke(checksum_cmd, ["--verify"], obj=populated_context)
+
+    # THEN both files should be verified
+    assert result.exit_code == 0
+
+
+def test_checksum_fast_without_verify(populated_context: dict, cli_runner: CliRunner):
+    """Test that fast mode is rejected when not verifying."""
+    # GIVEN a populated store
+
+    # WHEN running the checksum command in fast mode without verifying
+    result = cli_runner.invoke(checksum_cmd, ["--fast"], obj=populated_context)
+
+    # THEN the command should fail with a usage error
+    assert result.exit_code == 2
+    assert "--fast can only be used with --verify" in result.output
@@ -1,9 +1,16 @@
 """Tests for the core cli"""
 
 import logging
+import subprocess
+import sys
+from pathlib import Path
+
+import click
+import yaml
 
 import housekeeper
-from housekeeper.cli.core import base
+from housekeeper.cli.core import SUBCOMMANDS, base
+from housekeeper.cli.get import get as get_command
 from housekeeper.cli.init import init as init_command
 
 
@@ -27,6 +34,42 @@ def test_cli_version(cli_runner):
     assert housekeeper.__version__ in result.output
 
 
+def test_subcommands_are_loaded_on_demand():
+    """Test that importing the base command does not import the subcommand modules"""
+    # GIVEN the subcommands of the base command
+
+    # WHEN importing the base command in a new interpreter
+    process = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, housekeeper.cli.core; print(' '.join(sorted(sys.modules)))",
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    imported_modules: list[str] = process.stdout.split()
+
+    # THEN none of the subcommand modules or the output libraries should have been imported
+    for import_path in SUBCOMMANDS.values():
+        assert import_path.rsplit(".", 1)[0] not in imported_modules
+    assert "rich" not in imported_modules
+
+
+def test_get_lazy_subcommand():
+    """Test that a lazy subcommand is resolved to its click command"""
+    # GIVEN the base command
+
+    # WHEN getting the get subcommand
+    with click.Context(base) as context:
+        command: click.Command = base.get_command(context, "get")
+
+        # THEN the get command group should be returned and listed
+        assert command is get_command
+        assert "get" in base.list_commands(context)
+
+
 def test_init_config(config_file, cli_runner):
     """Test init housekeeper with a config file"""
     # GIVEN a config file and a cli runner
@@ -120,3 +163,46 @@ def test_force_override_existing_database(cli_runner, db_path, base_context, cap
 
     # THEN it should communicate success
     assert "Success!" in caplog.text
+
+
+def test_pool_settings_from_config(config_file: Path, configs: dict, cli_runner, mocker):
+    """Test that pool settings are read from the config and overridden on the command line"""
+    # GIVEN a config file with pool settings
+    configs.update({"pool_size": 3, "pool_recycle": 600})
+    with open(config_file, "w") as out_file:
+        yaml.dump(configs, out_file)
+    initialize_database = mocker.patch("housekeeper.cli.core.initialize_database")
+    mocker.patch("housekeeper.cli.core.Store")
+
+    # WHEN calling the CLI with a pool size on the command line
+    result = cli_runner.invoke(
+        base, ["--config", str(config_file), "--pool-size", "5", "get", "tag", "--help"]
+    )
+
+    # THEN the database should be initialised with the combined pool settings
+    assert result.exit_code == 0
+    initialize_database.assert_called_once_with(
+        configs["database"],
+        pool_size=5,
+        max_overflow=None,
+        pool_recycle=600,
+        pool_timeout=None,
+        null_pool=False,
+        instrument=False,
+    )
+
+
+def test_timings(config_file: Path, cli_runner):
+    """Test that a summary of the database queries is printed when asking for timings"""
+    # GIVEN a config file
+
+    # WHEN calling the CLI with timings
+    result = cli_runner.invoke(base, ["--config", str(config_file), "--timings", "init"])
+
+    # THEN the command should succeed
+    assert result.exit_code == 0
+
+    # THEN a summary of the queries should be printed to stderr
+    assert "Statements:" in result.stderr
+    assert "p95" in result.stderr
+    assert "Slowest statements:" in result.stderr
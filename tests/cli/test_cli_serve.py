@@ -0,0 +1,164 @@
+"""Tests for the query server"""
+
+import io
+import logging
+import os
+import stat
+import threading
+from pathlib import Path
+
+import pytest
+import yaml
+
+from housekeeper.cli.serve import MessageStream, QueryServer
+from housekeeper.client import connect, forward_command
+from housekeeper.store.models import File
+from housekeeper.store.store import Store
+
+
+@pytest.fixture
+def query_server(populated_context: dict, tmp_path: Path) -> QueryServer:
+    """Return a query server listening on a socket in a temporary directory."""
+    server = QueryServer(socket_path=str(Path(tmp_path, "hk.sock")), context_obj=populated_context)
+    yield server
+    server.server_close()
+
+
+def serve_command(server: QueryServer, args: list[str]) -> tuple[int, str, str]:
+    """Forward a command line to the server and return the exit code and output."""
+    stdout, stderr = io.StringIO(), io.StringIO()
+    result: dict = {}
+    connection = connect(server.server_address)
+
+    def forward():
+        with connection:
+            result["exit_code"] = forward_command(
+                connection=connection, args=args, stdout=stdout, stderr=stderr
+            )
+
+    client = threading.Thread(target=forward)
+    client.start()
+    server.handle_request()
+    client.join(timeout=10)
+    return result["exit_code"], stdout.getvalue(), stderr.getvalue()
+
+
+def test_serve_get_file(query_server: QueryServer, populated_context: dict):
+    """Test getting files through the query server"""
+    # GIVEN a query server with a populated store
+    store: Store = populated_context["store"]
+    files: list[File] = store.get_files(local_only=True).all()
+    assert files
+
+    # WHEN getting the files as json through the server
+    exit_code, stdout, _ = serve_command(query_server, ["get", "file", "--json"])
+
+    # THEN the command should succeed and the files be written to the client
+    assert exit_code == 0
+    for file in files:
+        assert file.full_path in stdout
+
+
+def test_serve_get_version_error(query_server: QueryServer, caplog):
+    """Test that errors of a served command are passed on to the client"""
+    # GIVEN a query server
+
+    # WHEN getting a version which does not exist
+    exit_code, _, stderr = serve_command(query_server, ["get", "version", "-i", "999"])
+
+    # THEN the command should fail and tell the client it was aborted
+    assert exit_code == 1
+    assert "Aborted!" in stderr
+    assert "Could not find version 999" in caplog.text
+
+
+def test_serve_rejects_other_commands(query_server: QueryServer):
+    """Test that the query server only runs the served commands"""
+    # GIVEN a query server
+
+    # WHEN forwarding a command which is not served
+    exit_code, _, stderr = serve_command(query_server, ["delete", "files", "--yes"])
+
+    # THEN the command should be rejected
+    assert exit_code == 2
+    assert "Command can not be served" in stderr
+
+
+def test_serve_with_base_options(
+    query_server: QueryServer, populated_context: dict, tmp_path: Path
+):
+    """Test that a command with base options pointing to the served database is served"""
+    # GIVEN a query server with a populated store
+    store: Store = populated_context["store"]
+    columns: str | None = os.environ.get("COLUMNS")
+
+    # GIVEN a config with the database and root of the server
+    config_path = Path(tmp_path, "config.yaml")
+    config_path.write_text(
+        yaml.dump(
+            {"database": populated_context["database"], "root": str(populated_context["root"])}
+        )
+    )
+
+    # WHEN getting the files through the server with the config and a log level
+    exit_code, stdout, _ = serve_command(
+        query_server, ["-c", str(config_path), "-l", "DEBUG", "get", "file", "--json"]
+    )
+
+    # THEN the command should succeed
+    assert exit_code == 0
+    assert store.get_files(local_only=True).first().full_path in stdout
+
+    # THEN the environment of the server should be left as it was
+    assert os.environ.get("COLUMNS") == columns
+
+
+@pytest.mark.parametrize(
+    "base_args",
+    [
+        ["-d", "sqlite:///other.db"],
+        ["--root", "."],
+        ["-c", "missing.yaml"],
+        ["--log-level", "LOUD"],
+    ],
+)
+def test_serve_refuses_other_base_options(query_server: QueryServer, base_args: list[str]):
+    """Test that the query server refuses commands meant for another database or root"""
+    # GIVEN a query server
+
+    # WHEN forwarding a command with base options the server does not match
+    exit_code, stdout, _ = serve_command(query_server, base_args + ["get", "file", "--json"])
+
+    # THEN the command should be refused, leaving it to the client to run it
+    assert exit_code is None
+    assert stdout == ""
+
+
+def test_serve_sends_log_messages(query_server: QueryServer):
+    """Test that log messages of a served command are passed on to the client"""
+    # GIVEN a query server
+
+    # WHEN getting a version which does not exist
+    exit_code, _, stderr = serve_command(query_server, ["get", "version", "-i", "999"])
+
+    # THEN the error should be logged to the client
+    assert exit_code == 1
+    assert "Could not find version 999" in stderr
+
+    # THEN the log handler of the request should be removed
+    assert not any(
+        isinstance(handler.stream, MessageStream)
+        for handler in logging.getLogger().handlers
+        if isinstance(handler, logging.StreamHandler)
+    )
+
+
+def test_serve_socket_permissions(query_server: QueryServer):
+    """Test that only the owner can connect to the socket"""
+    # GIVEN a query server
+
+    # WHEN checking the permissions of its socket
+    mode: int = stat.S_IMODE(os.stat(query_server.server_address).st_mode)
+
+    # THEN only the owner should be able to read and write
+    assert mode == 0o600
@@ -3,6 +3,8 @@
 from pathlib import Path
 
 import pytest
+from pytest_mock import MockerFixture
+from sqlalchemy.dialects import mysql
 from sqlalchemy.exc import IntegrityError
 
 from housekeeper.store.api import schema
@@ -97,6 +99,10 @@ def test_add_bundle(store: Store, bundle_obj):
     assert store._get_query(table=File).count() > 0
     # THEN assert we have a version
     assert store._get_query(table=Version).count() > 0
+    # THEN assert the size and modification time of the files were recorded
+    for file in store._get_query(table=File):
+        file_stat = Path(file.path).stat()
+        assert (file.size, file.mtime) == (file_stat.st_size, file_stat.st_mtime_ns)
 
 
 def test_add_bundle_twice(populated_store: Store, bundle_data):
@@ -132,6 +138,48 @@ def test_add_two_versions_of_bundle(populated_store: Store, second_bundle_data:
     assert store._get_query(table=File).count() == starting_file_count + 2
 
 
+def test_add_bundle_with_tags_created_concurrently(
+    populated_store: Store, second_bundle_data: dict, mocker: MockerFixture
+):
+    """Test adding a version whose tags were created by another writer after being looked up."""
+    # GIVEN existing tags that are not found on the first lookup, as if created concurrently
+    tag_names: list[str] = [tag for file in second_bundle_data["files"] for tag in file["tags"]]
+    existing_tags: list[Tag] = populated_store.get_tags_by_names(tag_names=tag_names)
+    mocker.patch.object(
+        populated_store, "get_tags_by_names", side_effect=[[], existing_tags, existing_tags]
+    )
+    tag_count: int = populated_store._get_query(table=Tag).count()
+
+    # WHEN creating the tags of the files and adding a new version of the bundle
+    populated_store.create_file_tags(second_bundle_data["files"])
+    bundle, version = populated_store.add_bundle(second_bundle_data)
+    populated_store.session.add(version)
+    populated_store.session.commit()
+
+    # THEN the files should be tagged with the existing tags
+    assert {tag for file in version.files for tag in file.tags} == set(existing_tags)
+
+    # THEN no new tag should have been added
+    assert populated_store._get_query(table=Tag).count() == tag_count
+
+
+def test_create_file_tags(store: Store, bundle_data: dict):
+    """Test that the tags of files are added to the database before building a version."""
+    # GIVEN a store without tags
+    assert store._get_query(table=Tag).count() == 0
+    tag_names: set[str] = {tag for file in bundle_data["files"] for tag in file["tags"]}
+
+    # WHEN creating the tags of the bundle files
+    store.create_file_tags(bundle_data["files"])
+
+    # THEN the tags should be added to the database
+    assert store._get_query(table=Tag).count() == len(tag_names)
+
+    # THEN the files of a version built afterwards should be tagged with them
+    _, version = store.add_bundle(bundle_data)
+    assert all(tag.id for file in version.files for tag in file.tags)
+
+
 def test_add_archive(archiving_task_id: int, populated_store: Store, spring_file_2: Path):
     """Test that adding an archive works as expected."""
     # GIVEN a file that is not archived
@@ -165,6 +213,76 @@ def test_add_archive_to_archived_file(
         populated_store.session.commit()
 
 
+def test_add_archives(
+    archiving_task_id: int,
+    new_archiving_task_id: int,
+    populated_store: Store,
+    spring_file_1: Path,
+    spring_file_2: Path,
+):
+    """Test adding archives for many files where one of the files is already archived."""
+    # GIVEN an archived and a non-archived file
+    archived_file: File = populated_store.get_files(file_path=spring_file_1.as_posix()).first()
+    non_archived_file: File = populated_store.get_files(file_path=spring_file_2.as_posix()).first()
+    assert archived_file.archive and not non_archived_file.archive
+    archive_count: int = populated_store._get_query(table=Archive).count()
+
+    # WHEN adding archives for both files
+    already_archived: list[int] = populated_store.add_archives(
+        [
+            (archived_file.id, new_archiving_task_id),
+            (non_archived_file.id, archiving_task_id),
+        ]
+    )
+    populated_store.session.commit()
+
+    # THEN the archived file should be reported
+    assert already_archived == [archived_file.id]
+
+    # THEN only the non-archived file should get a new archive
+    assert populated_store._get_query(table=Archive).count() == archive_count + 1
+    assert non_archived_file.archive.archiving_task_id == archiving_task_id
+    assert archived_file.archive.archiving_task_id != new_archiving_task_id
+
+
+def test_add_archives_with_conflicting_rows(
+    archiving_task_id: int,
+    populated_store: Store,
+    spring_file_1: Path,
+    mocker: MockerFixture,
+    caplog,
+):
+    """Test that archives added concurrently are skipped when adding archives."""
+    # GIVEN an archived file that is not found when looking for archived files
+    archived_file: File = populated_store.get_files(file_path=spring_file_1.as_posix()).first()
+    mocker.patch(
+        "housekeeper.store.crud.create.apply_archive_filter",
+        return_value=populated_store._get_query(table=Archive).filter(Archive.file_id == 0),
+    )
+
+    # WHEN adding an archive for the file
+    already_archived: list[int] = populated_store.add_archives(
+        [(archived_file.id, archiving_task_id + 1)]
+    )
+
+    # THEN the insert should not fail and the existing archive should be kept
+    populated_store.session.commit()
+    assert not already_archived
+    assert archived_file.archive.archiving_task_id == archiving_task_id
+
+    # THEN the skipped row should be logged
+    assert "Skipped 1 archives added concurrently" in caplog.text
+
+
+def test_add_archives_without_pairs(populated_store: Store):
+    """Test adding archives without any files."""
+    # WHEN adding archives without any files
+    already_archived: list[int] = populated_store.add_archives([])
+
+    # THEN no files should be reported
+    assert already_archived == []
+
+
 def test_add_file(
     populated_store: Store,
     second_family_vcf: Path,
@@ -214,3 +332,55 @@ def test_add_file_no_tags(
 
     # THEN assert that the no tags where added to the file
     assert len(new_file.tags) == 0
+
+
+def test_get_or_create_tags(
+    populated_store: Store, family_tag_names: list[str], non_existent_tag_name: str
+):
+    """Test resolving existing tags and creating a missing one."""
+    # GIVEN a store with some tags and a tag name that does not exist
+    tag_count: int = populated_store._get_query(table=Tag).count()
+    tag_names: list[str] = family_tag_names + [non_existent_tag_name]
+
+    # WHEN resolving the tags
+    tags: dict[str, Tag] = populated_store.get_or_create_tags(tag_names)
+
+    # THEN all tag names should map to persisted tags
+    assert sorted(tags) == sorted(tag_names)
+    assert all(tag.id for tag in tags.values())
+
+    # THEN only the missing tag should have been added
+    assert populated_store._get_query(table=Tag).count() == tag_count + 1
+
+
+def test_get_or_create_tags_created_concurrently(
+    populated_store: Store, family_tag_name: str, mocker: MockerFixture
+):
+    """Test resolving a tag that was created by another writer after it was looked up."""
+    # GIVEN a tag that is not found on the first lookup, as if it was created concurrently
+    get_tags_by_names = populated_store.get_tags_by_names
+    mocker.patch.object(
+        populated_store, "get_tags_by_names", side_effect=[[], get_tags_by_names([family_tag_name])]
+    )
+    tag_count: int = populated_store._get_query(table=Tag).count()
+
+    # WHEN resolving the tag
+    tags: dict[str, Tag] = populated_store.get_or_create_tags([family_tag_name])
+
+    # THEN the existing tag should be returned
+    assert tags[family_tag_name].id == populated_store.get_tag(family_tag_name).id
+
+    # THEN no new tag should have been added
+    assert populated_store._get_query(table=Tag).count() == tag_count
+
+
+def test_add_archives_mysql_insert(populated_store: Store):
+    """Test that the MySQL insert of archives only skips rows with an existing file id."""
+    # WHEN getting the insert of archives for MySQL
+    statement: str = str(
+        populated_store._get_insert_skipping_conflicts("mysql").compile(dialect=mysql.dialect())
+    )
+
+    # THEN conflicting rows should be left as they were, without ignoring other errors
+    assert "ON DUPLICATE KEY UPDATE file_id = archive.file_id" in statement
+    assert "IGNORE" not in statement
@@ -5,9 +5,14 @@ from datetime import timedelta
 from pathlib import Path
 
 import pytest
+from sqlalchemy import Engine, event
 
-from housekeeper.store.models import Archive, File, Tag
+from housekeeper.constants import ArchiveState, TagMatch, UsageGroup
+from housekeeper.services.file_report_service.utils import format_files
+from housekeeper.store.loading import FileLoading
+from housekeeper.store.models import Archive, Bundle, File, Tag, Version
 from housekeeper.store.store import Store
+from housekeeper.usage import UsageReport
 
 
 def test_tag_with_tag_name(populated_store: Store, sample_tag_name: str):
@@ -35,6 +40,300 @@ def test_tag_without_tag_name(populated_store: Store):
     assert test_tag is None
 
 
+def test_get_tags_by_names(
+    populated_store: Store, family_tag_names: list[str], non_existent_tag_name: str
+):
+    """Test fetching several tags from the database given their names."""
+    # GIVEN a populated store and a list of tag names where one does not exist
+
+    # WHEN retrieving the tags from Store
+    tags: list[Tag] = populated_store.get_tags_by_names(
+        tag_names=family_tag_names + [non_existent_tag_name]
+    )
+
+    # THEN the existing tags should be returned
+    assert sorted(tag.name for tag in tags) == sorted(family_tag_names)
+
+
+def test_get_tags_by_names_without_names(populated_store: Store):
+    """Test fetching tags without tag names returns an empty list."""
+    # GIVEN a populated store
+
+    # WHEN retrieving tags without any names
+    tags: list[Tag] = populated_store.get_tags_by_names(tag_names=[])
+
+    # THEN no tags should be returned
+    assert tags == []
+
+
+def test_get_files_with_listing_loading(populated_store: Store):
+    """Test that files fetched with the listing profile can be formatted without further queries."""
+    # GIVEN a populated store with files
+    statements: list[str] = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine: Engine = populated_store.session.get_bind()
+    event.listen(engine, "before_cursor_execute", count_statement)
+    populated_store.session.expire_all()
+
+    # WHEN fetching all files with the listing profile and formatting them
+    files: list[File] = populated_store.get_files(loading=FileLoading.LISTING).all()
+    query_count: int = len(statements)
+    format_files(files)
+    event.remove(engine, "before_cursor_execute", count_statement)
+
+    # THEN the files and their tags should be loaded in a constant number of queries
+    assert len(files) > 2
+    assert query_count == 2
+
+    # THEN formatting the files should not issue any queries
+    assert len(statements) == query_count
+
+
+def test_get_versions(populated_store: Store):
+    """Test that versions are fetched with their bundles and files in a constant number of queries."""
+    # GIVEN a populated store with several versions
+    statements: list[str] = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine: Engine = populated_store.session.get_bind()
+    event.listen(engine, "before_cursor_execute", count_statement)
+    populated_store.session.expire_all()
+
+    # WHEN fetching all versions and reading their bundles, files, tags and archives
+    versions: list[Version] = populated_store.get_versions()
+    query_count: int = len(statements)
+    for version in versions:
+        assert version.bundle.name
+        for file in version.files:
+            assert file.tags is not None
+            assert file.archive is None or file.archive.file_id == file.id
+    event.remove(engine, "before_cursor_execute", count_statement)
+
+    # THEN the versions and their relationships should be loaded in three queries
+    assert len(versions) > 1
+    assert query_count == 3
+
+    # THEN reading the relationships should not issue any queries
+    assert len(statements) == query_count
+
+    # THEN the versions should be ordered latest first
+    created: list[datetime.datetime] = [version.created_at for version in versions]
+    assert created == sorted(created, reverse=True)
+
+
+def test_get_versions_by_bundle_name(populated_store: Store):
+    """Test fetching the versions of a bundle."""
+    # GIVEN a bundle in a populated store
+    bundle: Bundle = populated_store.bundles().first()
+
+    # WHEN fetching the versions of the bundle
+    versions: list[Version] = populated_store.get_versions(bundle_name=bundle.name)
+
+    # THEN the versions of the bundle should be returned
+    assert versions == bundle.versions
+
+
+def test_get_bundle_summaries(populated_store: Store):
+    """Test that bundles are listed by name with their number of versions and files."""
+    # GIVEN a populated store with bundles
+    bundles: list[Bundle] = populated_store.bundles().order_by(Bundle.name).all()
+    assert len(bundles) > 1
+
+    # WHEN listing the bundle summaries
+    summaries = populated_store.get_bundle_summaries()
+
+    # THEN each bundle should be listed in order of name with its versions and files
+    assert [summary.name for summary in summaries] == [bundle.name for bundle in bundles]
+    for summary, bundle in zip(summaries, bundles):
+        assert summary.versions == len(bundle.versions)
+        assert summary.files == sum(len(version.files) for version in bundle.versions)
+        assert summary.latest_version_at == max(version.created_at for version in bundle.versions)
+
+
+def test_get_bundle_summaries_page(populated_store: Store):
+    """Test that bundle summaries are paged by name and filtered by name prefixes."""
+    # GIVEN a populated store with bundles
+    names: list[str] = [bundle.name for bundle in populated_store.bundles().order_by(Bundle.name)]
+    assert len(names) > 1
+
+    # WHEN listing a page of one bundle, then the following page
+    first_page = populated_store.get_bundle_summaries(limit=1)
+    next_page = populated_store.get_bundle_summaries(after_name=first_page[-1].name, limit=1)
+
+    # THEN the pages should hold the first and second bundle
+    assert [summary.name for summary in first_page + next_page] == names[:2]
+
+    # THEN the same bundles should be listed by offset
+    assert populated_store.get_bundle_summaries(offset=1, limit=1)[0].name == names[1]
+
+    # WHEN listing the bundles starting with the prefix of the last bundle
+    summaries = populated_store.get_bundle_summaries(name_prefixes=[names[-1][:-1]])
+
+    # THEN only bundles with that prefix should be listed
+    assert names[-1] in {summary.name for summary in summaries}
+    assert all(summary.name.startswith(names[-1][:-1]) for summary in summaries)
+
+
+def test_get_file_rows(populated_store: Store, sample_tag_names: list[str]):
+    """Test getting the rows of the files having some tags, one row per file and tag."""
+    # GIVEN a store with files having the given tags
+    files: list[File] = populated_store.get_files(tag_names=sample_tag_names).all()
+    assert files
+
+    # WHEN getting the file rows for the tags
+    rows = list(populated_store.get_file_rows(tag_names=sample_tag_names))
+
+    # THEN each tag of each file should have a row, ordered by file id
+    assert [row.id for row in rows] == sorted(row.id for row in rows)
+    assert {(row.id, row.name) for row in rows} == {
+        (file.id, tag.name) for file in files for tag in file.tags
+    }
+
+
+def test_get_files_not_on_disk(populated_store: Store, tmp_path: Path):
+    """Test getting the files that are not on disk."""
+    # GIVEN files in the store where only one is present on disk
+    files: list[File] = populated_store.get_files().all()
+    assert len(files) > 1
+    present_file: File = files[0]
+    present_path = Path(tmp_path, "present.txt")
+    present_path.touch()
+    present_file.path = present_path.as_posix()
+    for file in files[1:]:
+        file.path = Path(tmp_path, f"missing_{file.id}.txt").as_posix()
+
+    # WHEN getting the files not on disk
+    files_not_on_disk: list[File] = populated_store.get_files_not_on_disk(files)
+
+    # THEN all files except the present one should be returned in the given order
+    assert files_not_on_disk == files[1:]
+
+
+def test_get_disk_usage(populated_store: Store, tmp_path: Path):
+    """Test summing up the disk usage of files, counting hardlinked files once."""
+    # GIVEN files in the store where two are hardlinks to the same data and one is missing
+    files: list[File] = populated_store.get_files().all()
+    assert len(files) > 2
+    first_path = Path(tmp_path, "first.txt")
+    first_path.write_text("12345")
+    hardlink_path = Path(tmp_path, "hardlink.txt")
+    hardlink_path.hardlink_to(first_path)
+    files[0].path = first_path.as_posix()
+    files[1].path = hardlink_path.as_posix()
+    for file in files[2:-1]:
+        file_path = Path(tmp_path, f"file_{file.id}.txt")
+        file_path.write_text("1")
+        file.path = file_path.as_posix()
+    files[-1].path = Path(tmp_path, "missing.txt").as_posix()
+    populated_store.session.commit()
+
+    # WHEN getting the disk usage
+    report: UsageReport = populated_store.get_disk_usage(
+        keep_file_sizes=True, workers=2, batch_size=2
+    )
+
+    # THEN the hardlinked data should only be counted once
+    assert report.total.files == len(files) - 1
+    assert report.total.size == 5 + len(files) - 3
+
+    # THEN the missing file should be counted as missing
+    assert report.missing_files == 1
+
+    # THEN the sizes should be summed up per bundle and archive state as well
+    bundle_name: str = files[0].version.bundle.name
+    assert report.groups[UsageGroup.BUNDLE][bundle_name].size <= report.total.size
+    assert sum(usage.size for usage in report.groups[UsageGroup.ARCHIVE_STATE].values()) == (
+        report.total.size
+    )
+    assert set(report.groups[UsageGroup.ARCHIVE_STATE]) <= set(ArchiveState)
+
+    # THEN the sizes of the files should be kept to be stored
+    assert report.file_sizes[files[0].id] == 5
+
+
+def test_get_disk_usage_stored_sizes(populated_store: Store):
+    """Test summing up the disk usage of files from the sizes stored in the database."""
+    # GIVEN files with stored sizes, where one size is unknown
+    files: list[File] = populated_store.get_files().all()
+    populated_store.update_file_sizes({file.id: 10 for file in files[1:]})
+    files[0].size = None
+    populated_store.session.commit()
+
+    # WHEN getting the disk usage from the stored sizes
+    report: UsageReport = populated_store.get_disk_usage(use_stored_sizes=True)
+
+    # THEN the stored sizes should be summed up
+    assert report.total.size == 10 * (len(files) - 1)
+
+    # THEN the file without a size should be counted as missing
+    assert report.missing_files == 1
+
+    # THEN the sizes of the files should not be kept
+    assert not report.file_sizes
+
+
+def test_get_disk_usage_versions_of_same_day(populated_store: Store):
+    """Test that versions of a bundle created on the same day are summed up separately."""
+    # GIVEN a file moved to a new version of its bundle, created later the same day
+    files: list[File] = populated_store.get_files().all()
+    populated_store.update_file_sizes({file.id: 10 for file in files})
+    version: Version = files[0].version
+    created_at: datetime.datetime = version.created_at + timedelta(hours=1)
+    new_version: Version = populated_store.new_version(created_at=created_at)
+    new_version.bundle = version.bundle
+    files[0].version = new_version
+    populated_store.session.add(new_version)
+    populated_store.session.commit()
+    assert new_version.created_at.date() == version.created_at.date()
+
+    # WHEN getting the disk usage per version
+    report: UsageReport = populated_store.get_disk_usage(use_stored_sizes=True)
+
+    # THEN each version should have its own usage
+    version_usages: dict = report.groups[UsageGroup.VERSION]
+    assert len(version_usages) == len(populated_store._get_query(table=Version).all())
+    assert version_usages[f"{version.bundle.name}/{created_at.isoformat()}"].files == 1
+
+
+def test_get_files_is_included(populated_store: Store, tmp_path: Path):
+    """Test splitting files into those included in the root and those with external paths."""
+    # GIVEN a store where one file has an external path
+    files: list[File] = populated_store.get_files().all()
+    external_file: File = files[0]
+    external_file.path = Path(tmp_path, "external.txt").as_posix()
+    populated_store.session.commit()
+
+    # WHEN getting the included and the external files
+    included_files: list[File] = populated_store.get_files(is_included=True).all()
+    external_files: list[File] = populated_store.get_files(is_included=False).all()
+
+    # THEN only the file with the external path should be external
+    assert external_files == [external_file]
+    assert set(included_files) == set(files[1:])
+
+
+def test_get_included_file_ids(populated_store: Store, tmp_path: Path):
+    """Test getting which of the given files are included in the root."""
+    # GIVEN a store where one file has an external path
+    files: list[File] = populated_store.get_files().all()
+    external_file: File = files[0]
+    external_file.path = Path(tmp_path, "external.txt").as_posix()
+    populated_store.session.commit()
+
+    # WHEN getting the included file ids among the external file and one other file
+    included_file_ids: set[int] = populated_store.get_included_file_ids(
+        file_ids=[external_file.id, files[1].id]
+    )
+
+    # THEN only the other file should be included
+    assert included_file_ids == {files[1].id}
+
+
 def test_get_files_before(populated_store, bundle_data_old, time_stamp_now):
     """
     Test return all files when two bundles are added and all files are older.
@@ -55,6 +354,38 @@ def test_get_files_before(populated_store, bundle_data_old, time_stamp_now):
     assert len(files) == starting_nr_of_files + 2
 
 
+def test_get_files_before_in_batches(populated_store: Store, time_stamp_now):
+    """Test getting files before a date in batches."""
+    # GIVEN a store with files
+    files: list[File] = populated_store.get_files_before(before_date=time_stamp_now)
+    assert len(files) > 2
+
+    # WHEN getting the files in batches of two
+    batches: list[list[File]] = list(
+        populated_store.get_files_before_in_batches(before_date=time_stamp_now, batch_size=2)
+    )
+
+    # THEN all files should be returned in batches of at most two ordered by id
+    assert all(len(batch) <= 2 for batch in batches)
+    batched_files: list[File] = [file for batch in batches for file in batch]
+    assert [file.id for file in batched_files] == sorted(file.id for file in files)
+
+
+def test_stream_files(populated_store: Store, sample_tag_names: list[str]):
+    """Test streaming files matching the filters of get_files."""
+    # GIVEN a store with files having the given tags
+    files: list[File] = populated_store.get_files(tag_names=sample_tag_names).all()
+    assert files
+
+    # WHEN streaming the files with the tags in batches of one
+    streamed_files: list[File] = list(
+        populated_store.stream_files(batch_size=1, tag_names=sample_tag_names)
+    )
+
+    # THEN the same files should be returned
+    assert sorted(file.id for file in streamed_files) == sorted(file.id for file in files)
+
+
 def test_get_past_files(populated_store, bundle_data_old, timestamp, old_timestamp):
     """
     test fetch files where not all files are older than before date.
@@ -205,6 +536,62 @@ def test_get_non_archived_files(populated_store: Store, spring_tag: str, limit:
         assert not non_archived_spring_files
 
 
+@pytest.mark.parametrize("skip_locked", [False, True])
+def test_get_non_archived_files_page(
+    archive: Archive, populated_store: Store, spring_tag: str, skip_locked: bool
+):
+    """Test paging through the non-archived spring files with a cursor on the file id."""
+    # GIVEN a store with several non-archived spring files
+    populated_store.session.delete(archive)
+    populated_store.session.commit()
+    non_archived_files: list[File] = populated_store.get_non_archived_files(tag_names=[spring_tag])
+    assert len(non_archived_files) > 1
+
+    # WHEN paging through the files one at a time
+    paged_files: list[File] = []
+    after_file_id = 0
+    while page := populated_store.get_non_archived_files_page(
+        tag_names=[spring_tag], after_file_id=after_file_id, limit=1, skip_locked=skip_locked
+    ):
+        paged_files.extend(page)
+        after_file_id = page[-1].id
+
+    # THEN each non-archived file should be returned once, ordered by id
+    assert [file.id for file in paged_files] == sorted(file.id for file in non_archived_files)
+
+
+@pytest.mark.parametrize("tag_match", [TagMatch.EXISTS, TagMatch.INTERSECT])
+def test_get_files_tag_match(populated_store: Store, sample_tag_names: list[str], tag_match):
+    """Test that each tag matching strategy returns the same files as grouping on tags."""
+    # GIVEN a populated store with files having the sample tags
+    expected_files: list[File] = populated_store.get_files(tag_names=sample_tag_names).all()
+    assert expected_files
+
+    # WHEN fetching the files with the tags using another strategy
+    files: list[File] = populated_store.get_files(
+        tag_names=sample_tag_names, tag_match=tag_match
+    ).all()
+
+    # THEN the same files should be returned
+    assert sorted(file.id for file in files) == sorted(file.id for file in expected_files)
+
+
+@pytest.mark.parametrize("tag_match", [TagMatch.EXISTS, TagMatch.INTERSECT])
+def test_get_non_archived_files_tag_match(populated_store: Store, spring_tag: str, tag_match):
+    """Test that each tag matching strategy returns the same non-archived files."""
+    # GIVEN a populated store with archived and non-archived SPRING files
+    expected_files: list[File] = populated_store.get_non_archived_files(tag_names=[spring_tag])
+    assert expected_files
+
+    # WHEN fetching the non-archived files using another strategy
+    files: list[File] = populated_store.get_non_archived_files(
+        tag_names=[spring_tag], tag_match=tag_match
+    )
+
+    # THEN the same files should be returned
+    assert sorted(file.id for file in files) == sorted(file.id for file in expected_files)
+
+
 def test_get_ongoing_archiving_tasks(
     archive: Archive, archiving_task_id: int, populated_store: Store
 ):
@@ -354,3 +741,31 @@ def test_filter_by_retrieved_before(
 
     # THEN the archive is only returned if it was retrieved before date
     assert (archive.file in files_retrieved_before_date) == should_be_returned
+
+
+@pytest.mark.parametrize(
+    "name, is_mariadb, server_version_info, expected",
+    [
+        ("postgresql", False, (16, 2), True),
+        ("mysql", False, (8, 0, 36), True),
+        ("mysql", False, (5, 7, 44), False),
+        ("mysql", True, (10, 11, 6), True),
+        ("mysql", True, (10, 5, 9), False),
+        ("mysql", False, None, False),
+        ("sqlite", False, (3, 45, 1), False),
+    ],
+)
+def test_supports_skip_locked(
+    store: Store, mocker, name: str, is_mariadb: bool, server_version_info, expected: bool
+):
+    """Test which database servers are taken as supporting SKIP LOCKED."""
+    # GIVEN a connection to a database server with a version, which may not be known
+    dialect = mocker.Mock(is_mariadb=is_mariadb, server_version_info=server_version_info)
+    dialect.name = name
+    mocker.patch.object(store.session, "connection", return_value=mocker.Mock(dialect=dialect))
+
+    # WHEN checking if the database supports SKIP LOCKED
+    supported: bool = store._supports_skip_locked()
+
+    # THEN only servers with a known version supporting it should be taken as supporting it
+    assert supported == expected
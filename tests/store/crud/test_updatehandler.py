@@ -124,3 +124,98 @@ def test_update_archiving_task_id(
 
     # THEN the retrieval task id should be set
     assert archive.archiving_task_id == new_archiving_task_id
+
+
+def test_update_finished_archival_tasks(
+    archiving_task_id: int,
+    new_archiving_task_id: int,
+    old_timestamp: datetime,
+    populated_store: Store,
+):
+    """Tests updating all archives matching any of the given archiving task ids at once."""
+    # GIVEN a store with archives for two archiving tasks
+    archives: list[Archive] = populated_store._get_query(table=Archive).all()
+    assert {archive.archiving_task_id for archive in archives} == {
+        archiving_task_id,
+        new_archiving_task_id,
+    }
+
+    # GIVEN that one of the archives is already archived
+    archived_archive: Archive = archives[0]
+    archived_archive.archived_at = old_timestamp
+    populated_store.session.commit()
+
+    # WHEN updating all archives with the given archiving task ids
+    updated_count: int = populated_store.update_finished_archival_tasks(
+        archiving_task_ids=[archiving_task_id, new_archiving_task_id]
+    )
+
+    # THEN only the archive without a timestamp should be updated
+    assert updated_count == len(archives) - 1
+    assert archived_archive.archived_at == old_timestamp
+    assert all(archive.archived_at for archive in archives)
+
+
+def test_update_finished_retrieval_tasks(retrieval_task_id: int, populated_store: Store):
+    """Tests updating all archives matching any of the given retrieval task ids at once."""
+    # GIVEN a store with an archive with a retrieval task id
+    archive: Archive = (
+        populated_store._get_query(table=Archive)
+        .filter(Archive.retrieval_task_id == retrieval_task_id)
+        .one()
+    )
+    assert not archive.retrieved_at
+
+    # WHEN updating all archives with the given retrieval task ids
+    updated_count: int = populated_store.update_finished_retrieval_tasks(
+        retrieval_task_ids=[retrieval_task_id, retrieval_task_id + 1]
+    )
+
+    # THEN the archive should have its retrieved_at timestamp updated
+    assert updated_count == 1
+    assert archive.retrieved_at
+
+
+def test_update_finished_archival_tasks_without_task_ids(populated_store: Store):
+    """Tests updating archives without giving any archiving task ids."""
+    # GIVEN a store with archives
+
+    # WHEN updating archives without task ids
+    updated_count: int = populated_store.update_finished_archival_tasks(archiving_task_ids=[])
+
+    # THEN no archives should be updated
+    assert updated_count == 0
+
+
+def test_update_retrieval_task_id_for_files(retrieval_task_id: int, populated_store: Store):
+    """Tests setting the retrieval task id on the archives of many files at once."""
+    # GIVEN a store with archived files
+    archives: list[Archive] = populated_store._get_query(table=Archive).all()
+    file_ids: list[int] = [archive.file_id for archive in archives]
+
+    # WHEN setting a new retrieval task id for the files
+    updated_count: int = populated_store.update_retrieval_task_id_for_files(
+        file_ids=file_ids, retrieval_task_id=retrieval_task_id + 1
+    )
+
+    # THEN all archives should have the new retrieval task id
+    assert updated_count == len(archives)
+    assert all(archive.retrieval_task_id == retrieval_task_id + 1 for archive in archives)
+
+
+def test_update_archiving_task_id_for_files(
+    archive: Archive, new_archiving_task_id: int, populated_store: Store
+):
+    """Tests setting the archiving task id on the archives of many files at once."""
+    # GIVEN an archive with an old archiving task id
+    archive.archiving_task_id = new_archiving_task_id - 1
+    populated_store.session.commit()
+
+    # WHEN setting a new archiving task id for the file and a file without archive
+    updated_count: int = populated_store.update_archiving_task_id_for_files(
+        file_ids=[archive.file_id, 0], archiving_task_id=new_archiving_task_id
+    )
+
+    # THEN only the existing archive should be updated
+    assert updated_count == 1
+    assert archive.archiving_task_id == new_archiving_task_id
@@ -6,6 +6,8 @@ from sqlalchemy.orm import Query
 from housekeeper.store.filters.archive_filters import (
     filter_archiving_ongoing,
     filter_by_archiving_task_id,
+    filter_by_archiving_task_ids,
+    filter_by_file_ids,
     filter_by_retrieval_task_id,
     filter_by_retrieved_before,
     filter_retrieval_ongoing,
@@ -109,3 +111,34 @@ def test_filter_by_retrieved_before(
 
     # THEN the archive is only returned if it was retrieved before date
     assert (archive in archives_retrieved_before_date) == expected_result
+
+
+def test_filter_by_archiving_task_ids(
+    archiving_task_id: int, new_archiving_task_id: int, populated_store: Store
+):
+    """Tests filtering of Archives on a list of archiving task ids."""
+    # GIVEN a populated store with archives for two archiving tasks
+
+    # WHEN filtering a query by one of the archiving task ids and an unknown one
+    archives: Query = filter_by_archiving_task_ids(
+        archives=populated_store._get_query(table=Archive),
+        task_ids=[archiving_task_id, new_archiving_task_id + archiving_task_id],
+    )
+
+    # THEN only the archives of the known archiving task should be returned
+    assert archives.count() > 0
+    for archive in archives:
+        assert archive.archiving_task_id == archiving_task_id
+
+
+def test_filter_by_file_ids(archive: Archive, populated_store: Store):
+    """Tests filtering of Archives on a list of file ids."""
+    # GIVEN a populated store with an archive
+
+    # WHEN filtering a query by the file id of the archive
+    archives: Query = filter_by_file_ids(
+        archives=populated_store._get_query(table=Archive), file_ids=[archive.file_id]
+    )
+
+    # THEN only the archive should be returned
+    assert archives.all() == [archive]
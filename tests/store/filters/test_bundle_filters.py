@@ -3,6 +3,8 @@ from sqlalchemy.orm import Query
 from housekeeper.store.filters.bundle_filters import (
     filter_bundle_by_id,
     filter_bundle_by_name,
+    filter_bundles_after_name,
+    filter_bundles_by_name_prefixes,
 )
 from housekeeper.store.models import Bundle
 from housekeeper.store.store import Store
@@ -57,3 +59,35 @@ def test_filter_bundles_by_name_returns_the_correct_bundle(populated_store: Stor
 
     # THEN the name should match
     assert bundle.name == bundle_name
+
+
+def test_filter_bundles_by_name_prefixes(populated_store: Store):
+    """Test getting bundles by name prefixes, matching wildcard characters literally."""
+
+    # GIVEN a store with a bundle
+    bundle: Bundle = populated_store._get_query(table=Bundle).first()
+
+    # WHEN retrieving the bundles by the start of the name and by a wildcard
+    bundles: list[Bundle] = filter_bundles_by_name_prefixes(
+        bundles=populated_store._get_query(table=Bundle),
+        name_prefixes=["%", bundle.name[:3]],
+    ).all()
+
+    # THEN only bundles starting with the prefix should be returned
+    assert bundle in bundles
+    assert all(other.name.startswith(bundle.name[:3]) for other in bundles)
+
+
+def test_filter_bundles_after_name(populated_store: Store):
+    """Test getting bundles with a name sorting after a given name."""
+
+    # GIVEN a store with bundles
+    names: list[str] = sorted(bundle.name for bundle in populated_store._get_query(table=Bundle))
+
+    # WHEN retrieving the bundles after the first name
+    bundles: list[Bundle] = filter_bundles_after_name(
+        bundles=populated_store._get_query(table=Bundle), bundle_name=names[0]
+    ).all()
+
+    # THEN the other bundles should be returned
+    assert sorted(bundle.name for bundle in bundles) == names[1:]
@@ -1,10 +1,15 @@
+from typing import Callable
+
 import pytest
 from sqlalchemy.orm import Query
 
 from housekeeper.store.filters.file_filters import (
+    filter_files_after_id,
+    filter_files_by_all_tags,
     filter_files_by_id,
     filter_files_by_is_archived,
     filter_files_by_path,
+    filter_files_by_tag_intersection,
     filter_files_by_tags,
 )
 from housekeeper.store.models import File
@@ -48,6 +53,23 @@ def test_filter_files_by_id_returns_the_correct_file(populated_store: Store):
     assert filtered_file.id == file.id
 
 
+def test_filter_files_after_id(populated_store: Store):
+    """Test filtering files with an id greater than a given file id."""
+
+    # GIVEN a store with files
+    file: File = populated_store._get_query(table=File).order_by(File.id).first()
+    file_count: int = populated_store._get_query(table=File).count()
+
+    # WHEN filtering files after the id of the first file
+    file_query: Query = filter_files_after_id(
+        files=populated_store._get_query(table=File), file_id=file.id
+    )
+
+    # THEN all files except the first one should be returned
+    assert file_query.count() == file_count - 1
+    assert all(filtered_file.id > file.id for filtered_file in file_query)
+
+
 def test_filter_files_by_path_returns_the_correct_file(populated_store: Store):
     """ "Test filtering files by path returns the correct file."""
     # GIVEN a store with some files
@@ -123,6 +145,52 @@ def test_filter_files_by_tags_returns_empty_list_when_no_files_match_tags(
     assert len(filtered_files_query.all()) == 0
 
 
+@pytest.mark.parametrize(
+    "filter_function", [filter_files_by_all_tags, filter_files_by_tag_intersection]
+)
+def test_filter_files_by_all_tags_returns_files_with_all_tags(
+    populated_store: Store, sample_tag_names: list[str], filter_function: Callable
+):
+    """Test filtering files having all tags without joining the tags."""
+
+    # GIVEN a store with files where some have all the sample tags
+    files: Query = populated_store._get_query(table=File)
+
+    # WHEN filtering files by the tags
+    filtered_files: list[File] = filter_function(files=files, tag_names=sample_tag_names).all()
+
+    # THEN files should be returned
+    assert filtered_files
+
+    # THEN each file should have all the requested tags
+    for filtered_file in filtered_files:
+        file_tag_names: list[str] = [tag.name for tag in filtered_file.tags]
+        assert all(tag_name in file_tag_names for tag_name in sample_tag_names)
+
+
+@pytest.mark.parametrize(
+    "filter_function", [filter_files_by_all_tags, filter_files_by_tag_intersection]
+)
+def test_filter_files_by_all_tags_non_existent_tag(
+    populated_store: Store,
+    sample_tag_names: list[str],
+    non_existent_tag_name: str,
+    filter_function: Callable,
+):
+    """Test filtering files on tags where one of the tags does not exist."""
+
+    # GIVEN a store with files and a tag that does not exist
+    files: Query = populated_store._get_query(table=File)
+
+    # WHEN filtering files by the tags
+    filtered_files: Query = filter_function(
+        files=files, tag_names=sample_tag_names + [non_existent_tag_name]
+    )
+
+    # THEN no files should be returned
+    assert not filtered_files.all()
+
+
 def test_filter_files_by_archive_true(populated_store: Store):
     """Tests the filtering for archived files."""
 
@@ -4,6 +4,7 @@ from housekeeper.store.filters.tag_filters import (
     TagFilter,
     apply_tag_filter,
     filter_tag_by_name,
+    filter_tags_by_names,
 )
 from housekeeper.store.models import Tag
 from housekeeper.store.store import Store
@@ -80,3 +81,22 @@ def test_apply_tag_filter_without_tag_name(populated_store: Store):
 
     # THEN the retrieved query is empty
     assert tag_query.count() == 0
+
+
+def test_filter_tags_by_names_returns_matching_tags(
+    populated_store: Store, sample_tag_names: list[str], non_existent_tag_name: str
+):
+    """Test that filtering tags by names returns only the existing tags with those names."""
+    # GIVEN a populated store and a list of tag names where one does not exist
+    tag_names: list[str] = sample_tag_names + [non_existent_tag_name]
+
+    # WHEN retrieving the tags by names
+    tag_query: Query = filter_tags_by_names(
+        tags=populated_store._get_query(table=Tag), tag_names=tag_names
+    )
+
+    # THEN the returned object is a Query
+    assert isinstance(tag_query, Query)
+
+    # THEN only the existing tags should be returned
+    assert sorted(tag.name for tag in tag_query.all()) == sorted(sample_tag_names)
@@ -0,0 +1,230 @@
+"""Tests for the database module"""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DisconnectionError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import NullPool
+
+from housekeeper.store.database import (
+    get_engine,
+    get_pool_metrics,
+    get_query_metrics,
+    initialize_database,
+)
+from housekeeper.store.instrumentation import (
+    UNBUFFERED_ROW_COUNT,
+    QueryMetrics,
+    format_query_metrics,
+    get_percentile,
+    get_rows_returned,
+)
+from housekeeper.store.pool import MeteredQueuePool
+
+
+def test_initialize_database_with_pool_settings(db_uri: str):
+    """Test that the pool settings are used when initialising the database."""
+    # GIVEN a database uri and some pool settings
+
+    # WHEN initialising the database
+    initialize_database(db_uri, pool_size=3, max_overflow=2, pool_timeout=5)
+
+    # THEN the engine should use a metered queue pool with the given settings
+    pool = get_engine().pool
+    assert isinstance(pool, MeteredQueuePool)
+    assert pool.size() == 3
+    assert pool._max_overflow == 2
+    assert pool._timeout == 5
+
+
+def test_initialize_database_with_null_pool(db_uri: str):
+    """Test that connections are not pooled when asking for a null pool."""
+    # GIVEN a database uri
+
+    # WHEN initialising the database without a pool
+    initialize_database(db_uri, null_pool=True)
+
+    # THEN the engine should not pool its connections
+    assert isinstance(get_engine().pool, NullPool)
+
+
+def test_get_pool_metrics(db_uri: str):
+    """Test that pool checkouts are counted."""
+    # GIVEN an initialised database
+    initialize_database(db_uri)
+    checkouts: int = get_pool_metrics()["checkouts"]
+
+    # WHEN executing a statement
+    with get_engine().connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+    # THEN the checkout should be counted
+    metrics: dict = get_pool_metrics()
+    assert metrics["checkouts"] == checkouts + 1
+
+    # THEN the connection should be returned to the pool
+    assert metrics["checked_out"] == 0
+
+
+def test_pool_metrics_kept_per_engine(db_uri: str):
+    """Test that each engine counts the usage of its own pool, also after being disposed."""
+    # GIVEN two initialised databases
+    initialize_database(db_uri)
+    first_engine = get_engine()
+    initialize_database(db_uri)
+
+    # WHEN executing a statement on the first engine and disposing it
+    with first_engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    first_engine.dispose()
+
+    # THEN the checkout should only be counted for the first engine
+    assert first_engine.pool.metrics.checkouts == 1
+    assert get_pool_metrics()["checkouts"] == 0
+
+
+def test_get_pool_metrics_pre_ping_failures(db_uri: str):
+    """Test that connections failing the pre-ping are counted apart from other invalidations."""
+    # GIVEN an initialised database
+    initialize_database(db_uri)
+
+    # WHEN a connection is invalidated as disconnected and another one for another reason
+    get_engine().raw_connection().invalidate(DisconnectionError("ping failed"))
+    get_engine().raw_connection().invalidate()
+
+    # THEN each invalidation should be counted under its own counter
+    metrics: dict = get_pool_metrics()
+    assert metrics["pre_ping_failures"] == 1
+    assert metrics["invalidations"] == 1
+
+
+def test_get_pool_metrics_timeout(db_uri: str):
+    """Test that checkouts waiting in vain for a free connection are timed and counted."""
+    # GIVEN a database with a pool of one connection
+    initialize_database(db_uri, pool_size=1, max_overflow=0, pool_timeout=0.05)
+
+    # WHEN checking out a second connection while the only one is checked out
+    with get_engine().connect():
+        with pytest.raises(PoolTimeoutError):
+            get_engine().connect()
+
+    # THEN the timeout and the wait in the queue should be recorded
+    metrics: dict = get_pool_metrics()
+    assert metrics["timeouts"] == 1
+    assert metrics["wait_time_max"] >= 0.05
+
+
+def test_get_query_metrics(db_uri: str):
+    """Test that statements are recorded when instrumenting the database."""
+    # GIVEN a database initialised with instrumentation
+    initialize_database(db_uri, instrument=True)
+
+    # WHEN executing statements
+    with get_engine().connect() as connection:
+        connection.execute(text("SELECT 1"))
+        connection.execute(text("SELECT :value"), {"value": 2})
+
+    # THEN the statements should be counted with their latencies
+    metrics: dict = get_query_metrics()
+    assert metrics["statements"] == 2
+    assert metrics["rows_affected"] == 0
+
+    # THEN the rows returned should be unknown, since SQLite does not count the rows of queries
+    assert (metrics["rows_returned"], metrics["queries_without_row_count"]) == (0, 2)
+    assert "rows returned: n/a" in format_query_metrics(metrics)
+    assert 0 < metrics["p50_seconds"] <= metrics["max_seconds"] <= metrics["total_seconds"]
+
+    # THEN the slowest statements should be listed with their parameters, slowest first
+    parameters: dict[str, str] = {
+        statement["statement"]: statement["parameters"] for statement in metrics["slowest"]
+    }
+    assert parameters == {"SELECT 1": "()", "SELECT ?": "(2,)"}
+    seconds: list[float] = [statement["seconds"] for statement in metrics["slowest"]]
+    assert seconds == sorted(seconds, reverse=True)
+
+
+def test_query_metrics_rows_returned():
+    """Test that the rows returned by queries are summed up when the driver reports them."""
+    # GIVEN query metrics
+    metrics = QueryMetrics()
+
+    # WHEN recording queries with and without a row count reported by the driver
+    metrics.record(statement="SELECT 1", parameters=(), seconds=0.1, rows_returned=3)
+    metrics.record(statement="SELECT 2", parameters=(), seconds=0.1, rows_returned=None)
+    metrics.record(statement="UPDATE", parameters=(), seconds=0.1, rows_affected=2)
+
+    # THEN the known rows should be summed up and the other queries counted
+    summary: dict = metrics.as_dict()
+    assert (summary["rows_returned"], summary["queries_without_row_count"]) == (3, 1)
+    assert "rows returned: 3 (n/a for 1 queries)" in format_query_metrics(summary)
+
+
+@pytest.mark.parametrize(
+    "description, rowcount, expected",
+    [
+        ((("id",),), 2, 2),
+        ((("id",),), -1, None),
+        ((("id",),), UNBUFFERED_ROW_COUNT, None),
+        (None, -1, 0),
+    ],
+)
+def test_get_rows_returned(description, rowcount: int, expected: int | None, mocker):
+    """Test reading the rows returned by a query from the cursor of the driver."""
+    # GIVEN a cursor with a row count as reported by a driver
+    cursor = mocker.Mock(description=description, rowcount=rowcount)
+
+    # WHEN getting the rows returned
+    rows_returned: int | None = get_rows_returned(cursor)
+
+    # THEN the row count should only be taken when it is known
+    assert rows_returned == expected
+
+
+def test_query_metrics_keeps_slowest_statements():
+    """Test that only the slowest statements are kept."""
+    # GIVEN query metrics keeping the two slowest statements
+    metrics = QueryMetrics(slowest_statements=2)
+
+    # WHEN recording statements of different durations
+    for seconds in [0.3, 0.1, 0.4, 0.2]:
+        metrics.record(statement=str(seconds), parameters=(), seconds=seconds, rows_affected=1)
+
+    # THEN all statements should be counted
+    summary: dict = metrics.as_dict()
+    assert summary["statements"] == 4
+    assert summary["rows_affected"] == 4
+
+    # THEN the two slowest statements should be kept, slowest first
+    assert [statement["statement"] for statement in summary["slowest"]] == ["0.4", "0.3"]
+
+
+def test_get_percentile():
+    """Test the nearest rank percentile of sorted values."""
+    # GIVEN sorted values
+    values: list[float] = [float(value) for value in range(1, 101)]
+
+    # WHEN getting percentiles
+    # THEN the nearest rank should be returned
+    assert get_percentile(values, 50) == 50.0
+    assert get_percentile(values, 99) == 99.0
+    assert get_percentile([3.0], 95) == 3.0
+    assert get_percentile([], 50) == 0.0
+
+
+def test_query_metrics_samples_durations():
+    """Test that a bounded sample of the durations is kept while all of them are summed."""
+    # GIVEN query metrics keeping a sample of ten durations
+    metrics = QueryMetrics(duration_sample_size=10)
+
+    # WHEN recording more statements than the sample holds
+    for milliseconds in range(1, 101):
+        metrics.record(statement="SELECT 1", parameters=(), seconds=milliseconds / 1000)
+
+    # THEN only the sample of durations should be kept
+    assert len(metrics.durations) == 10
+
+    # THEN the total and the maximum should cover all statements
+    summary: dict = metrics.as_dict()
+    assert summary["statements"] == 100
+    assert summary["total_seconds"] == pytest.approx(5.05)
+    assert summary["max_seconds"] == 0.1
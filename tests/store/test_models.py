@@ -1,6 +1,14 @@
 """Tests for the models"""
 
-from housekeeper.store.models import Archive, Bundle, Version
+from sqlalchemy import select, text
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.orm import Query
+
+from housekeeper.store.filters.version_bundle_filters import (
+    VersionBundleFilters,
+    apply_version_bundle_filter,
+)
+from housekeeper.store.models import Archive, Bundle, File, Version
 from housekeeper.store.store import Store
 
 
@@ -62,3 +70,100 @@ def test_delete_archive_does_not_cascade(archive: Archive, populated_store: Stor
 
     # THEN the file should still be in the store
     assert populated_store.get_files(file_path=file_path)
+
+
+def test_version_by_date_and_bundle_name_uses_index(store: Store, case_id: str, timestamp):
+    """Tests that looking up a version by bundle name and date uses the composite index."""
+
+    # GIVEN the query used to fetch a version by bundle name and date
+    query: Query = apply_version_bundle_filter(
+        version_bundles=store._get_join_version_bundle_query(),
+        filter_functions=[VersionBundleFilters.BY_DATE_AND_NAME],
+        bundle_name=case_id,
+        version_date=timestamp,
+    )
+    statement: str = str(
+        query.statement.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True})
+    )
+
+    # WHEN asking the database for the query plan
+    plan: list = store.session.execute(text(f"EXPLAIN QUERY PLAN {statement}")).all()
+
+    # THEN the version table should be searched using the composite index
+    assert any("ix_version_bundle_id_created_at" in row[-1] for row in plan)
+
+
+def test_file_is_included_and_full_path_in_sql(populated_store: Store):
+    """Tests that the SQL expressions of the file properties agree with their python values."""
+
+    # GIVEN files with relative paths, absolute paths under the root and external paths
+    root: str = str(File.app_root)
+    paths: list[str] = [
+        "bundle/2020-01-01/relative.txt",
+        f"{root}/bundle/absolute.txt",
+        f"{root}_other/external.txt",
+        f"/elsewhere{root}/external.txt",
+        "/a/external.txt",
+        f"{root.upper()}/bundle/upper_case.txt",
+        f"{root}#other/external.txt",
+        f"{root}%/external.txt",
+        f"{root[:-1]}_/external.txt",
+    ]
+    files: list[File] = populated_store.get_files().all()
+    version: Version = files[0].version
+    for path in paths[len(files) :]:
+        version.files.append(populated_store.new_file(path=path, tags=[]))
+    populated_store.session.commit()
+    files = populated_store.get_files().all()[: len(paths)]
+    for file, path in zip(files, paths):
+        file.path = path
+    populated_store.session.commit()
+
+    # WHEN selecting the properties in SQL
+    rows = populated_store.session.execute(
+        select(File.id, File.full_path, File.is_included, File.is_external)
+    ).all()
+
+    # THEN they should match the python properties of each file
+    for file_id, full_path, is_included, is_external in rows:
+        file: File = populated_store.get_file_by_id(file_id)
+        assert full_path == file.full_path
+        assert bool(is_included) is file.is_included
+        assert bool(is_external) is file.is_external
+
+    # THEN the paths under the root should be included and the other absolute paths external
+    assert [file.is_included for file in files] == [True, True] + [False] * 7
+
+
+def test_file_is_external_uses_index(store: Store):
+    """Tests that filtering on external files searches the path index instead of scanning."""
+
+    # GIVEN a query for external files
+    statement: str = str(
+        select(File.id)
+        .where(File.is_external)
+        .compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True})
+    )
+
+    # WHEN asking the database for the query plan
+    plan: list = store.session.execute(text(f"EXPLAIN QUERY PLAN {statement}")).all()
+
+    # THEN the file table should only be searched, not scanned
+    assert not any(row[-1].startswith("SCAN") for row in plan)
+
+
+def test_file_is_included_in_mysql_compares_bytes():
+    """Tests that paths under the root are matched as binary with escaped wildcards on MySQL."""
+
+    # GIVEN a query for included files
+
+    # WHEN compiling it for MySQL
+    statement: str = str(
+        select(File.id)
+        .where(File.is_included)
+        .compile(dialect=mysql.dialect(), compile_kwargs={"literal_binds": True})
+    )
+
+    # THEN the paths should be matched with a binary pattern escaping wildcards
+    assert "LIKE BINARY" in statement
+    assert "ESCAPE '!'" in statement
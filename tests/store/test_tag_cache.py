@@ -0,0 +1,185 @@
+"""Tests for the tag cache"""
+
+import gc
+import weakref
+
+from pytest_mock import MockerFixture
+from sqlalchemy import Engine, event
+from sqlalchemy.orm import Session
+
+from housekeeper.store.models import Tag
+from housekeeper.store.store import Store
+from housekeeper.store.tag_cache import TagCache
+
+
+def test_tag_cache_get_tag_id():
+    """Test getting a tag id from a loaded tag cache"""
+    # GIVEN a tag cache loaded with a tag
+    tag_cache = TagCache()
+    tag_cache.load({"vcf": 1})
+
+    # WHEN getting the ids of a known and an unknown tag
+    # THEN only the known tag should have an id
+    assert tag_cache.get_tag_id("vcf") == 1
+    assert tag_cache.get_tag_id("bam") is None
+
+
+def test_tag_cache_expired(mocker: MockerFixture):
+    """Test that an expired tag cache does not return any tag ids"""
+    # GIVEN a tag cache loaded with a tag
+    tag_cache = TagCache(ttl=10)
+    monotonic = mocker.patch("housekeeper.store.tag_cache.time.monotonic", return_value=100)
+    tag_cache.load({"vcf": 1})
+
+    # WHEN the time to live has passed
+    monotonic.return_value = 110
+
+    # THEN the cache should not be fresh
+    assert not tag_cache.is_fresh
+    assert tag_cache.get_tag_id("vcf") is None
+
+
+def test_tag_cache_invalidate():
+    """Test that an invalidated tag cache does not return any tag ids"""
+    # GIVEN a tag cache loaded with a tag
+    tag_cache = TagCache()
+    tag_cache.load({"vcf": 1})
+
+    # WHEN invalidating the cache
+    tag_cache.invalidate()
+
+    # THEN the cache should not be fresh
+    assert not tag_cache.is_fresh
+    assert tag_cache.get_tag_id("vcf") is None
+
+
+def test_get_tag_from_warm_cache(populated_store: Store, sample_tag_names: list[str]):
+    """Test that tags are fetched from a warm tag cache without querying the database"""
+    # GIVEN a store with a warm tag cache
+    populated_store.load_tag_cache()
+    populated_store.session.expunge_all()
+    statements: list[str] = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine: Engine = populated_store.session.get_bind()
+    event.listen(engine, "before_cursor_execute", count_statement)
+
+    # WHEN fetching tags by name
+    tags: list[Tag] = populated_store.get_tags_by_names(tag_names=sample_tag_names)
+    event.remove(engine, "before_cursor_execute", count_statement)
+
+    # THEN the tags should be returned without any queries
+    assert sorted(tag.name for tag in tags) == sorted(set(sample_tag_names))
+    assert not statements
+
+
+def test_new_tag_is_cached_after_flush(populated_store: Store):
+    """Test that a new tag is added to the tag cache without reloading it"""
+    # GIVEN a store with a warm tag cache
+    populated_store.load_tag_cache()
+
+    # WHEN creating a new tag
+    tag: Tag = populated_store.new_tag(name="new_tag")
+    populated_store.session.add(tag)
+    populated_store.session.commit()
+
+    # THEN the cache should still be fresh and hold the new tag
+    assert populated_store.tag_cache.is_fresh
+    assert populated_store.tag_cache.get_tag_id("new_tag") == tag.id
+
+
+def test_rollback_drops_new_tags_from_cache(populated_store: Store, sample_tag_names: list[str]):
+    """Test that only the tags added before a rollback are dropped from the cache"""
+    # GIVEN a warm tag cache and a flushed new tag
+    populated_store.load_tag_cache()
+    tag: Tag = populated_store.new_tag(name="new_tag")
+    populated_store.session.add(tag)
+    populated_store.session.flush()
+    assert populated_store.tag_cache.get_tag_id("new_tag") == tag.id
+
+    # WHEN rolling back
+    populated_store.session.rollback()
+
+    # THEN the new tag should not be found in the cache nor in the database
+    assert populated_store.tag_cache.get_tag_id("new_tag") is None
+    assert populated_store.get_tag(tag_name="new_tag") is None
+
+    # THEN the other tags should still be cached
+    assert populated_store.tag_cache.is_fresh
+    assert populated_store.tag_cache.get_tag_id(sample_tag_names[0]) is not None
+
+
+def test_savepoint_rollback_drops_new_tags_from_cache(populated_store: Store):
+    """Test that tags cached within a savepoint are not used after it is rolled back"""
+    # GIVEN a new tag in the tag cache, flushed in a savepoint
+    savepoint = populated_store.session.begin_nested()
+    populated_store.session.add(populated_store.new_tag(name="new_tag"))
+    populated_store.session.flush()
+    assert populated_store.get_or_create_tags(["new_tag"])
+
+    # WHEN rolling back the savepoint
+    savepoint.rollback()
+
+    # THEN the tag should not be found in the cache
+    assert populated_store.tag_cache.get_tag_id("new_tag") is None
+    assert populated_store.get_tag(tag_name="new_tag") is None
+
+
+def test_deleted_tag_is_dropped_from_cache(populated_store: Store, sample_tag_names: list[str]):
+    """Test that a deleted tag is dropped from the tag cache"""
+    # GIVEN a warm tag cache
+    populated_store.load_tag_cache()
+    tag: Tag = populated_store.get_tag(tag_name=sample_tag_names[0])
+
+    # WHEN deleting a tag
+    populated_store.session.delete(tag)
+    populated_store.session.commit()
+
+    # THEN the tag should not be found in the cache
+    assert populated_store.tag_cache.get_tag_id(sample_tag_names[0]) is None
+
+
+def test_store_is_not_kept_alive_by_session_listeners(populated_store: Store):
+    """Test that the session event listeners do not keep stores alive"""
+    # GIVEN stores sharing the session of the populated store
+    store_refs: list[weakref.ref] = [weakref.ref(Store(root="/")) for _ in range(5)]
+
+    # WHEN collecting garbage
+    gc.collect()
+
+    # THEN none of the stores should be alive
+    assert not any(store_ref() for store_ref in store_refs)
+
+
+def test_rollback_in_other_session_keeps_cache(populated_store: Store, sample_tag_names: list[str]):
+    """Test that rolling back another session does not drop the tags cached by a store"""
+    # GIVEN a flushed new tag in the tag cache
+    tag: Tag = populated_store.new_tag(name="new_tag")
+    populated_store.session.add(tag)
+    populated_store.session.flush()
+
+    # WHEN rolling back another session
+    other_session: Session = Session(bind=populated_store.session.get_bind())
+    other_session.rollback()
+    other_session.close()
+
+    # THEN the new tag should still be cached
+    assert populated_store.tag_cache.get_tag_id("new_tag") == tag.id
+
+
+def test_new_tags_do_not_reload_cache(populated_store: Store, mocker: MockerFixture):
+    """Test that creating tags one after another does not reload the whole tag cache"""
+    # GIVEN a store with a warm tag cache
+    populated_store.load_tag_cache()
+    load_tag_cache = mocker.spy(populated_store, "load_tag_cache")
+
+    # WHEN creating new tags one after another and looking them up again
+    for tag_name in ["new_tag_1", "new_tag_2", "new_tag_3"]:
+        populated_store.get_or_create_tags([tag_name])
+        populated_store.session.commit()
+        assert populated_store.get_tags_by_names([tag_name])
+
+    # THEN the tag cache should not have been reloaded
+    load_tag_cache.assert_not_called()
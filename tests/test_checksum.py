@@ -0,0 +1,95 @@
+"""Tests for the checksum module"""
+
+import hashlib
+from pathlib import Path
+
+import pytest
+
+from housekeeper import checksum as checksum_module
+from housekeeper.constants import ChecksumAlgorithm
+
+
+@pytest.mark.parametrize("algorithm", list(ChecksumAlgorithm))
+def test_checksum_algorithms(algorithm: ChecksumAlgorithm, checksum_file: Path):
+    """Test calculating checksums with each supported algorithm."""
+    # GIVEN a file and the expected checksum for an algorithm
+    expected: str = hashlib.new(algorithm, checksum_file.read_bytes()).hexdigest()
+
+    # WHEN calculating the checksum with a block size smaller than the file
+    calculated_checksum: str = checksum_module.checksum(
+        path=checksum_file, algorithm=algorithm, block_size=4
+    )
+
+    # THEN it should match
+    assert calculated_checksum == expected
+
+
+def test_checksums(checksum: str, checksum_file: Path, spring_file_1: Path, spring_file_2: Path):
+    """Test calculating checksums for several files in parallel."""
+    # GIVEN some files
+    paths: list[Path] = [checksum_file, spring_file_1, spring_file_2]
+
+    # WHEN calculating the checksums
+    result: dict[Path, str] = dict(checksum_module.checksums(paths=paths, workers=2))
+
+    # THEN all files should get a checksum
+    assert set(result) == set(paths)
+    assert result[checksum_file] == checksum
+
+
+def test_checksums_missing_file(project_dir: Path):
+    """Test that a file which can not be read gets no checksum."""
+    # GIVEN a path to a file that does not exist
+    missing_file = Path(project_dir, "missing.txt")
+
+    # WHEN calculating the checksums
+    result: dict[Path, str] = dict(checksum_module.checksums(paths=[missing_file]))
+
+    # THEN the file should be returned without checksum
+    assert result == {missing_file: None}
+
+
+@pytest.mark.parametrize(
+    "stored_checksum, expected",
+    [
+        ("sha256:abc", (ChecksumAlgorithm.SHA256, "abc")),
+        ("a" * 40, (ChecksumAlgorithm.SHA1, "a" * 40)),
+        ("a" * 32, (ChecksumAlgorithm.MD5, "a" * 32)),
+        ("unknown", (ChecksumAlgorithm.SHA1, "unknown")),
+    ],
+)
+def test_parse_checksum(stored_checksum: str, expected: tuple[ChecksumAlgorithm, str]):
+    """Test getting the algorithm and digest of stored checksums, with and without prefix."""
+    # GIVEN a stored checksum
+
+    # WHEN parsing it
+    parsed: tuple[ChecksumAlgorithm, str] = checksum_module.parse_checksum(stored_checksum)
+
+    # THEN the algorithm and digest should be returned
+    assert parsed == expected
+
+
+def test_format_checksum():
+    """Test that a formatted checksum is parsed back to its algorithm and digest."""
+    # GIVEN a digest and its algorithm
+    algorithm, digest = ChecksumAlgorithm.BLAKE2B, "ab" * 64
+
+    # WHEN formatting and parsing the checksum
+    stored_checksum: str = checksum_module.format_checksum(digest=digest, algorithm=algorithm)
+
+    # THEN the checksum should be prefixed and parsed back
+    assert stored_checksum == f"blake2b:{digest}"
+    assert checksum_module.parse_checksum(stored_checksum) == (algorithm, digest)
+
+
+def test_format_checksum_default_algorithm():
+    """Test that checksums of the default algorithm are stored as the bare digest."""
+    # GIVEN a digest of the default algorithm
+    algorithm, digest = checksum_module.DEFAULT_CHECKSUM_ALGORITHM, "ab" * 20
+
+    # WHEN formatting the checksum
+    stored_checksum: str = checksum_module.format_checksum(digest=digest, algorithm=algorithm)
+
+    # THEN the digest should be stored without prefix and parsed back
+    assert stored_checksum == digest
+    assert checksum_module.parse_checksum(stored_checksum) == (algorithm, digest)
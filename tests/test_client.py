@@ -0,0 +1,91 @@
+"""Tests for the thin client"""
+
+import click
+import pytest
+
+from housekeeper.cli.core import base
+from housekeeper.client import (
+    BASE_FLAGS,
+    BASE_OPTIONS_WITH_VALUE,
+    get_command_args,
+    is_forwarded,
+    split_base_options,
+)
+
+
+@pytest.mark.parametrize(
+    "args, expected",
+    [
+        (["get", "file", "--json", "a_bundle"], True),
+        (["get", "bundle"], True),
+        (["get", "version", "-i", "1"], True),
+        (["get", "tag"], False),
+        (["delete", "files"], False),
+        (["--log-level", "DEBUG", "get", "file"], True),
+        (["-c", "config.yaml", "get", "file", "a_bundle"], True),
+        (["--config=config.yaml", "--null-pool", "get", "bundle"], True),
+        (["-cconfig.yaml", "get", "version", "-i", "1"], True),
+        (["-c", "config.yaml", "get", "tag"], False),
+        (["--timings", "get", "file"], False),
+        (["--version"], False),
+        ([], False),
+    ],
+)
+def test_is_forwarded(args: list[str], expected: bool):
+    """Test which command lines are forwarded to the query server"""
+    # GIVEN a command line
+
+    # WHEN checking if the command line is forwarded
+    forwarded: bool = is_forwarded(args)
+
+    # THEN only the served get commands should be forwarded
+    assert forwarded == expected
+
+
+def test_get_command_args():
+    """Test that the options of the base command are removed from a command line"""
+    # GIVEN a command line with options of the base command and of the subcommand
+    args: list[str] = ["-c", "config.yaml", "--log-level=DEBUG", "get", "file", "-t", "vcf"]
+
+    # WHEN getting the command arguments
+    command_args: list[str] = get_command_args(args)
+
+    # THEN only the subcommand and its options should be left
+    assert command_args == ["get", "file", "-t", "vcf"]
+
+
+def test_base_options_match_base_command():
+    """Test that the client splits off exactly the options of the base command"""
+    # GIVEN the options of the base command
+    options: list[click.Option] = [
+        param for param in base.params if isinstance(param, click.Option)
+    ]
+
+    # THEN the options taking values should be split off
+    assert {name for option in options if not option.is_flag for name in option.opts} == (
+        BASE_OPTIONS_WITH_VALUE
+    )
+
+    # THEN the flags should be split off, except those not handled by the server
+    flags: set[str] = {name for option in options if option.is_flag for name in option.opts}
+    assert flags - {"--timings", "--version"} == BASE_FLAGS
+
+
+def test_split_base_options():
+    """Test that the options of the base command are split from a command line by long name"""
+    # GIVEN a command line with short, long and joined options of the base command
+    args: list[str] = ["-cconfig.yaml", "-d", "sqlite:///hk.db", "--root=/hk", "--null-pool"]
+
+    # WHEN splitting the base options from the command
+    options, command_args = split_base_options(args + ["get", "file", "-t", "vcf"])
+
+    # THEN the options should be keyed by their long name
+    assert options == {
+        "--config": "config.yaml",
+        "--database": "sqlite:///hk.db",
+        "--root": "/hk",
+        "--null-pool": True,
+    }
+
+    # THEN the command should be left
+    assert command_args == ["get", "file", "-t", "vcf"]
@@ -0,0 +1,81 @@
+"""Tests for the disk module"""
+
+from pathlib import Path
+
+from housekeeper.disk import get_file_names_in_directory, get_file_stats, get_missing_paths
+
+
+def test_get_file_names_in_directory(tmp_path: Path):
+    """Test listing the wanted file names in a directory"""
+    # GIVEN a directory with two files and a subdirectory
+    Path(tmp_path, "a_file.txt").touch()
+    Path(tmp_path, "other_file.txt").touch()
+    Path(tmp_path, "a_directory").mkdir()
+
+    # WHEN listing the file names in the directory wanting one file, the directory and a
+    # missing file
+    file_names: set[str] = get_file_names_in_directory(
+        directory=tmp_path, wanted_names={"a_file.txt", "a_directory", "missing.txt"}
+    )
+
+    # THEN only the wanted file should be returned
+    assert file_names == {"a_file.txt"}
+
+
+def test_get_file_names_in_missing_directory(tmp_path: Path):
+    """Test listing the file names in a directory that does not exist"""
+    # GIVEN a directory that does not exist
+    directory = Path(tmp_path, "missing")
+
+    # WHEN listing the file names in the directory
+    file_names: set[str] = get_file_names_in_directory(
+        directory=directory, wanted_names={"a_file.txt"}
+    )
+
+    # THEN no file names should be returned
+    assert file_names == set()
+
+
+def test_get_missing_paths(tmp_path: Path):
+    """Test finding the paths that are not on disk over several directories"""
+    # GIVEN existing files in two directories
+    first_directory = Path(tmp_path, "first")
+    second_directory = Path(tmp_path, "second")
+    first_directory.mkdir()
+    second_directory.mkdir()
+    existing_paths = [Path(first_directory, "a.txt"), Path(second_directory, "b.txt")]
+    for path in existing_paths:
+        path.touch()
+
+    # GIVEN paths that are missing, including one in a directory that does not exist
+    missing_paths = [
+        Path(first_directory, "missing.txt"),
+        Path(second_directory, "a_directory"),
+        Path(tmp_path, "third", "c.txt"),
+    ]
+    missing_paths[1].mkdir()
+
+    # WHEN finding the missing paths
+    result = set(get_missing_paths(existing_paths + missing_paths, workers=2))
+
+    # THEN only the missing paths should be returned
+    assert result == set(missing_paths)
+
+
+def test_get_file_stats(tmp_path: Path):
+    """Test getting the stat of files in the given order"""
+    # GIVEN a file, a directory and a missing path
+    file_path = Path(tmp_path, "a_file.txt")
+    file_path.write_text("content")
+    directory_path = Path(tmp_path, "a_directory")
+    directory_path.mkdir()
+    missing_path = Path(tmp_path, "missing.txt")
+    paths = [missing_path, file_path, directory_path]
+
+    # WHEN getting the stat of the paths
+    file_stats = list(get_file_stats(paths, workers=2))
+
+    # THEN the paths should be returned in order, with a stat for the file only
+    assert [path for path, _ in file_stats] == paths
+    assert [file_stat is not None for _, file_stat in file_stats] == [False, True, False]
+    assert file_stats[1][1].st_size == len("content")
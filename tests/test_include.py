@@ -6,7 +6,7 @@ from pathlib import Path
 import pytest
 
 from housekeeper import include
-from housekeeper.exc import VersionIncludedError
+from housekeeper.exc import IncludeError, VersionIncludedError
 from housekeeper.store import models
 
 
@@ -55,3 +55,46 @@ def test_include_version_already_included(project_dir: Path, version_obj: models
     with pytest.raises(VersionIncludedError):
         # THEN it should raise an exception
         include.include_version(project_dir, version_obj)
+
+
+def test_include_version_returns_link_results(project_dir: Path, version_obj: models.Version):
+    """Test that including a version reports the outcome of each link"""
+    # GIVEN a version with files that are not included
+
+    # WHEN including the version using several threads
+    results: list[include.LinkResult] = include.include_version(
+        str(project_dir), version_obj, workers=2
+    )
+
+    # THEN each file should have been linked successfully
+    assert len(results) == len(version_obj.files)
+    assert all(result.error is None for result in results)
+    assert all(result.destination.is_file() for result in results)
+
+    # THEN the stat of each link should be returned and recorded for its file
+    for file, result in zip(version_obj.files, results):
+        assert result.stat.st_ino == result.destination.stat().st_ino
+        assert (file.size, file.mtime) == (result.stat.st_size, result.stat.st_mtime_ns)
+
+
+def test_include_version_failed_link(project_dir: Path, version_obj: models.Version):
+    """Test that the version is left unchanged when a file can not be linked"""
+    # GIVEN a version where one of the files does not exist
+    missing_file: models.File = version_obj.files[-1]
+    missing_file.path = str(Path(project_dir, "missing.vcf"))
+    original_paths: list[str] = [file_obj.path for file_obj in version_obj.files]
+
+    # WHEN including the version
+    with pytest.raises(IncludeError) as error:
+        include.include_version(str(project_dir), version_obj)
+
+    # THEN the failed link should be reported
+    assert [result.source for result in error.value.results if result.error] == [
+        Path(missing_file.path)
+    ]
+
+    # THEN the links that were created should be removed
+    assert not any(result.destination.exists() for result in error.value.results)
+
+    # THEN the file paths of the version should be unchanged
+    assert [file_obj.path for file_obj in version_obj.files] == original_paths